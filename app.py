@@ -1,8 +1,11 @@
-from flask import Flask, send_from_directory
+from flask import Flask, send_from_directory, request, g
 from flask_cors import CORS
 import logging
 import os
 from app.config.config import config
+from app.services.admission_service import select_bulkhead, check_thread_capacity
+from app.services.connection_manager import connection_manager
+from app.utils.response_utils import create_error_response
 
 # Import all controllers
 from app.controllers.login_controller import login_bp
@@ -10,6 +13,10 @@ from app.controllers.attendance_controller import attendance_bp
 from app.controllers.attendance_table_controller import attendance_table_bp
 from app.controllers.timetable_controller import timetable_bp
 from app.controllers.diagnostic_controller import diagnostic_bp
+from app.controllers.batch_controller import batch_bp
+from app.controllers.job_controller import job_bp
+from app.controllers.events_controller import events_bp
+from app.controllers.query_controller import query_bp
 from app.controllers.other_controllers import (
     web_bp, profile_bp, results_bp, status_bp, logout_bp
 )
@@ -49,6 +56,40 @@ def create_app():
     app.register_blueprint(status_bp)
     app.register_blueprint(logout_bp)
     app.register_blueprint(diagnostic_bp)
+    app.register_blueprint(batch_bp)
+    app.register_blueprint(job_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(query_bp)
+    
+    # Admission control - each priority class is shed once its bulkhead is saturated
+    if config.admission_enabled:
+        check_thread_capacity(config.worker_threads, reserved=config.sse_max_subscribers)
+    
+    @app.before_request
+    def admit_request():
+        if not config.admission_enabled or request.method == 'OPTIONS':
+            return None
+        
+        bulkhead = select_bulkhead(app.view_functions.get(request.endpoint))
+        if bulkhead is None:
+            return None
+        
+        if bulkhead.acquire():
+            g.bulkhead = bulkhead
+            return None
+        
+        response, status_code = create_error_response(
+            "Server is busy. Please retry shortly.",
+            "SERVER_BUSY",
+            status_code=503
+        )
+        return response, status_code, {'Retry-After': str(bulkhead.retry_after)}
+    
+    @app.teardown_request
+    def release_admission(error=None):
+        bulkhead = g.pop('bulkhead', None)
+        if bulkhead is not None:
+            bulkhead.release()
     
     # Root route - API info
     @app.route('/')
@@ -63,12 +104,22 @@ def create_app():
                 "profile": "/api/profile",
                 "attendance": "/api/attendance",
                 "attendance_table": "/api/attendance-table",
+                "attendance_table_range": "/api/attendance-table/range",
+                "attendance_table_changes": "/api/attendance-table/changes",
                 "timetable": "/api/timetable",
                 "results": "/api/results",
                 "status": "/api/status",
                 "logout": "/api/logout",
+                "batch": "/api/batch",
+                "jobs": "/api/jobs",
+                "events": "/api/events",
+                "query": "/api/query",
                 "dns_test": "/api/diagnostic/dns-test",
-                "network_info": "/api/diagnostic/network-info"
+                "network_info": "/api/diagnostic/network-info",
+                "admission": "/api/diagnostic/admission",
+                "upstream_limits": "/api/diagnostic/upstream-limits",
+                "connections": "/api/diagnostic/connections",
+                "layouts": "/api/diagnostic/layouts"
             }
         }, 200
     
@@ -97,6 +148,9 @@ def main():
     port = config.port
     debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
+    # Keep upstream connections warm (gunicorn does this in post_worker_init)
+    connection_manager.start()
+    
     app.run(host='0.0.0.0', port=port, debug=debug)
 
 if __name__ == '__main__':
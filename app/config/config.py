@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -10,6 +11,7 @@ class AppConfig:
     def __init__(self):
         # Server Configuration
         self.port = int(os.getenv('PORT', '3000'))
+        self.worker_threads = int(os.getenv('GUNICORN_THREADS', '12'))
         
         # Application Configuration
         self.base_url = os.getenv('APP_BASE_URL', 'https://sahrdaya.etlab.in')
@@ -37,6 +39,106 @@ class AppConfig:
         # Request Configuration
         self.request_timeout = int(os.getenv('REQUEST_TIMEOUT', '30'))
         self.max_request_retries = int(os.getenv('MAX_REQUEST_RETRIES', '3'))
+        
+        # Upstream Connection Pool (keep-alive warm-up, per worker)
+        self.upstream_warm_connections = int(os.getenv('UPSTREAM_WARM_CONNECTIONS', '2'))
+        self.upstream_keepalive_interval = float(os.getenv('UPSTREAM_KEEPALIVE_INTERVAL', '45'))
+        self.upstream_pool_maxsize = int(os.getenv('UPSTREAM_POOL_MAXSIZE', '16'))
+        
+        # Adaptive Upstream Concurrency (AIMD, per upstream host, per worker)
+        self.upstream_limit_enabled = os.getenv('UPSTREAM_LIMIT_ENABLED', 'true').lower() == 'true'
+        self.upstream_limit_initial = int(os.getenv('UPSTREAM_LIMIT_INITIAL', '4'))
+        self.upstream_limit_min = int(os.getenv('UPSTREAM_LIMIT_MIN', '1'))
+        self.upstream_limit_max = int(os.getenv('UPSTREAM_LIMIT_MAX', '32'))
+        self.upstream_limit_backoff = float(os.getenv('UPSTREAM_LIMIT_BACKOFF', '0.5'))
+        self.upstream_latency_spike_factor = float(os.getenv('UPSTREAM_LATENCY_SPIKE_FACTOR', '3.0'))
+        self.upstream_limit_queue_timeout = float(os.getenv('UPSTREAM_LIMIT_QUEUE_TIMEOUT', '30'))
+        
+        # HTML Parsing (html.parser | lxml; falls back to html.parser without lxml)
+        self.html_parser_engine = os.getenv('HTML_PARSER_ENGINE', 'lxml')
+        
+        # Attendance period colours ('|'-separated substrings of a cell's style, class and bgcolor)
+        self.attendance_present_colours = [colour.strip().lower() for colour in os.getenv(
+            'ATTENDANCE_PRESENT_COLOURS',
+            'green|#00ff00|#0f0|rgb(0, 255, 0)|rgb(0,255,0)|#90ee90|#00ff7f|success|present'
+        ).split('|') if colour.strip()]
+        self.attendance_absent_colours = [colour.strip().lower() for colour in os.getenv(
+            'ATTENDANCE_ABSENT_COLOURS',
+            'red|#ff0000|#f00|rgb(255, 0, 0)|rgb(255,0,0)|#dc143c|#ff6b6b|danger|absent'
+        ).split('|') if colour.strip()]
+        
+        # Fan-out and Batch Configuration
+        self.fanout_max_workers = int(os.getenv('FANOUT_MAX_WORKERS', '8'))
+        self.batch_max_parts = int(os.getenv('BATCH_MAX_PARTS', '8'))
+        # Parts of one batch fetching at once (the batch is admitted once, as one request)
+        self.batch_max_concurrency = int(os.getenv('BATCH_MAX_CONCURRENCY', '4'))
+        self.batch_deadline = float(os.getenv('BATCH_DEADLINE', '25'))
+        self.query_deadline = float(os.getenv('QUERY_DEADLINE', '25'))
+        self.attendance_range_max_months = int(os.getenv('ATTENDANCE_RANGE_MAX_MONTHS', '7'))
+        
+        # Background Jobs (executor per worker, records shared on local disk)
+        # Records hold scraped student data: the directory must be private to this user
+        self.job_store_dir = os.getenv('JOB_STORE_DIR', os.path.join(tempfile.gettempdir(), f'etlab-jobs-{os.getuid()}'))
+        self.job_max_workers = int(os.getenv('JOB_MAX_WORKERS', '1'))
+        self.job_max_pending = int(os.getenv('JOB_MAX_PENDING', '8'))
+        self.job_result_ttl = float(os.getenv('JOB_RESULT_TTL', '600'))
+        self.job_wait_max = float(os.getenv('JOB_WAIT_MAX', '25'))
+        
+        # Attendance Snapshots for delta responses (per worker)
+        self.snapshot_versions_per_key = int(os.getenv('SNAPSHOT_VERSIONS_PER_KEY', '8'))
+        self.snapshot_max_keys = int(os.getenv('SNAPSHOT_MAX_KEYS', '256'))
+        self.snapshot_ttl = float(os.getenv('SNAPSHOT_TTL', '86400'))
+        
+        # Cursor Pagination
+        self.page_max_limit = int(os.getenv('PAGE_MAX_LIMIT', '50'))
+        self.pagination_cursor_ttl = float(os.getenv('PAGINATION_CURSOR_TTL', '900'))
+        
+        # Layout fingerprints remembered per page kind (per worker)
+        self.layout_max_fingerprints = int(os.getenv('LAYOUT_MAX_FINGERPRINTS', '64'))
+        
+        # Profile Cache (per worker) - logout revokes it in every worker through
+        # marker files on local disk; ?refresh=true refetches in the serving worker
+        self.profile_cache_ttl = float(os.getenv('PROFILE_CACHE_TTL', '43200'))
+        self.profile_cache_max_keys = int(os.getenv('PROFILE_CACHE_MAX_KEYS', '256'))
+        self.profile_revocation_dir = os.getenv(
+            'PROFILE_REVOCATION_DIR', os.path.join(tempfile.gettempdir(), f'etlab-revoked-{os.getuid()}')
+        )
+        
+        # Change Events (SSE) - one shared poll per token, per worker
+        self.sse_max_subscribers = int(os.getenv('SSE_MAX_SUBSCRIBERS', '2'))
+        self.sse_poll_interval = float(os.getenv('SSE_POLL_INTERVAL', '300'))
+        self.sse_poll_jitter = float(os.getenv('SSE_POLL_JITTER', '0.2'))
+        self.sse_heartbeat = float(os.getenv('SSE_HEARTBEAT', '20'))
+        self.sse_max_duration = float(os.getenv('SSE_MAX_DURATION', '900'))
+        # Watches keep polling this long after their last stream closes, so
+        # reconnecting clients can replay what they missed
+        self.sse_watch_grace = float(os.getenv('SSE_WATCH_GRACE', '60'))
+        
+        # Admission Control Configuration (per worker)
+        self.admission_enabled = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+        self.admission_queue_timeout = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', '5'))
+        self.admission_retry_after = int(os.getenv('ADMISSION_RETRY_AFTER', '5'))
+        
+        # Bulkheads - separate concurrency budgets per priority class (per worker).
+        # Every running or queued request holds a gunicorn thread, so the defaults
+        # are carved out of GUNICORN_THREADS: one thread stays free to answer 503s,
+        # SSE streams keep theirs, login keeps a slot and a queue place of its own,
+        # heavy, diagnostic and job long-polls get one slot each and interactive
+        # gets the rest.
+        admission_threads = self.worker_threads - 1 - self.sse_max_subscribers
+        interactive_slots = max(1, admission_threads - 5)
+        self.bulkhead_critical_concurrency = int(os.getenv('BULKHEAD_CRITICAL_CONCURRENCY', '1'))
+        self.bulkhead_critical_queue = int(os.getenv('BULKHEAD_CRITICAL_QUEUE', '1'))
+        self.bulkhead_interactive_concurrency = int(os.getenv(
+            'BULKHEAD_INTERACTIVE_CONCURRENCY', str(interactive_slots - interactive_slots // 3)
+        ))
+        self.bulkhead_interactive_queue = int(os.getenv('BULKHEAD_INTERACTIVE_QUEUE', str(interactive_slots // 3)))
+        self.bulkhead_heavy_concurrency = int(os.getenv('BULKHEAD_HEAVY_CONCURRENCY', '1'))
+        self.bulkhead_heavy_queue = int(os.getenv('BULKHEAD_HEAVY_QUEUE', '0'))
+        self.bulkhead_diagnostic_concurrency = int(os.getenv('BULKHEAD_DIAGNOSTIC_CONCURRENCY', '1'))
+        self.bulkhead_diagnostic_queue = int(os.getenv('BULKHEAD_DIAGNOSTIC_QUEUE', '0'))
+        self.bulkhead_long_poll_concurrency = int(os.getenv('BULKHEAD_LONG_POLL_CONCURRENCY', '1'))
+        self.bulkhead_long_poll_queue = int(os.getenv('BULKHEAD_LONG_POLL_QUEUE', '0'))
 
 # Global config instance
 config = AppConfig()
\ No newline at end of file
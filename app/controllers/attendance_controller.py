@@ -2,10 +2,11 @@
 Attendance controller - subject-wise attendance summary
 """
 from flask import Blueprint, request
-from bs4 import BeautifulSoup
 import logging
 from app.services.attendance_service import AttendanceService
+from app.services.admission_service import priority_class, PRIORITY_INTERACTIVE
 from app.parsers.attendance_parser import AttendanceSubjectParser
+from app.parsers.document import HtmlDocument
 from app.utils.auth_utils import extract_token
 from app.utils.response_utils import (
     create_success_response,
@@ -20,6 +21,7 @@ attendance_bp = Blueprint('attendance', __name__)
 
 
 @attendance_bp.route('/api/attendance', methods=['GET'])
+@priority_class(PRIORITY_INTERACTIVE)
 def get_attendance():
     """
     Get subject-wise attendance data
@@ -38,16 +40,14 @@ def get_attendance():
         semester = request.args.get('semester', '5')
         
         # Step 3: Fetch attendance HTML
-        html = AttendanceService.fetch_attendance_subjects(token, semester)
+        document = HtmlDocument(AttendanceService.fetch_attendance_subjects(token, semester))
         
-        # Step 4: Check for session expiry
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.find('title')
-        if title and 'login' in title.get_text().lower():
+        # Step 4: Check for session expiry (the parsed page is reused by the parser)
+        if document.is_login_page:
             return create_token_expired_response()
         
         # Step 5: Parse attendance data
-        attendance_data = AttendanceSubjectParser.parse(html, semester)
+        attendance_data = AttendanceSubjectParser.parse(document, semester)
         
         # Step 6: Build response
         response_data = AttendanceService.build_attendance_subjects_response(
@@ -2,12 +2,16 @@
 Attendance table controller - day-by-day attendance with period details
 """
 from flask import Blueprint, request
-from bs4 import BeautifulSoup
 import logging
 from app.services.attendance_service import AttendanceService
+from app.services.snapshot_service import attendance_snapshots
+from app.config.config import config
+from app.services.admission_service import priority_class, PRIORITY_HEAVY, PRIORITY_INTERACTIVE
 from app.parsers.attendance_parser import AttendanceTableParser
+from app.parsers.document import HtmlDocument
 from app.utils.auth_utils import extract_token
-from app.utils.date_utils import convert_month_to_number
+from app.utils.cursor_utils import parse_page_params
+from app.utils.date_utils import convert_month_to_number, parse_year_month, month_range, month_span, semester_months
 from app.utils.response_utils import (
     create_success_response,
     create_unauthorized_response,
@@ -21,6 +25,7 @@ attendance_table_bp = Blueprint('attendance_table', __name__)
 
 
 @attendance_table_bp.route('/api/attendance-table', methods=['GET'])
+@priority_class(PRIORITY_INTERACTIVE)
 def get_attendance_table():
     """
     Get detailed attendance table with date-wise records
@@ -30,6 +35,8 @@ def get_attendance_table():
         - semester: Semester number (default: 3)
         - month: Month name or number (e.g., "Oct", "October", "10")
         - year: Year (default: 2025)
+        - limit: Page size for cursor pagination (optional)
+        - cursor: next_cursor from the previous page (optional)
     """
     try:
         # Step 1: Extract and validate token
@@ -45,17 +52,21 @@ def get_attendance_table():
         # Step 3: Convert month to numeric format
         month = convert_month_to_number(month_param, default='10')
         
+        limit, cursor, error_msg = parse_page_params(request.args, config.page_max_limit)
+        if error_msg:
+            return create_error_response(error_msg, "VALIDATION_ERROR", status_code=400)
+        if limit is not None:
+            return get_attendance_table_page(token, semester, month, month_param, year, limit, cursor)
+        
         # Step 4: Fetch attendance HTML
-        html = AttendanceService.fetch_attendance_table(token, semester, month, year)
+        document = HtmlDocument(AttendanceService.fetch_attendance_table(token, semester, month, year))
         
-        # Step 5: Check for session expiry
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.find('title')
-        if title and 'login' in title.get_text().lower():
+        # Step 5: Check for session expiry (the parsed page is reused by the parser)
+        if document.is_login_page:
             return create_token_expired_response()
         
         # Step 6: Parse attendance table
-        dates_data = AttendanceTableParser.parse(html)
+        dates_data = AttendanceTableParser.parse(document)
         
         # Step 7: Build response
         response_data = AttendanceService.build_attendance_table_response(
@@ -71,3 +82,168 @@ def get_attendance_table():
             "SERVER_ERROR",
             status_code=500
         )
+
+
+def get_attendance_table_page(token, semester, month, month_param, year, limit, cursor):
+    """
+    Serve one page of the attendance table from the snapshot store
+    
+    The first page scrapes the month and stores it; later pages are cut
+    from the stored snapshot named in the cursor without another scrape.
+    """
+    if not year.isdigit():
+        return create_error_response("year must be a number", "VALIDATION_ERROR", status_code=400)
+    
+    key = attendance_snapshots.make_key(token, semester, month, year)
+    snapshot = attendance_snapshots.find(key, version=cursor['v']) if cursor else None
+    
+    if snapshot is None:
+        dates_data = AttendanceService.fetch_attendance_month(token, semester, int(year), int(month))
+        if dates_data is None:
+            return create_token_expired_response()
+        snapshot = attendance_snapshots.record(key, dates_data)
+        
+        if cursor and snapshot['version'] != cursor['v']:
+            return create_error_response(
+                "Attendance changed since this cursor was issued. Restart without a cursor.",
+                "CURSOR_EXPIRED",
+                status_code=410
+            )
+    
+    response_data = AttendanceService.build_attendance_table_page(
+        snapshot, cursor['o'] if cursor else 0, limit, semester, month, month_param, year
+    )
+    return create_success_response(response_data)
+
+@attendance_table_bp.route('/api/attendance-table/range', methods=['GET'])
+@priority_class(PRIORITY_HEAVY)
+def get_attendance_table_range():
+    """
+    Get the attendance table for several months in one call
+    Months are fetched concurrently and merged in chronological order
+    
+    Query Parameters:
+        - semester: Semester number (default: 3)
+        - from: First month, "YYYY-MM" or month name/number (e.g., "2025-07", "Jul")
+        - to: Last month, same formats as from
+        - year: Year for from/to given without one, and for the whole-semester
+          range when from/to are omitted (default: 2025)
+    """
+    try:
+        # Step 1: Extract and validate token
+        token = extract_token(request.headers.get('Authorization'))
+        if not token:
+            return create_unauthorized_response()
+        
+        # Step 2: Get query parameters
+        semester = request.args.get('semester', '3')
+        year = request.args.get('year', '2025')
+        from_param = request.args.get('from')
+        to_param = request.args.get('to')
+        
+        if not semester.isdigit() or not year.isdigit() or len(year) > 4:
+            return create_error_response(
+                "semester must be a number and year at most 4 digits", "VALIDATION_ERROR", status_code=400
+            )
+        
+        # Step 3: Resolve the month range (whole semester if from/to are omitted)
+        if not from_param and not to_param:
+            months = semester_months(semester, year)
+        else:
+            start = parse_year_month(from_param or to_param, year)
+            end = parse_year_month(to_param or from_param, year)
+            if not start or not end:
+                return create_error_response(
+                    "from and to must be \"YYYY-MM\" (4-digit year) or a month name/number",
+                    "VALIDATION_ERROR",
+                    status_code=400
+                )
+            # Check the span before listing the months
+            span = month_span(start, end)
+            if span < 1:
+                return create_error_response("from must not be after to", "VALIDATION_ERROR", status_code=400)
+            if span > config.attendance_range_max_months:
+                return create_error_response(
+                    f"At most {config.attendance_range_max_months} months per request",
+                    "VALIDATION_ERROR",
+                    status_code=400
+                )
+            months = month_range(start, end)
+        
+        # Step 4: Fetch every month concurrently
+        month_results = AttendanceService.fetch_attendance_range(token, semester, months)
+        
+        # Step 5: Check for session expiry
+        if any(entry['status'] == 'expired' for entry in month_results):
+            return create_token_expired_response()
+        
+        # Step 6: Build merged response
+        response_data = AttendanceService.build_attendance_range_response(month_results, semester)
+        
+        return create_success_response(response_data)
+        
+    except Exception as e:
+        logger.error(f"Error fetching attendance table range: {e}", exc_info=True)
+        return create_error_response(
+            f"Error fetching attendance table range: {str(e)}",
+            "SERVER_ERROR",
+            status_code=500
+        )
+
+
+@attendance_table_bp.route('/api/attendance-table/changes', methods=['GET'])
+@priority_class(PRIORITY_INTERACTIVE)
+def get_attendance_table_changes():
+    """
+    Get only what changed in a month's attendance since a version the client holds
+    
+    Query Parameters:
+        - semester: Semester number (default: 3)
+        - month: Month name or number (e.g., "Oct", "October", "10")
+        - year: Year (default: 2025)
+        - since_version: Version from a previous response
+        - since: Unix timestamp from a previous response (used if since_version is absent)
+    """
+    try:
+        # Step 1: Extract and validate token
+        token = extract_token(request.headers.get('Authorization'))
+        if not token:
+            return create_unauthorized_response()
+        
+        # Step 2: Get query parameters
+        semester = request.args.get('semester', '3')
+        month = convert_month_to_number(request.args.get('month', '10'), default='10')
+        year = request.args.get('year', '2025')
+        since_version = request.args.get('since_version')
+        try:
+            since = float(request.args['since']) if 'since' in request.args else None
+        except ValueError:
+            return create_error_response("since must be a Unix timestamp", "VALIDATION_ERROR", status_code=400)
+        
+        if not year.isdigit():
+            return create_error_response("year must be a number", "VALIDATION_ERROR", status_code=400)
+        
+        # Step 3: Fetch and parse the month (None if the session has expired)
+        dates_data = AttendanceService.fetch_attendance_month(token, semester, int(year), int(month))
+        if dates_data is None:
+            return create_token_expired_response()
+        
+        # Step 4: Record the new version and find the client's one
+        key = attendance_snapshots.make_key(token, semester, month, year)
+        base = attendance_snapshots.find(key, version=since_version, since=since)
+        current = attendance_snapshots.record(key, dates_data)
+        
+        # Step 5: Build delta response (full dates if the client's version is unknown)
+        response_data = AttendanceService.build_attendance_changes_response(
+            current, base, semester, month, year
+        )
+        
+        return create_success_response(response_data)
+        
+    except Exception as e:
+        logger.error(f"Error fetching attendance changes: {e}", exc_info=True)
+        return create_error_response(
+            f"Error fetching attendance changes: {str(e)}",
+            "SERVER_ERROR",
+            status_code=500
+        )
@@ -0,0 +1,57 @@
+"""
+Batch controller - several resources in one round trip
+"""
+from flask import Blueprint, request, current_app
+import logging
+from app.services.admission_service import priority_class, PRIORITY_INTERACTIVE
+from app.services.batch_service import BatchService
+from app.utils.auth_utils import extract_token
+from app.utils.response_utils import (
+    create_success_response,
+    create_unauthorized_response,
+    create_error_response
+)
+
+logger = logging.getLogger(__name__)
+
+batch_bp = Blueprint('batch', __name__)
+
+
+@batch_bp.route('/api/batch', methods=['POST'])
+@priority_class(PRIORITY_INTERACTIVE)
+def batch():
+    """
+    Fetch several resources concurrently under one deadline
+    
+    Request Body:
+        - requests: List of {"id", "resource", "params"} objects
+          (resources: profile, attendance, attendance-table, timetable, results)
+        - deadline: Optional overall deadline in seconds
+    """
+    try:
+        # Step 1: Extract and validate token (shared by every part)
+        auth_header = request.headers.get('Authorization')
+        if not extract_token(auth_header):
+            return create_unauthorized_response()
+        
+        # Step 2: Validate parts
+        payload = request.get_json(silent=True)
+        parts, error_msg = BatchService.parse_parts(payload)
+        if error_msg:
+            return create_error_response(error_msg, "VALIDATION_ERROR", status_code=400)
+        
+        # Step 3: Fetch all parts concurrently
+        deadline = BatchService.resolve_deadline(payload)
+        response_data = BatchService.execute(
+            current_app._get_current_object(), parts, auth_header, deadline
+        )
+        
+        return create_success_response(response_data)
+        
+    except Exception as e:
+        logger.error(f"Error processing batch: {e}", exc_info=True)
+        return create_error_response(
+            f"Error processing batch request: {str(e)}",
+            "SERVER_ERROR",
+            status_code=500
+        )
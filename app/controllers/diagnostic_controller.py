@@ -5,10 +5,15 @@ from flask import Blueprint, jsonify
 import socket
 import dns.resolver
 from app.config.config import config
+from app.services.admission_service import priority_class, bulkhead_stats, PRIORITY_DIAGNOSTIC
+from app.services.concurrency_limiter import upstream_limiters
+from app.services.connection_manager import connection_manager
+from app.parsers.layout_registry import layout_registry
 
 diagnostic_bp = Blueprint('diagnostic', __name__, url_prefix='/api/diagnostic')
 
 @diagnostic_bp.route('/dns-test', methods=['GET'])
+@priority_class(PRIORITY_DIAGNOSTIC)
 def test_dns():
     """
     Test DNS resolution for the target host
@@ -85,6 +90,7 @@ def test_dns():
     }), 200 if any_success else 500
 
 @diagnostic_bp.route('/network-info', methods=['GET'])
+@priority_class(PRIORITY_DIAGNOSTIC)
 def network_info():
     """
     Get basic network information about the server environment
@@ -107,3 +113,47 @@ def network_info():
         'success': True,
         'info': info
     })
+
+@diagnostic_bp.route('/admission', methods=['GET'])
+def admission_stats():
+    """
+    Get bulkhead occupancy per priority class for this worker
+    """
+    return jsonify({
+        'success': True,
+        'enabled': config.admission_enabled,
+        'bulkheads': bulkhead_stats()
+    })
+
+@diagnostic_bp.route('/upstream-limits', methods=['GET'])
+def upstream_limits():
+    """
+    Get the adaptive concurrency limit and queue depth per upstream host
+    """
+    return jsonify({
+        'success': True,
+        'enabled': config.upstream_limit_enabled,
+        'hosts': upstream_limiters.stats()
+    })
+
+@diagnostic_bp.route('/connections', methods=['GET'])
+def connection_pool():
+    """
+    Get upstream keep-alive pool occupancy and TLS session reuse counters
+    """
+    return jsonify({
+        'success': True,
+        'connections': connection_manager.stats()
+    })
+
+@diagnostic_bp.route('/layouts', methods=['GET'])
+def page_layouts():
+    """
+    Get layout fingerprint hit rates per page kind for this worker
+    
+    A falling hit rate or new fingerprints mean ETLab changed a page layout
+    """
+    return jsonify({
+        'success': True,
+        'layouts': layout_registry.stats()
+    })
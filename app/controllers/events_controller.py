@@ -0,0 +1,85 @@
+"""
+Events controller - server-sent events for attendance and result changes
+"""
+from flask import Blueprint, Response, request
+import logging
+from app.config.config import config
+from app.services.change_feed_service import change_feed_service, SubscriberLimitReached, TOPICS
+from app.utils.auth_utils import extract_token
+from app.utils.date_utils import convert_month_to_number
+from app.utils.response_utils import (
+    create_unauthorized_response,
+    create_error_response
+)
+
+logger = logging.getLogger(__name__)
+
+events_bp = Blueprint('events', __name__)
+
+
+@events_bp.route('/api/events', methods=['GET'])
+def stream_events():
+    """
+    Subscribe to change events (text/event-stream)
+    
+    ETLab is polled once per interval per token, however many clients
+    subscribe; only changes are pushed.
+    
+    Query Parameters:
+        - topics: Comma-separated subset of "attendance,results" (default: both)
+        - semester: Semester number for attendance (default: 3)
+        - month: Month name or number for attendance (default: 10)
+        - year: Year for attendance (default: 2025)
+    
+    Headers:
+        - Last-Event-ID: Replay events missed since this id (sent by EventSource on reconnect);
+          answered with a "resync" event when they can't be replayed
+    """
+    try:
+        # Step 1: Extract and validate token
+        token = extract_token(request.headers.get('Authorization'))
+        if not token:
+            return create_unauthorized_response()
+        
+        # Step 2: Get query parameters
+        topics = tuple(sorted({topic.strip() for topic in request.args.get('topics', ','.join(TOPICS)).split(',') if topic.strip()}))
+        unknown = [topic for topic in topics if topic not in TOPICS]
+        if not topics or unknown:
+            return create_error_response(
+                f"topics must be a comma-separated subset of: {', '.join(TOPICS)}",
+                "VALIDATION_ERROR",
+                status_code=400
+            )
+        
+        semester = request.args.get('semester', '3')
+        month = convert_month_to_number(request.args.get('month', '10'), default='10')
+        year = request.args.get('year', '2025')
+        if not semester.isdigit() or not year.isdigit():
+            return create_error_response("semester and year must be numbers", "VALIDATION_ERROR", status_code=400)
+        
+        last_event_id = request.headers.get('Last-Event-ID', '').strip() or None
+        
+        # Step 3: Join the shared watch for this token
+        try:
+            watch, subscriber = change_feed_service.subscribe(token, semester, month, year, topics, last_event_id)
+        except SubscriberLimitReached as e:
+            response, status_code = create_error_response(str(e), "SERVER_BUSY", status_code=503)
+            return response, status_code, {'Retry-After': str(config.admission_retry_after)}
+        
+        # Step 4: Stream events until the client leaves or the stream times out
+        response = Response(
+            change_feed_service.stream(watch, subscriber),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        # The stream's own cleanup doesn't run if it is closed before starting
+        response.call_on_close(lambda: change_feed_service.unsubscribe(watch, subscriber))
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error opening event stream: {e}", exc_info=True)
+        return create_error_response(
+            f"Error opening event stream: {str(e)}",
+            "SERVER_ERROR",
+            status_code=500
+        )
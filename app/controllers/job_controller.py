@@ -0,0 +1,102 @@
+"""
+Job controller - submit long scrapes and poll for their results
+"""
+from flask import Blueprint, request, current_app
+import logging
+from app.config.config import config
+from app.services.admission_service import priority_class, PRIORITY_LONG_POLL
+from app.services.job_service import job_service, JobService, JobQueueFull
+from app.utils.auth_utils import extract_token
+from app.utils.response_utils import (
+    create_success_response,
+    create_unauthorized_response,
+    create_error_response
+)
+
+logger = logging.getLogger(__name__)
+
+job_bp = Blueprint('jobs', __name__)
+
+
+@job_bp.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Start a long-running scrape in the background
+    
+    Request Body:
+        - resource: "end-semester-results" or "attendance-table-range"
+        - params: Optional query parameters of that endpoint
+    """
+    try:
+        # Step 1: Extract and validate token (the job runs with it)
+        auth_header = request.headers.get('Authorization')
+        if not extract_token(auth_header):
+            return create_unauthorized_response()
+        
+        # Step 2: Validate submission
+        resource, params, error_msg = JobService.parse_submission(request.get_json(silent=True))
+        if error_msg:
+            return create_error_response(error_msg, "VALIDATION_ERROR", status_code=400)
+        
+        # Step 3: Queue the job
+        try:
+            job = job_service.submit(current_app._get_current_object(), resource, params, auth_header)
+        except JobQueueFull as e:
+            response, status_code = create_error_response(str(e), "SERVER_BUSY", status_code=503)
+            return response, status_code, {'Retry-After': str(config.admission_retry_after)}
+        
+        response, status_code = create_success_response(JobService.public_view(job), status_code=202)
+        return response, status_code, {'Location': f"/api/jobs/{job['id']}"}
+        
+    except Exception as e:
+        logger.error(f"Error submitting job: {e}", exc_info=True)
+        return create_error_response(
+            f"Error submitting job: {str(e)}",
+            "SERVER_ERROR",
+            status_code=500
+        )
+
+
+def no_wait_requested() -> bool:
+    """Admission probe: polls without ?wait= answer at once and need no slot"""
+    try:
+        return float(request.args.get('wait', '0')) <= 0
+    except ValueError:
+        return True
+
+
+@job_bp.route('/api/jobs/<job_id>', methods=['GET'])
+@priority_class(PRIORITY_LONG_POLL, cache_probe=no_wait_requested)
+def get_job(job_id):
+    """
+    Get a job's status and, once finished, its result
+    
+    Query Parameters:
+        - wait: Seconds to long-poll for completion (default: 0, capped by JOB_WAIT_MAX)
+    """
+    try:
+        # Step 1: Extract and validate token (must be the submitting token)
+        auth_header = request.headers.get('Authorization')
+        if not extract_token(auth_header):
+            return create_unauthorized_response()
+        
+        # Step 2: Resolve long-poll duration
+        try:
+            wait = max(0.0, min(float(request.args.get('wait', '0')), config.job_wait_max))
+        except ValueError:
+            return create_error_response("wait must be a number of seconds", "VALIDATION_ERROR", status_code=400)
+        
+        # Step 3: Look up the job
+        job = job_service.get(job_id, auth_header, wait)
+        if job is None:
+            return create_error_response("Job not found or expired", "NOT_FOUND", status_code=404)
+        
+        return create_success_response(JobService.public_view(job))
+        
+    except Exception as e:
+        logger.error(f"Error fetching job {job_id}: {e}", exc_info=True)
+        return create_error_response(
+            f"Error fetching job: {str(e)}",
+            "SERVER_ERROR",
+            status_code=500
+        )
@@ -6,6 +6,7 @@ import logging
 from app.config.config import config
 from app.services.http_service import http_service
 from app.services.login_service import LoginService
+from app.services.admission_service import priority_class, PRIORITY_CRITICAL
 from app.utils.response_utils import create_success_response, create_error_response
 from app.models.dto import LoginRequest, LoginResponse
 
@@ -15,6 +16,7 @@ login_bp = Blueprint('login', __name__)
 
 
 @login_bp.route('/api/login', methods=['POST'])
+@priority_class(PRIORITY_CRITICAL)
 def login():
     """
     Login endpoint - authenticate user and return session token
@@ -46,7 +48,7 @@ def login():
         response = http_service.post(login_url, data=login_data)
         
         # Step 5: Check if login was successful
-        if not LoginService.check_login_success(response.text):
+        if not LoginService.check_login_response(response):
             return create_error_response(
                 "Invalid username or password",
                 "LOGIN_FAILED",
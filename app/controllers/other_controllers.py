@@ -1,10 +1,16 @@
-from flask import Blueprint, request, jsonify, send_from_directory
-from bs4 import BeautifulSoup
+from flask import Blueprint, Response, request, jsonify, send_from_directory, stream_with_context
+import json
 import logging
-import re
 from app.config.config import config
 from app.services.http_service import http_service
+from app.services.results_service import results_service, EXAM_METADATA_FIELDS
+from app.services.profile_service import profile_service
+from app.services.admission_service import priority_class, PRIORITY_HEAVY, PRIORITY_INTERACTIVE
 from app.models.dto import ApiResponse
+from app.parsers.document import HtmlDocument
+from app.parsers.results_parser import ResultsParser
+from app.utils.fieldset_utils import select_fields, wants
+from app.utils.cursor_utils import encode_cursor, parse_page_params
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +21,8 @@ results_bp = Blueprint('results', __name__)
 status_bp = Blueprint('status', __name__)
 logout_bp = Blueprint('logout', __name__)
 
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
 def extract_token(auth_header):
     """Extract token from Authorization header"""
     if auth_header and auth_header.startswith('Bearer '):
@@ -32,8 +40,18 @@ def dashboard():
     """Serve index.html for dashboard path"""
     return send_from_directory('../static', 'index.html')
 
+def refresh_requested() -> bool:
+    """True if the request asks to bypass cached data (?refresh=true)"""
+    return request.args.get('refresh', 'false').lower() == 'true'
+
+def profile_cached() -> bool:
+    """Admission cache probe: the profile can be answered without fetching ETLab"""
+    token = extract_token(request.headers.get('Authorization'))
+    return bool(token) and not refresh_requested() and profile_service.is_cached(token)
+
 # Profile Controller
 @profile_bp.route('/api/profile', methods=['GET'])
+@priority_class(PRIORITY_INTERACTIVE, cache_probe=profile_cached)
 def get_profile():
     """Get user profile information"""
     try:
@@ -43,42 +61,14 @@ def get_profile():
         if not token:
             return jsonify(ApiResponse("Authorization token is required").to_dict()), 401
         
-        url = f"{config.base_url}/student/profile"
-        html = http_service.get(url, token)
+        profile_data = profile_service.get_profile(token, refresh=refresh_requested())
         
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.find('title')
-        
-        if title and 'login' in title.get_text().lower():
+        if profile_data is None:
             return jsonify(ApiResponse("Token expired. Please login again.").to_dict()), 401
         
-        profile_data = {}
-        
-        # Extract profile information from the page
-        # Look for tables or structured data
-        tables = soup.find_all('table')
-        
-        for table_idx, table in enumerate(tables):
-            rows = table.find_all('tr')
-            
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) == 2:
-                    key = cells[0].get_text().strip()
-                    value = cells[1].get_text().strip()
-                    if key and value:
-                        profile_data[key.lower().replace(' ', '_')] = value
-        
-        # If no structured data found, extract any available text
-        if not profile_data:
-            content = soup.find('body')
-            if content:
-                text = content.get_text()
-                profile_data['raw_content'] = text[:500] + "..." if len(text) > 500 else text
-        
         return jsonify({
             "success": True,
-            "profile": profile_data
+            **select_fields({"profile": profile_data})
         }), 200
         
     except Exception as e:
@@ -87,6 +77,7 @@ def get_profile():
 
 # Results Controller
 @results_bp.route('/api/results', methods=['GET'])
+@priority_class(PRIORITY_INTERACTIVE)
 def get_results():
     """Get academic results"""
     try:
@@ -98,80 +89,20 @@ def get_results():
         
         semester = request.args.get('semester', '5')
         url = f"{config.base_url}/ktuacademics/student/results"
-        html = http_service.get(url, token)
+        document = HtmlDocument(http_service.get(url, token))
         
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.find('title')
-        if title and 'login' in title.get_text().lower():
+        if document.is_login_page:
             return jsonify(ApiResponse("Token expired. Please login again.").to_dict()), 401
         
-        results_data = []
-        
-        # Find results tables
-        tables = soup.find_all('table')
-        
-        for table_idx, table in enumerate(tables):
-            table_text = table.get_text().lower()
-            
-            if any(keyword in table_text for keyword in ['result', 'grade', 'marks', 'subject', 'score']):
-                rows = table.find_all('tr')
-                
-                # Get headers
-                if len(rows) > 0:
-                    header_row = rows[0]
-                    headers = [cell.get_text().strip() for cell in header_row.find_all(['th', 'td'])]
-                
-                for row_idx, row in enumerate(rows[1:] if len(rows) > 1 else rows, start=1):
-                    cells = row.find_all(['td', 'th'])
-                    cell_texts = [cell.get_text().strip() for cell in cells]
-                    
-                    if len(cells) >= 2:
-                        subject_data = {}
-                        
-                        # Extract data based on column headers
-                        for j, cell_text in enumerate(cell_texts):
-                            if not cell_text or j >= len(headers):
-                                continue
-                            
-                            header = headers[j].lower()
-                            
-                            # Subject column
-                            if 'subject' in header and cell_text:
-                                subject_data['subject'] = cell_text
-                            
-                            # Semester column
-                            elif 'semester' in header and cell_text:
-                                subject_data['semester'] = cell_text
-                            
-                            # Exam/Assignment/Project type
-                            elif any(x in header for x in ['exam', 'assignment', 'project', 'class project', 'title']) and cell_text:
-                                subject_data['type'] = cell_text
-                            
-                            # Maximum marks
-                            elif 'maximum' in header and cell_text.replace('.', '').isdigit():
-                                try:
-                                    subject_data['max_marks'] = int(cell_text)
-                                except:
-                                    pass
-                            
-                            # Marks obtained
-                            elif 'obtained' in header and cell_text:
-                                # Check if it's a number or status like "Results not published"
-                                if cell_text.replace('.', '').isdigit():
-                                    try:
-                                        subject_data['marks'] = int(cell_text)
-                                    except:
-                                        pass
-                                else:
-                                    subject_data['status'] = cell_text
-                        
-                        if 'subject' in subject_data and subject_data['subject']:
-                            results_data.append(subject_data)
+        # Parse results tables (skipped when ?fields= excludes results)
+        results_data = [record.to_dict() for record in ResultsParser.parse(document)] if wants('results') else []
         
         return jsonify({
             "success": True,
-            "results": results_data,
-            "semester": semester
+            **select_fields({
+                "results": results_data,
+                "semester": semester
+            })
         }), 200
         
     except Exception as e:
@@ -179,6 +110,7 @@ def get_results():
         return jsonify(ApiResponse(f"Error fetching results data: {str(e)}").to_dict()), 500
 
 @results_bp.route('/api/end-semester-results', methods=['GET'])
+@priority_class(PRIORITY_HEAVY)
 def get_end_semester_results():
     """Get KTU end semester examination results"""
     try:
@@ -188,267 +120,113 @@ def get_end_semester_results():
         if not token:
             return jsonify(ApiResponse("Authorization token is required").to_dict()), 401
         
+        limit, cursor, error_msg = parse_page_params(request.args, config.page_max_limit)
+        if error_msg:
+            return jsonify(ApiResponse(error_msg).to_dict()), 400
+        if limit is not None:
+            return get_end_semester_results_page(token, limit, cursor)
+        
         # End semester results listing page
-        url = f"{config.base_url}/universityexam/student/examresult"
-        html = http_service.get(url, token)
+        document = HtmlDocument(results_service.fetch_exam_listing(token))
         
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.find('title')
-        if title and 'login' in title.get_text().lower():
+        if document.is_login_page:
             return jsonify(ApiResponse("Token expired. Please login again.").to_dict()), 401
         
-        # Find all "View Result" links/buttons to get individual result pages
-        exam_results = []
+        result_links = results_service.extract_result_links(document)
         
-        # Look for result cards or links
-        result_links = soup.find_all('a', href=True)
-        for link in result_links:
-            href = link.get('href', '')
-            # Look for view result links
-            if 'viewresult' in href.lower() or 'examresult' in href.lower():
-                # Fetch individual result page
-                try:
-                    if not href.startswith('http'):
-                        result_url = f"{config.base_url}{href}" if href.startswith('/') else f"{config.base_url}/{href}"
-                    else:
-                        result_url = href
-                    
-                    result_html = http_service.get(result_url, token)
-                    result_soup = BeautifulSoup(result_html, 'html.parser')
-                    
-                    # Extract exam details
-                    exam_data = {
-                        'exam_name': '',
-                        'degree': '',
-                        'semester': '',
-                        'academic_year': '',
-                        'month': '',
-                        'year': '',
-                        'subjects': [],
-                        'earned_credit': 0,
-                        'sgpa': 0.0,
-                        'cgpa': 0.0
-                    }
-                    
-                    # Extract exam metadata from the page
-                    # Look for metadata in various formats
-                    
-                    # Method 1: Look in table rows with label-value pairs
-                    all_rows = result_soup.find_all('tr')
-                    for row in all_rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            label = cells[0].get_text().strip()
-                            value = cells[1].get_text().strip()
-                            
-                            label_lower = label.lower()
-                            
-                            if 'name of exam' in label_lower:
-                                exam_data['exam_name'] = value
-                            elif 'degree' in label_lower and not exam_data['degree']:
-                                exam_data['degree'] = value
-                            elif 'semester' in label_lower and not exam_data['semester']:
-                                exam_data['semester'] = value
-                            elif 'academic year' in label_lower:
-                                exam_data['academic_year'] = value
-                            elif 'month' in label_lower and 'academic' not in label_lower:
-                                exam_data['month'] = value
-                            elif label_lower == 'year:' or (label_lower == 'year' and 'academic' not in label_lower):
-                                exam_data['year'] = value
-                    
-                    # Method 2: Look in breadcrumbs or page title
-                    if not exam_data['exam_name']:
-                        # Check page title or h2/h3 tags
-                        title_tags = result_soup.find_all(['h1', 'h2', 'h3', 'title'])
-                        for tag in title_tags:
-                            text = tag.get_text().strip()
-                            if 'semester' in text.lower() and 'exam' in text.lower():
-                                exam_data['exam_name'] = text
-                                break
-                        
-                        # Check breadcrumb or navigation
-                        if not exam_data['exam_name']:
-                            breadcrumbs = result_soup.find_all(['a', 'span'], href=True)
-                            for bc in breadcrumbs:
-                                text = bc.get_text().strip()
-                                if 'semester' in text.lower() and len(text) > 20:
-                                    exam_data['exam_name'] = text
-                                    break
-                    
-                    # Method 3: Extract from exam_name if still empty
-                    if exam_data['exam_name']:
-                        name = exam_data['exam_name']
-                        
-                        # Extract semester from name if not set
-                        if not exam_data['semester']:
-                            import re
-                            semester_match = re.search(r'(First|Second|Third|Fourth|Fifth|Sixth|Seventh|Eighth|Ist|IInd|IIIrd|IVth|Vth|VIth|VIIth|VIIIth)\s+Semester', name, re.IGNORECASE)
-                            if semester_match:
-                                exam_data['semester'] = semester_match.group(0)
-                        
-                        # Extract degree from name if not set
-                        if not exam_data['degree']:
-                            if 'B.Tech' in name or 'B Tech' in name or 'BTech' in name:
-                                exam_data['degree'] = 'BTech KTU'
-                            elif 'M.Tech' in name or 'M Tech' in name or 'MTech' in name:
-                                exam_data['degree'] = 'MTech KTU'
-                        
-                        # Extract year and month from name if not set
-                        if not exam_data['year'] or not exam_data['month']:
-                            import re
-                            # Look for patterns like "December 2024" or "May 2025"
-                            date_match = re.search(r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})', name)
-                            if date_match:
-                                if not exam_data['month']:
-                                    exam_data['month'] = date_match.group(1)
-                                if not exam_data['year']:
-                                    exam_data['year'] = date_match.group(2)
-                        
-                        # Extract academic year if not set (format: 2024 Admission or 2024-2025)
-                        if not exam_data['academic_year']:
-                            import re
-                            # Look for "(2024 Admission)" or "2024-2025"
-                            admission_match = re.search(r'\((\d{4})\s+Admission\)', name)
-                            if admission_match:
-                                year = admission_match.group(1)
-                                # Convert to academic year format
-                                exam_data['academic_year'] = f"{year}-{int(year)+1}"
-                            else:
-                                year_match = re.search(r'(\d{4})-(\d{4})', name)
-                                if year_match:
-                                    exam_data['academic_year'] = f"{year_match.group(1)}-{year_match.group(2)}"
-                    
-                    # Find the results table
-                    tables = result_soup.find_all('table')
-                    
-                    for table in tables:
-                        rows = table.find_all('tr')
-                        
-                        # Find header row
-                        header_row = None
-                        for row in rows:
-                            cells = row.find_all(['th', 'td'])
-                            cell_texts = [cell.get_text().strip().lower() for cell in cells]
-                            if any(keyword in ' '.join(cell_texts) for keyword in ['course code', 'course name', 'grade', 'slot']):
-                                header_row = row
-                                break
-                        
-                        if not header_row:
-                            continue
-                        
-                        # Get headers
-                        headers = [cell.get_text().strip() for cell in header_row.find_all(['th', 'td'])]
-                        
-                        # Parse data rows
-                        for row in rows:
-                            if row == header_row:
-                                continue
-                                
-                            cells = row.find_all('td')
-                            if len(cells) < 2:
-                                continue
-                            
-                            cell_texts = [cell.get_text().strip() for cell in cells]
-                            row_text = ' '.join(cell_texts)
-                            
-                            # Check for SGPA row
-                            if 'SGPA' in row_text:
-                                # SGPA value is usually the last numeric cell or second column
-                                for text in reversed(cell_texts):
-                                    if text.replace('.', '').replace(',', '').isdigit():
-                                        try:
-                                            exam_data['sgpa'] = float(text.replace(',', '.'))
-                                            break
-                                        except:
-                                            pass
-                                continue
-                            
-                            # Check for CGPA row
-                            if 'CGPA' in row_text:
-                                # CGPA value is usually the last numeric cell or second column
-                                for text in reversed(cell_texts):
-                                    if text.replace('.', '').replace(',', '').isdigit():
-                                        try:
-                                            exam_data['cgpa'] = float(text.replace(',', '.'))
-                                            break
-                                        except:
-                                            pass
-                                continue
-                            
-                            # Check for Earned Credit row
-                            if 'Earned Credit' in row_text:
-                                # Credit value is usually the last numeric cell or second column
-                                for text in reversed(cell_texts):
-                                    if text.isdigit():
-                                        try:
-                                            exam_data['earned_credit'] = int(text)
-                                            break
-                                        except:
-                                            pass
-                                continue
-                            
-                            # Skip other summary/header rows
-                            if any(x in row_text.lower() for x in ['course code', 'course name', 'no', 'slot']) and len(cell_texts) > 4:
-                                continue
-                            
-                            # Parse subject data
-                            subject_data = {}
-                            
-                            for j, cell_text in enumerate(cell_texts):
-                                if j >= len(headers):
-                                    break
-                                
-                                header = headers[j].lower()
-                                
-                                # Slot/No column
-                                if 'slot' in header or header == 'no':
-                                    subject_data['slot'] = cell_text
-                                
-                                # Course Code
-                                elif 'course code' in header or 'code' in header:
-                                    subject_data['code'] = cell_text
-                                
-                                # Course Name
-                                elif 'course name' in header or 'name' in header:
-                                    subject_data['name'] = cell_text
-                                
-                                # Grade
-                                elif 'grade' in header:
-                                    subject_data['grade'] = cell_text
-                                
-                                # Credit
-                                elif 'credit' in header:
-                                    try:
-                                        subject_data['credit'] = int(cell_text) if cell_text.isdigit() else 0
-                                    except:
-                                        pass
-                                
-                                # Pass Status
-                                elif 'pass' in header or 'status' in header:
-                                    subject_data['status'] = cell_text
-                            
-                            # Only add if we have at least course code or name
-                            if subject_data.get('code') or subject_data.get('name'):
-                                exam_data['subjects'].append(subject_data)
-                    
-                    # Only add if we found subjects
-                    if exam_data['subjects']:
-                        exam_results.append(exam_data)
-                
-                except Exception as e:
-                    logger.error(f"Error fetching individual result: {e}")
-                    continue
+        # Opt-in streaming: one exam per line as soon as its page is parsed
+        if NDJSON_MIMETYPE in request.headers.get('Accept', ''):
+            return Response(
+                stream_with_context(stream_end_semester_results(token, result_links)),
+                mimetype=NDJSON_MIMETYPE,
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+        
+        # Fetch the unique "View Result" pages concurrently, in page order
+        include_metadata = any(wants(f"exams.{field}") for field in EXAM_METADATA_FIELDS)
+        exam_results, _ = results_service.fetch_exam_results(token, result_links, include_metadata)
         
         return jsonify({
             "success": True,
-            "exams": exam_results,
-            "total_exams": len(exam_results)
+            **select_fields({
+                "exams": exam_results,
+                "total_exams": len(exam_results)
+            })
         }), 200
         
     except Exception as e:
         logger.error(f"Error fetching end semester results: {e}")
         return jsonify(ApiResponse(f"Error fetching end semester results: {str(e)}").to_dict()), 500
 
+def get_end_semester_results_page(token, limit, cursor):
+    """
+    Serve one page of end semester results
+    
+    The listing is fetched once for the first page and remembered; later
+    pages reuse it and fetch only their own exam pages.
+    """
+    listing = results_service.load_listing(token, version=cursor['v'] if cursor else None)
+    if listing is None:
+        return jsonify(ApiResponse("Token expired. Please login again.").to_dict()), 401
+    if cursor and listing['version'] != cursor['v']:
+        return jsonify(ApiResponse(
+            "Results changed since this cursor was issued. Restart without a cursor."
+        ).to_dict()), 410
+    
+    offset = cursor['o'] if cursor else 0
+    end = offset + limit
+    has_more = end < len(listing['links'])
+    
+    include_metadata = any(wants(f"exams.{field}") for field in EXAM_METADATA_FIELDS)
+    exam_results, errors = results_service.fetch_exam_results(
+        token, listing['links'][offset:end], include_metadata
+    )
+    
+    return jsonify({
+        "success": True,
+        **select_fields({
+            "exams": exam_results,
+            "page_exams": len(exam_results),
+            "total_links": len(listing['links']),
+            "errors": errors,
+            "has_more": has_more,
+            "next_cursor": encode_cursor({'v': listing['version'], 'o': end}) if has_more else None
+        })
+    }), 200
+
+def stream_end_semester_results(token, result_links):
+    """
+    Yield NDJSON lines for the end semester results stream
+    
+    Each exam is emitted as {"type": "exam", "index": ..., "exam": {...}} in
+    completion order (index is its position on the listing page), followed
+    by one {"type": "end", ...} trailer with totals and per-page errors.
+    """
+    sent_exams = 0
+    errors = []
+    
+    try:
+        for index, url, outcome in results_service.iter_exam_results(token, result_links):
+            if not outcome.ok:
+                errors.append({'index': index, 'url': url, 'status': outcome.status, 'error': outcome.error})
+            elif outcome.value:
+                sent_exams += 1
+                yield json.dumps({'type': 'exam', 'index': index, 'exam': outcome.value}) + '\n'
+        success = True
+    except Exception as e:
+        # Headers are already sent, so failures are reported in the trailer
+        logger.error(f"Error streaming end semester results: {e}", exc_info=True)
+        errors.append({'error': str(e)})
+        success = False
+    
+    yield json.dumps({
+        'type': 'end',
+        'success': success,
+        'sent_exams': sent_exams,
+        'total_links': len(result_links),
+        'errors': errors
+    }) + '\n'
+
 # Status Controller
 @status_bp.route('/api/status', methods=['GET'])
 def get_status():
@@ -464,7 +242,12 @@ def get_status():
 def logout():
     """Logout user (clear session)"""
     try:
-        # In a stateless API, logout mainly involves client-side token removal
+        # In a stateless API, logout mainly involves client-side token removal;
+        # cached per-token data is dropped here
+        token = extract_token(request.headers.get('Authorization'))
+        if token:
+            profile_service.invalidate(token)
+        
         return jsonify(ApiResponse("Logout successful").to_dict()), 200
         
     except Exception as e:
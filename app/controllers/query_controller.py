@@ -0,0 +1,64 @@
+"""
+Query controller - declarative field selection across ETLab pages
+"""
+from flask import Blueprint, request
+import logging
+from app.services.admission_service import priority_class, PRIORITY_HEAVY, PRIORITY_INTERACTIVE
+from app.services.query_service import QueryService, SessionExpired
+from app.utils.auth_utils import extract_token
+from app.utils.response_utils import (
+    create_success_response,
+    create_unauthorized_response,
+    create_token_expired_response,
+    create_error_response
+)
+
+logger = logging.getLogger(__name__)
+
+query_bp = Blueprint('query', __name__)
+
+
+def query_priority():
+    """Admit queries that need a multi-page scrape through the heavy bulkhead"""
+    fields, _, error_msg = QueryService.parse_query(request.get_json(silent=True))
+    if not error_msg and QueryService.is_heavy(fields):
+        return PRIORITY_HEAVY
+    return None
+
+
+@query_bp.route('/api/query', methods=['POST'])
+@priority_class(PRIORITY_INTERACTIVE, resolver=query_priority)
+def query():
+    """
+    Fetch only the fields a client asks for
+    
+    Request Body:
+        - fields: List of field names (e.g., "attendance.subjects", "timetable.today")
+        - params: Optional semester, month, year and day
+    """
+    try:
+        # Step 1: Extract and validate token
+        token = extract_token(request.headers.get('Authorization'))
+        if not token:
+            return create_unauthorized_response()
+        
+        # Step 2: Validate selection
+        fields, params, error_msg = QueryService.parse_query(request.get_json(silent=True))
+        if error_msg:
+            return create_error_response(error_msg, "VALIDATION_ERROR", status_code=400)
+        
+        # Step 3: Fetch the planned pages and extract the fields
+        try:
+            response_data = QueryService.execute(token, fields, params)
+        except SessionExpired:
+            return create_token_expired_response()
+        
+        return create_success_response(response_data)
+        
+    except Exception as e:
+        logger.error(f"Error executing query: {e}", exc_info=True)
+        return create_error_response(
+            f"Error executing query: {str(e)}",
+            "SERVER_ERROR",
+            status_code=500
+        )
@@ -5,6 +5,7 @@ from flask import Blueprint, request
 import logging
 from app.config.config import config
 from app.services.http_service import http_service
+from app.services.admission_service import priority_class, PRIORITY_INTERACTIVE
 from app.parsers.timetable_parser import TimetableParser
 from app.utils.auth_utils import extract_token
 from app.utils.response_utils import (
@@ -19,6 +20,7 @@ timetable_bp = Blueprint('timetable', __name__)
 
 
 @timetable_bp.route('/api/timetable', methods=['GET'])
+@priority_class(PRIORITY_INTERACTIVE)
 def get_timetable():
     """
     Get timetable data in CSV format and convert to JSON
@@ -43,4 +43,18 @@ class ApiResponse:
             result['data'] = self.data
         if self.status is not None:
             result['status'] = self.status
-        return result
\ No newline at end of file
+        return result
+
+@dataclass
+class InternalResult:
+    """One row of the internal results page (/api/results)"""
+    subject: str = ""
+    semester: Optional[str] = None
+    type: Optional[str] = None
+    max_marks: Optional[int] = None
+    marks: Optional[int] = None
+    status: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        # Only the columns the row actually had
+        return {key: value for key, value in self.__dict__.items() if value is not None}
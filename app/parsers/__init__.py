@@ -3,9 +3,17 @@ HTML parsing modules for different data types
 """
 from .attendance_parser import AttendanceTableParser, AttendanceSubjectParser
 from .timetable_parser import TimetableParser
+from .results_parser import ResultsParser
+from .end_semester_parser import EndSemesterResultParser
+from .profile_parser import ProfileParser
+from .document import HtmlDocument
 
 __all__ = [
     'AttendanceTableParser',
     'AttendanceSubjectParser',
-    'TimetableParser'
+    'TimetableParser',
+    'ResultsParser',
+    'EndSemesterResultParser',
+    'ProfileParser',
+    'HtmlDocument'
 ]
@@ -1,12 +1,91 @@
 """
 Attendance data parser - handles HTML parsing for attendance tables
 """
-from typing import Dict, List, Optional
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional, Pattern, Tuple, Union
 import logging
+import re
+from app.parsers.document import HtmlDocument
+from app.parsers.region_trimmer import TableRegion
+from app.config.config import config
 
 logger = logging.getLogger(__name__)
 
+# Attendance cell (e.g. "46/49 (94%)"): present, total and percentage in one match
+ATTENDANCE_CELL_PATTERN = re.compile(r'(\d+)/(\d+)(?:\D*?(\d+)%)?')
+ATTENDANCE_PERCENT_PATTERN = re.compile(r'(\d+)%')
+
+# Words that identify a subject attendance table when it lacks class="items"
+SUBJECT_TABLE_KEYWORDS = re.compile(r'attendance|present|absent|subject')
+
+# Leading identity columns (ID, Roll No, Name) before the subject columns
+SUBJECT_FIRST_COLUMN = 3
+
+# Where the target tables sit in the raw page (see HtmlDocument.find_table)
+PERIOD_TABLE_REGION = TableRegion('attendance_table', markers=('Period', 'Date'))
+SUBJECT_TABLE_REGION = TableRegion('attendance_subjects', class_name='items')
+
+
+class PeriodStatusClassifier:
+    """
+    Colour verdict for attendance period cells, memoized per attribute signature
+
+    A page only has a handful of distinct cell styles, so each distinct
+    (style, class, bgcolor) combination is matched once against a single
+    precompiled pattern per status and the verdict is reused for every
+    other cell that looks the same.
+    """
+    
+    # Distinct signatures kept before the memo is reset
+    MAX_SIGNATURES = 512
+    
+    def __init__(self, present_colours: List[str], absent_colours: List[str]):
+        self._present = self._compile(present_colours)
+        self._absent = self._compile(absent_colours)
+        self._verdicts: Dict[Tuple[str, str, str], Optional[str]] = {}
+    
+    @staticmethod
+    def _compile(colours: List[str]) -> Optional[Pattern]:
+        """One alternation matching any of the colour substrings (None if there are none)"""
+        if not colours:
+            return None
+        return re.compile('|'.join(re.escape(colour) for colour in colours))
+    
+    def classify(self, cell) -> Optional[str]:
+        """
+        Status implied by a cell's colour attributes
+        
+        Args:
+            cell: BeautifulSoup cell element
+        
+        Returns:
+            'present', 'absent', or None when the colours say nothing
+        """
+        signature = (cell.get('style', ''), ' '.join(cell.get('class', [])), cell.get('bgcolor', ''))
+        try:
+            return self._verdicts[signature]
+        except KeyError:
+            pass
+        
+        colour_lower = ' '.join(signature).lower()
+        if self._present is not None and self._present.search(colour_lower):
+            verdict = 'present'
+        elif self._absent is not None and self._absent.search(colour_lower):
+            verdict = 'absent'
+        else:
+            verdict = None
+        
+        if len(self._verdicts) >= self.MAX_SIGNATURES:
+            self._verdicts.clear()
+        self._verdicts[signature] = verdict
+        return verdict
+
+
+# Shared classifier (colour vocabulary from ATTENDANCE_PRESENT_COLOURS / ATTENDANCE_ABSENT_COLOURS)
+period_status_classifier = PeriodStatusClassifier(
+    config.attendance_present_colours,
+    config.attendance_absent_colours
+)
+
 
 class AttendanceTableParser:
     """
@@ -14,32 +93,27 @@ class AttendanceTableParser:
     """
     
     @staticmethod
-    def parse(html: str) -> Dict:
+    def parse(html: Union[str, HtmlDocument]) -> Dict:
         """
         Parse attendance table HTML into structured data
         
         Args:
-            html: HTML content from attendance page
+            html: HTML content (or already parsed document) from attendance page
         
         Returns:
             Dictionary with dates and period-level attendance
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        tables = soup.find_all('table')
-        
-        dates_data = []
-        
-        for table in tables:
-            # Look for the attendance table with period columns
-            headers = table.find_all('th')
-            header_texts = [h.get_text().strip() for h in headers]
-            
-            # Check if this is the attendance table (has Period columns)
-            if any('Period' in h for h in header_texts) and 'Date' in header_texts:
-                dates_data = AttendanceTableParser._parse_attendance_table(table)
-                break
+        table = HtmlDocument.of(html).find_table(PERIOD_TABLE_REGION, AttendanceTableParser._is_period_table)
+        if table is None:
+            return []
         
-        return dates_data
+        return AttendanceTableParser._parse_attendance_table(table)
+    
+    @staticmethod
+    def _is_period_table(table) -> bool:
+        """Check if a table is the attendance table (has Date and Period columns)"""
+        header_texts = [h.get_text().strip() for h in table.find_all('th')]
+        return any('Period' in h for h in header_texts) and 'Date' in header_texts
     
     @staticmethod
     def _parse_attendance_table(table) -> List[Dict]:
@@ -115,57 +189,16 @@ class AttendanceTableParser:
         Returns:
             Dictionary with period, status, and subject
         """
-        # Get ALL possible color indicators
-        cell_style = cell.get('style', '')
-        cell_class = ' '.join(cell.get('class', []))
-        cell_bgcolor = cell.get('bgcolor', '')
         cell_text = cell.get_text().strip()
+        has_subject = bool(cell_text) and cell_text != '-'
         
-        # Comprehensive color detection
-        color_indicators = cell_style + ' ' + cell_class + ' ' + cell_bgcolor
-        color_lower = color_indicators.lower()
-        
-        # Present indicators (green shades)
-        is_present = any([
-            'green' in color_lower,
-            '#00ff00' in color_lower,
-            '#0f0' in color_lower,
-            'rgb(0, 255, 0)' in color_lower,
-            'rgb(0,255,0)' in color_lower,
-            '#90ee90' in color_lower,  # light green
-            '#00ff7f' in color_lower,  # spring green
-            'success' in color_lower,  # Bootstrap success class
-            'present' in color_lower   # Common class name
-        ])
-        
-        # Absent indicators (red shades)
-        is_absent = any([
-            'red' in color_lower,
-            '#ff0000' in color_lower,
-            '#f00' in color_lower,
-            'rgb(255, 0, 0)' in color_lower,
-            'rgb(255,0,0)' in color_lower,
-            '#dc143c' in color_lower,  # crimson
-            '#ff6b6b' in color_lower,  # light red
-            'danger' in color_lower,   # Bootstrap danger class
-            'absent' in color_lower    # Common class name
-        ])
-        
-        # Determine status and extract subject
-        if is_present:
-            status = 'present'
-            subject = ' '.join(cell_text.split()) if cell_text and cell_text != '-' else ''
-        elif is_absent:
-            status = 'absent'
-            subject = ' '.join(cell_text.split()) if cell_text and cell_text != '-' else ''
-        elif cell_text and cell_text != '-':
-            # Has text but no clear color - assume present with subject
-            status = 'present'
-            subject = ' '.join(cell_text.split())
-        else:
-            # Empty or just dash - no class scheduled
-            status = 'no_class'
-            subject = ''
+        # Determine status from the cell colour, falling back to its text
+        status = period_status_classifier.classify(cell)
+        if status is None:
+            # Has text but no clear color - assume present with subject;
+            # empty or just dash - no class scheduled
+            status = 'present' if has_subject else 'no_class'
+        subject = ' '.join(cell_text.split()) if has_subject else ''
         
         return {
             'period': period_idx,
@@ -232,39 +265,60 @@ class AttendanceTableParser:
 class AttendanceSubjectParser:
     """
     Parser for subject-wise attendance summary
+    
+    Finds the table once (class "items", else by header row), then walks its
+    rows a single time, reading only the subject columns.
     """
     
     @staticmethod
-    def parse(html: str, semester: str) -> Dict:
+    def parse(html: Union[str, HtmlDocument], semester: str) -> Dict:
         """
         Parse subject-wise attendance from HTML
         
         Args:
-            html: HTML content from attendance page
+            html: HTML content (or already parsed document) from attendance page
             semester: Semester number
         
         Returns:
             Dictionary with attendance data per subject
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        document = HtmlDocument.of(html)
         
         # Find attendance table
-        table = soup.find('table', class_='items')
-        
-        if not table:
-            # Try to find any table that might contain attendance data
-            tables = soup.find_all('table')
-            for t in tables:
-                table_text = t.get_text().lower()
-                if any(keyword in table_text for keyword in ['attendance', 'present', 'absent', 'subject']):
-                    table = t
-                    break
-        
-        if not table:
+        table = document.find_table(SUBJECT_TABLE_REGION, lambda t: 'items' in t.get('class', []))
+        if table is None:
+            table = AttendanceSubjectParser._find_by_keywords(document.tables())
+        
+        if table is None:
             return []
         
         return AttendanceSubjectParser._parse_attendance_table(table)
     
+    @staticmethod
+    def _find_by_keywords(tables: List):
+        """
+        Fallback table lookup for pages without the "items" table
+        
+        Checks header rows first and only reads whole tables when no header
+        mentions attendance.
+        
+        Args:
+            tables: Tables in page order
+        
+        Returns:
+            First matching table, or None
+        """
+        for table in tables:
+            header_row = table.find('tr')
+            if header_row is not None and SUBJECT_TABLE_KEYWORDS.search(header_row.get_text().lower()):
+                return table
+        
+        for table in tables:
+            if SUBJECT_TABLE_KEYWORDS.search(table.get_text().lower()):
+                return table
+        
+        return None
+    
     @staticmethod
     def _parse_attendance_table(table) -> List[Dict]:
         """
@@ -276,30 +330,25 @@ class AttendanceSubjectParser:
         Returns:
             List of subject attendance data
         """
-        attendance_data = []
         rows = table.find_all('tr')
         
         if len(rows) < 2:
             return []
         
         # First row should be headers (subject names)
-        header_row = rows[0]
-        headers = [cell.get_text().strip() for cell in header_row.find_all(['th', 'td'])]
+        headers = [cell.get_text().strip() for cell in rows[0].find_all(['th', 'td'])]
         
-        # Find the data row(s) - usually the second row contains the student's attendance
+        # Usually the second row holds the student's attendance
+        attendance_data = []
         for row in rows[1:]:
             cells = row.find_all(['td', 'th'])
-            cell_texts = [cell.get_text().strip() for cell in cells]
-            
-            # Skip first few columns (usually ID, Roll No, Name, etc.)
-            for col_idx, cell_text in enumerate(cell_texts):
-                # Look for attendance pattern: "present/total (percentage%)"
-                if '/' in cell_text and col_idx >= 3:  # Skip first 3 columns
-                    subject_data = AttendanceSubjectParser._parse_attendance_cell(
-                        cell_text, headers, col_idx
-                    )
-                    if subject_data:
-                        attendance_data.append(subject_data)
+            for col_idx in range(SUBJECT_FIRST_COLUMN, len(cells)):
+                cell_text = cells[col_idx].get_text().strip()
+                if '/' not in cell_text:
+                    continue
+                subject_data = AttendanceSubjectParser._parse_attendance_cell(cell_text, headers, col_idx)
+                if subject_data:
+                    attendance_data.append(subject_data)
         
         return attendance_data
     
@@ -316,22 +365,22 @@ class AttendanceSubjectParser:
         Returns:
             Dictionary with subject attendance data or None
         """
-        import re
-        
-        # Extract attendance data
-        match = re.search(r'(\d+)/(\d+)', cell_text)
+        match = ATTENDANCE_CELL_PATTERN.search(cell_text)
         if not match:
             return None
         
         present = int(match.group(1))
         total = int(match.group(2))
         
-        # Try to extract percentage
-        percentage_match = re.search(r'(\d+)%', cell_text)
-        if percentage_match:
-            percentage = float(percentage_match.group(1))
+        # The percentage that follows the count, unless another one comes first
+        if match.group(3) is not None and '%' not in cell_text[:match.start(3)]:
+            percentage = float(match.group(3))
         else:
-            percentage = round((present / total * 100), 2) if total > 0 else 0
+            percentage_match = ATTENDANCE_PERCENT_PATTERN.search(cell_text) if '%' in cell_text else None
+            if percentage_match:
+                percentage = float(percentage_match.group(1))
+            else:
+                percentage = round((present / total * 100), 2) if total > 0 else 0
         
         # Get subject name from header
         subject_name = headers[col_idx] if col_idx < len(headers) else f"Subject_{col_idx}"
@@ -0,0 +1,119 @@
+"""
+Parsed page document - one fetched ETLab page, parsed at most once
+"""
+from typing import Callable, List, Optional, Union
+from bs4 import BeautifulSoup, SoupStrainer
+from app.parsers.html_engine import make_soup, TABLE_STRAINER, LINK_STRAINER
+from app.parsers.page_sniffer import sniff_title
+from app.parsers.region_trimmer import TableRegion, trim_to_region
+
+
+class HtmlDocument:
+    """
+    A fetched page shared by the expiry check, the parser and debug hooks
+
+    Controllers wrap the HTML once and hand the same object down, so the
+    parser and anything else reading the page share one tree instead of
+    each parsing the page again. The session-expiry check only sniffs the
+    title and never builds a tree, and a document that only ever needs its
+    tables or links builds a strained tree instead of the full one.
+    """
+
+    __slots__ = ('html', '_soup', '_table_soup', '_tables', '_links')
+
+    def __init__(self, html: str):
+        self.html = html
+        self._soup: Optional[BeautifulSoup] = None
+        self._table_soup: Optional[BeautifulSoup] = None
+        self._tables: Optional[List] = None
+        self._links: Optional[List] = None
+
+    @classmethod
+    def of(cls, source: Union[str, 'HtmlDocument']) -> 'HtmlDocument':
+        """Wrap HTML in a document (documents are returned as they are)"""
+        return source if isinstance(source, HtmlDocument) else cls(source)
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Full parse tree, built on first use"""
+        if self._soup is None:
+            self._soup = make_soup(self.html)
+        return self._soup
+
+    @property
+    def title(self) -> str:
+        """Text of the page's <title> (empty if there is none), sniffed without parsing"""
+        return sniff_title(self.html) or ''
+
+    @property
+    def is_login_page(self) -> bool:
+        """True if ETLab answered with its login page (session expired)"""
+        return 'login' in self.title.lower()
+
+    @property
+    def table_soup(self) -> BeautifulSoup:
+        """
+        Tree holding the page's tables
+
+        The full tree when it has already been built; otherwise a tree
+        parsed with only the tables kept.
+        """
+        if self._soup is not None:
+            return self._soup
+        if self._table_soup is None:
+            self._table_soup = make_soup(self.html, TABLE_STRAINER)
+        return self._table_soup
+
+    def strained(self, strainer: SoupStrainer) -> BeautifulSoup:
+        """
+        Tree holding only what a strainer keeps (not cached)
+
+        The full tree when it has already been built.
+        """
+        if self._soup is not None:
+            return self._soup
+        return make_soup(self.html, strainer)
+
+    def tables(self) -> List:
+        """All <table> elements in page order"""
+        if self._tables is None:
+            self._tables = self.table_soup.find_all('table')
+        return self._tables
+
+    def links(self) -> List:
+        """
+        All <a href> elements in page order
+
+        Read from the full tree when it has already been built; otherwise
+        from a tree parsed with only the links kept.
+        """
+        if self._links is None:
+            if self._soup is not None:
+                self._links = self._soup.find_all('a', href=True)
+            else:
+                self._links = make_soup(self.html, LINK_STRAINER).find_all('a')
+        return self._links
+
+    def find_table(self, region: TableRegion, match: Callable[[object], bool]):
+        """
+        First table accepted by match, parsing only the region's table when possible
+
+        The region's markers cut the candidate table out of the raw HTML so
+        only that fragment is parsed. When the markers aren't found, or the
+        fragment's tables don't satisfy match, the whole page is searched.
+
+        Args:
+            region: String markers locating the target table
+            match: Check applied to parsed tables (the parser's own test)
+
+        Returns:
+            Matching table element, or None
+        """
+        if self._soup is None and self._tables is None:
+            fragment = trim_to_region(self.html, region)
+            if fragment is not None:
+                table = next((t for t in make_soup(fragment, TABLE_STRAINER).find_all('table') if match(t)), None)
+                if table is not None:
+                    return table
+
+        return next((t for t in self.tables() if match(t)), None)
@@ -0,0 +1,341 @@
+"""
+End semester result parser - handles HTML parsing for one university exam result page
+"""
+from typing import Dict, List, Optional, Tuple, Union
+import logging
+import re
+from app.parsers.document import HtmlDocument
+from app.parsers.html_engine import HEADING_STRAINER
+
+logger = logging.getLogger(__name__)
+
+# Exam fields filled from page metadata rather than the results table
+EXAM_METADATA_FIELDS = ('exam_name', 'degree', 'semester', 'academic_year', 'month', 'year')
+
+# Exam name patterns, compiled once at import (shared copy-on-write across workers)
+SEMESTER_NAME_PATTERN = re.compile(
+    r'(First|Second|Third|Fourth|Fifth|Sixth|Seventh|Eighth|Ist|IInd|IIIrd|IVth|Vth|VIth|VIIth|VIIIth)\s+Semester',
+    re.IGNORECASE
+)
+EXAM_DATE_PATTERN = re.compile(
+    r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})'
+)
+ADMISSION_YEAR_PATTERN = re.compile(r'\((\d{4})\s+Admission\)')
+ACADEMIC_YEAR_PATTERN = re.compile(r'(\d{4})-(\d{4})')
+
+# Label of the metadata row naming the exam, looked for in the raw HTML
+EXAM_NAME_LABEL_PATTERN = re.compile(r'name\s+of\s+exam', re.IGNORECASE)
+
+# Row patterns: results table header, summary rows, repeated headers (lowercased text)
+RESULT_HEADER_PATTERN = re.compile(r'course code|course name|grade|slot')
+SUMMARY_ROW_PATTERN = re.compile(r'SGPA|CGPA|Earned Credit')
+REPEATED_HEADER_PATTERN = re.compile(r'course code|course name|no|slot')
+
+# Exam name candidates, picked up by one walk of the heading tree (a set test
+# per node is far cheaper than find_all with a list of names)
+HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'title'))
+LINK_TAGS = frozenset(('a', 'span'))
+
+# One parsed row: (texts of all cells, texts of the <td> cells)
+Row = Tuple[List[str], List[str]]
+
+
+class EndSemesterResultParser:
+    """
+    Parser for end semester (university exam) result pages
+
+    Only the page's tables are parsed, and each table's rows are read a
+    single time: their cell texts serve both the label/value metadata
+    lookup and the results table. Headings and breadcrumb links are parsed
+    (into a tree of their own) only when no metadata row names the exam.
+    Each table's header row is found with one pattern search per row; a
+    layout registry lookup would cost more than that search.
+
+    The parser depends on neither Flask nor request state; parse takes
+    page HTML and returns plain data, so it can run in any worker.
+    """
+
+    @staticmethod
+    def parse(html: Union[str, HtmlDocument], include_metadata: bool = True) -> Optional[Dict]:
+        """
+        Extract exam metadata and subject rows from one result page
+
+        Args:
+            html: HTML content (or already parsed document) of the result page
+            include_metadata: Extract exam name, degree, semester and dates
+
+        Returns:
+            Exam dictionary, or None if the page has no subjects
+        """
+        document = HtmlDocument.of(html)
+
+        exam_data = {
+            'exam_name': '',
+            'degree': '',
+            'semester': '',
+            'academic_year': '',
+            'month': '',
+            'year': '',
+            'subjects': [],
+            'earned_credit': 0,
+            'sgpa': 0.0,
+            'cgpa': 0.0
+        }
+
+        if include_metadata and not EndSemesterResultParser._named_without_headings(document):
+            # Headings or breadcrumbs will be needed: build the full tree once
+            # and read the rows from it too, rather than parsing twice
+            document.soup
+
+        # Rows are read from the table-strained tree, grouped by their own table
+        tables: List[List[Row]] = []
+        for table in document.tables():
+            rows = EndSemesterResultParser._own_rows(table)
+            if not rows:
+                continue
+            tables.append(rows)
+            if include_metadata:
+                for row in rows:
+                    EndSemesterResultParser._apply_label(exam_data, row[1])
+
+        if include_metadata:
+            if not exam_data['exam_name']:
+                exam_data['exam_name'] = EndSemesterResultParser._exam_name_from(document)
+            if exam_data['exam_name']:
+                EndSemesterResultParser._fill_from_name(exam_data)
+
+        for rows in tables:
+            EndSemesterResultParser._parse_table(rows, exam_data)
+
+        # Only return if we found subjects
+        return exam_data if exam_data['subjects'] else None
+
+    @staticmethod
+    def _own_rows(table) -> List[Row]:
+        """Parsed rows of a table, leaving out rows of tables nested in it"""
+        rows = table.find_all('tr')
+        if table.find('table') is not None:
+            rows = [row for row in rows if row.find_parent('table') is table]
+        return [EndSemesterResultParser._read_row(row) for row in rows]
+
+    @staticmethod
+    def _read_row(row) -> Row:
+        """Texts of a row's cells, all cells and <td> cells only"""
+        texts = []
+        td_texts = []
+        for cell in row.find_all(['td', 'th'], recursive=False):
+            text = cell.get_text().strip()
+            texts.append(text)
+            if cell.name == 'td':
+                td_texts.append(text)
+        return texts, td_texts
+
+    @staticmethod
+    def _apply_label(exam_data: Dict, td_texts: List[str]) -> None:
+        """Fill metadata from a label/value row"""
+        if len(td_texts) < 2:
+            return
+
+        label = td_texts[0].lower()
+        value = td_texts[1]
+
+        if 'name of exam' in label:
+            exam_data['exam_name'] = value
+        elif 'degree' in label and not exam_data['degree']:
+            exam_data['degree'] = value
+        elif 'semester' in label and not exam_data['semester']:
+            exam_data['semester'] = value
+        elif 'academic year' in label:
+            exam_data['academic_year'] = value
+        elif 'month' in label and 'academic' not in label:
+            exam_data['month'] = value
+        elif label == 'year:' or label == 'year':
+            exam_data['year'] = value
+
+    @staticmethod
+    def _named_without_headings(document: HtmlDocument) -> bool:
+        """True if a label row or the title likely names the exam (checked without parsing)"""
+        if EXAM_NAME_LABEL_PATTERN.search(document.html):
+            return True
+        lowered = document.title.lower()
+        return 'semester' in lowered and 'exam' in lowered
+
+    @staticmethod
+    def _exam_name_from(document: HtmlDocument) -> str:
+        """
+        Exam name from the page title or headings, else from breadcrumb links
+
+        The title (which comes before any heading) is sniffed without
+        parsing; headings and links are only parsed, into a tree of their
+        own, when the title doesn't name the exam.
+        """
+        title = document.title.strip()
+        lowered = title.lower()
+        if 'semester' in lowered and 'exam' in lowered:
+            return title
+
+        headings = []
+        links = []
+        for element in document.strained(HEADING_STRAINER).descendants:
+            name = element.name
+            if name in HEADING_TAGS:
+                headings.append(element)
+            elif name in LINK_TAGS and element.has_attr('href'):
+                links.append(element)
+
+        for tag in headings:
+            text = tag.get_text().strip()
+            lowered = text.lower()
+            if 'semester' in lowered and 'exam' in lowered:
+                return text
+
+        for link in links:
+            text = link.get_text().strip()
+            if 'semester' in text.lower() and len(text) > 20:
+                return text
+
+        return ''
+
+    @staticmethod
+    def _fill_from_name(exam_data: Dict) -> None:
+        """Derive missing semester, degree, dates and academic year from the exam name"""
+        name = exam_data['exam_name']
+
+        if not exam_data['semester']:
+            semester_match = SEMESTER_NAME_PATTERN.search(name)
+            if semester_match:
+                exam_data['semester'] = semester_match.group(0)
+
+        if not exam_data['degree']:
+            if 'B.Tech' in name or 'B Tech' in name or 'BTech' in name:
+                exam_data['degree'] = 'BTech KTU'
+            elif 'M.Tech' in name or 'M Tech' in name or 'MTech' in name:
+                exam_data['degree'] = 'MTech KTU'
+
+        # Patterns like "December 2024" or "May 2025"
+        if not exam_data['year'] or not exam_data['month']:
+            date_match = EXAM_DATE_PATTERN.search(name)
+            if date_match:
+                if not exam_data['month']:
+                    exam_data['month'] = date_match.group(1)
+                if not exam_data['year']:
+                    exam_data['year'] = date_match.group(2)
+
+        # "(2024 Admission)" or "2024-2025"
+        if not exam_data['academic_year']:
+            admission_match = ADMISSION_YEAR_PATTERN.search(name)
+            if admission_match:
+                year = admission_match.group(1)
+                exam_data['academic_year'] = f"{year}-{int(year)+1}"
+            else:
+                year_match = ACADEMIC_YEAR_PATTERN.search(name)
+                if year_match:
+                    exam_data['academic_year'] = f"{year_match.group(1)}-{year_match.group(2)}"
+
+    @staticmethod
+    def _parse_table(rows: List[Row], exam_data: Dict) -> None:
+        """Add one table's subject and summary rows (tables without a results header are skipped)"""
+        header_row, roles = EndSemesterResultParser._find_layout(rows)
+        if header_row is None:
+            return
+
+        for row in rows:
+            if row is header_row:
+                continue
+
+            cell_texts = row[1]
+            if len(cell_texts) < 2:
+                continue
+
+            row_text = ' '.join(cell_texts)
+
+            if SUMMARY_ROW_PATTERN.search(row_text):
+                EndSemesterResultParser._apply_summary(exam_data, row_text, cell_texts)
+                continue
+
+            # Skip other summary/header rows
+            if len(cell_texts) > 4 and REPEATED_HEADER_PATTERN.search(row_text.lower()):
+                continue
+
+            subject_data = EndSemesterResultParser._parse_subject(cell_texts, roles)
+
+            # Only add if we have at least course code or name
+            if subject_data.get('code') or subject_data.get('name'):
+                exam_data['subjects'].append(subject_data)
+
+    @staticmethod
+    def _apply_summary(exam_data: Dict, row_text: str, cell_texts: List[str]) -> None:
+        """Take SGPA, CGPA or earned credits from the last numeric cell of a summary row"""
+        if 'SGPA' in row_text or 'CGPA' in row_text:
+            key = 'sgpa' if 'SGPA' in row_text else 'cgpa'
+            for text in reversed(cell_texts):
+                if text.replace('.', '').replace(',', '').isdigit():
+                    try:
+                        exam_data[key] = float(text.replace(',', '.'))
+                        return
+                    except ValueError:
+                        pass
+            return
+
+        for text in reversed(cell_texts):
+            if text.isdecimal():
+                exam_data['earned_credit'] = int(text)
+                return
+
+    @staticmethod
+    def _find_layout(rows: List[Row]) -> Tuple[Optional[Row], Tuple[Optional[str], ...]]:
+        """
+        Header row and column roles of a table
+
+        Args:
+            rows: The table's rows
+
+        Returns:
+            (header row, role of each column), or (None, ()) for tables
+            without a results header
+        """
+        header_row = next((row for row in rows if RESULT_HEADER_PATTERN.search(' '.join(row[0]).lower())), None)
+        if header_row is None:
+            return None, ()
+        return header_row, tuple(EndSemesterResultParser._column_role(header.lower()) for header in header_row[0])
+
+    @staticmethod
+    def _column_role(header: str) -> Optional[str]:
+        """
+        What a column holds, judged from its lowercased header
+
+        Returns:
+            'slot', 'code', 'name', 'grade', 'credit', 'status', or None
+        """
+        if 'slot' in header or header == 'no':
+            return 'slot'
+        if 'code' in header:
+            return 'code'
+        if 'name' in header:
+            return 'name'
+        if 'grade' in header:
+            return 'grade'
+        if 'credit' in header:
+            return 'credit'
+        if 'pass' in header or 'status' in header:
+            return 'status'
+        return None
+
+    @staticmethod
+    def _parse_subject(cell_texts: List[str], roles: Tuple[Optional[str], ...]) -> Dict:
+        """Subject dictionary from one data row's <td> texts"""
+        subject_data = {}
+
+        for role, cell_text in zip(roles, cell_texts):
+            if role is None:
+                continue
+            if role == 'credit':
+                # Digits int() can't read (e.g. superscripts) leave the credit out
+                if cell_text.isdecimal():
+                    subject_data['credit'] = int(cell_text)
+                elif not cell_text.isdigit():
+                    subject_data['credit'] = 0
+            else:
+                subject_data[role] = cell_text
+
+        return subject_data
@@ -0,0 +1,69 @@
+"""
+HTML parsing engine - one place that decides how ETLab pages are parsed
+
+Every parser works on BeautifulSoup trees; the engine only picks the tree
+builder. There is no raw lxml/XPath engine: porting a parser to it means a
+second implementation of its lookups, and strained lxml-built soups plus
+the zero-parse title sniffer already remove most of the parse cost.
+"""
+import logging
+from typing import Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from app.config.config import config
+
+try:
+    import lxml
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Engine names (HTML_PARSER_ENGINE)
+ENGINE_HTML_PARSER = 'html.parser'  # stdlib tree builder, slowest
+ENGINE_LXML = 'lxml'                # BeautifulSoup on the lxml tree builder
+ENGINES = (ENGINE_HTML_PARSER, ENGINE_LXML)
+
+# Strainers for parsers that only read part of the page. Everything outside
+# the matching elements is dropped while the tree is built.
+TABLE_STRAINER = SoupStrainer('table')
+LINK_STRAINER = SoupStrainer('a', href=True)
+HEADING_STRAINER = SoupStrainer(['h1', 'h2', 'h3', 'title', 'a', 'span'])
+
+
+def resolve_engine(name: Optional[str] = None) -> str:
+    """
+    Engine that will actually be used for a configured name
+
+    Falls back to html.parser for unknown names or when lxml is not installed.
+
+    Args:
+        name: Engine name (default: config.html_parser_engine)
+
+    Returns:
+        One of ENGINES
+    """
+    name = (name or config.html_parser_engine).lower()
+    if name not in ENGINES:
+        logger.warning(f"Unknown HTML parser engine '{name}', using {ENGINE_HTML_PARSER}")
+        return ENGINE_HTML_PARSER
+    if name != ENGINE_HTML_PARSER and not LXML_AVAILABLE:
+        return ENGINE_HTML_PARSER
+    return name
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None, engine: Optional[str] = None) -> BeautifulSoup:
+    """
+    Build a BeautifulSoup tree with the configured engine
+
+    Args:
+        html: Page content
+        parse_only: Strainer limiting the tree to the elements a parser needs
+        engine: Engine override (benchmarks); defaults to the configured engine
+
+    Returns:
+        BeautifulSoup document
+    """
+    features = ENGINE_HTML_PARSER if resolve_engine(engine) == ENGINE_HTML_PARSER else 'lxml'
+    return BeautifulSoup(html, features, parse_only=parse_only)
+
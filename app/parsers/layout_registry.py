@@ -0,0 +1,101 @@
+"""
+Layout registry - learned page layouts keyed by structural fingerprint
+"""
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+from app.config.config import config
+
+# Lookup outcomes counted per page kind
+OUTCOME_HIT = 'hit'            # known fingerprint, specialised path
+OUTCOME_LEARNED = 'learned'    # new fingerprint, generic path, layout remembered
+OUTCOME_GENERIC = 'generic'    # generic path, layout not reusable (or changed)
+OUTCOMES = (OUTCOME_HIT, OUTCOME_LEARNED, OUTCOME_GENERIC)
+
+
+class LayoutRegistry:
+    """
+    Remembers how each page kind's layouts were parsed
+
+    A fingerprint is a hash of the structure a parser keys its heuristics
+    on (a table's class and header texts, a CSV header row). The first page
+    with a fingerprint takes the parser's generic path and the layout it
+    finds (column roles, header position, format) is stored as the
+    fingerprint's plan; later pages with the same fingerprint go straight
+    to the plan. Parsers only store a plan when the fingerprint fully
+    determines what the generic path would find, so both paths give the
+    same output.
+
+    Outcome counters per kind make layout changes on ETLab visible: a new
+    layout shows up as learned/generic lookups and new fingerprints.
+    """
+
+    def __init__(self, max_layouts: int):
+        self.max_layouts = max_layouts
+        self._lock = threading.Lock()
+        # kind -> fingerprint -> {'plan': ..., 'hits': int}
+        self._layouts: Dict[str, Dict[str, Dict]] = {}
+        # kind -> outcome -> count
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def fingerprint(*parts: str) -> str:
+        """Short hash of a layout's structural parts"""
+        return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()[:12]
+
+    def known(self, kind: str, fingerprint: str) -> Optional[Any]:
+        """Plan stored for a fingerprint, or None if it hasn't been learned"""
+        with self._lock:
+            layout = self._layouts.get(kind, {}).get(fingerprint)
+        return layout['plan'] if layout is not None else None
+
+    def learn(self, kind: str, fingerprint: str, plan: Any) -> None:
+        """
+        Remember the plan the generic path found for a fingerprint
+
+        Args:
+            kind: Page kind (e.g. 'timetable')
+            fingerprint: Value from fingerprint()
+            plan: Whatever the parser's specialised path needs (not None)
+        """
+        with self._lock:
+            layouts = self._layouts.setdefault(kind, {})
+            if fingerprint not in layouts and len(layouts) >= self.max_layouts:
+                layouts.clear()
+            layouts[fingerprint] = {'plan': plan, 'hits': 0}
+
+    def record(self, kind: str, outcome: str, fingerprint: Optional[str] = None) -> None:
+        """Count one lookup outcome (OUTCOME_*) for a page kind"""
+        with self._lock:
+            counts = self._counts.setdefault(kind, dict.fromkeys(OUTCOMES, 0))
+            counts[outcome] += 1
+            if outcome == OUTCOME_HIT and fingerprint is not None:
+                layout = self._layouts.get(kind, {}).get(fingerprint)
+                if layout is not None:
+                    layout['hits'] += 1
+
+    def reset(self) -> None:
+        """Forget every learned layout and counter"""
+        with self._lock:
+            self._layouts.clear()
+            self._counts.clear()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Outcome counts, hit rate and known fingerprints per page kind"""
+        with self._lock:
+            stats = {}
+            for kind in sorted(set(self._counts) | set(self._layouts)):
+                counts = dict(self._counts.get(kind, dict.fromkeys(OUTCOMES, 0)))
+                lookups = sum(counts.values())
+                stats[kind] = {
+                    **counts,
+                    'lookups': lookups,
+                    'hit_rate': round(counts[OUTCOME_HIT] / lookups, 4) if lookups else None,
+                    'layouts': {fingerprint: layout['hits']
+                                for fingerprint, layout in self._layouts.get(kind, {}).items()}
+                }
+            return stats
+
+
+# Global instance (per worker process)
+layout_registry = LayoutRegistry(max_layouts=config.layout_max_fingerprints)
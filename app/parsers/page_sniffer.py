@@ -0,0 +1,79 @@
+"""
+Page sniffer - session-expiry and login-success checks without building a DOM
+"""
+import html as html_lib
+import re
+from typing import Optional
+from urllib.parse import urlsplit
+
+# The <title> sits in the first few KB of every ETLab page
+SNIFF_WINDOW = 8192
+
+TITLE_PATTERN = re.compile(r'<title\b[^>]*>(.*?)</title\s*>', re.IGNORECASE | re.DOTALL)
+
+# Where ETLab sends unauthenticated requests
+LOGIN_PATH = '/user/login'
+
+# Statuses that mean the session was not accepted
+AUTH_FAILURE_STATUSES = (401, 403)
+
+
+def sniff_title(html: str) -> Optional[str]:
+    """
+    Text of the page's first <title>, found by pattern instead of parsing
+
+    Looks at the first SNIFF_WINDOW characters and only scans the rest of
+    the page when the title isn't there.
+
+    Args:
+        html: Page content
+
+    Returns:
+        Unescaped title text, or None if the page has no <title>
+    """
+    match = TITLE_PATTERN.search(html, 0, SNIFF_WINDOW)
+    if match is None and len(html) > SNIFF_WINDOW:
+        match = TITLE_PATTERN.search(html)
+    return html_lib.unescape(match.group(1)) if match else None
+
+
+def is_login_html(html: str) -> bool:
+    """True if the page is ETLab's login page (title mentions login)"""
+    title = sniff_title(html)
+    return title is not None and 'login' in title.lower()
+
+
+def login_hint(response) -> Optional[bool]:
+    """
+    Decide from the final URL and status alone whether a response is the login page
+
+    Args:
+        response: requests.Response (redirects already followed)
+
+    Returns:
+        True if it is the login page, False if it redirected somewhere
+        else, None when only the body can tell
+    """
+    if getattr(response, 'status_code', None) in AUTH_FAILURE_STATUSES:
+        return True
+
+    # Without a redirect the URL is just what was requested (the login form
+    # itself for POST /user/login), so only redirects say anything
+    if not getattr(response, 'history', None):
+        return None
+
+    path = urlsplit(str(getattr(response, 'url', '') or '')).path.rstrip('/')
+    return path.endswith(LOGIN_PATH)
+
+
+def is_login_response(response) -> bool:
+    """
+    True if a response landed on ETLab's login page
+
+    Uses the redirect/status hint when it is conclusive and sniffs the
+    title otherwise; the body is never parsed into a tree.
+    """
+    hint = login_hint(response)
+    if hint is not None:
+        return hint
+    return is_login_html(response.text)
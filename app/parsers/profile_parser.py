@@ -0,0 +1,67 @@
+"""
+Profile parser - handles HTML parsing for the student profile page
+"""
+from typing import Dict, Union
+import logging
+import re
+from app.parsers.document import HtmlDocument
+
+logger = logging.getLogger(__name__)
+
+# Runs of anything but letters and digits become one underscore in a key
+KEY_SEPARATOR_PATTERN = re.compile(r'[^a-z0-9]+')
+
+# Characters of page text kept when the profile has no label/value rows
+RAW_CONTENT_LIMIT = 500
+
+
+class ProfileParser:
+    """
+    Parser for the student profile page
+
+    Profile details are label/value rows (a <th> or <td> label followed by
+    one value cell). All table rows are read in one pass and labels are
+    normalised to snake_case keys, so "Date of Birth:" becomes
+    "date_of_birth" wherever the profile is used.
+    """
+
+    @staticmethod
+    def parse(html: Union[str, HtmlDocument]) -> Dict[str, str]:
+        """
+        Extract the profile's label/value rows
+
+        Args:
+            html: HTML content (or already parsed document) of the profile page
+
+        Returns:
+            Dictionary of normalised key -> value, in page order (empty if none)
+        """
+        profile = {}
+
+        for row in HtmlDocument.of(html).table_soup.find_all('tr'):
+            cells = row.find_all(['td', 'th'], recursive=False)
+            if len(cells) != 2:
+                continue
+
+            key = ProfileParser.normalise_key(cells[0].get_text())
+            if not key:
+                continue
+            value = cells[1].get_text().strip()
+            if value:
+                profile[key] = value
+
+        return profile
+
+    @staticmethod
+    def normalise_key(label: str) -> str:
+        """snake_case key for a profile label ("Roll No." -> "roll_no")"""
+        return KEY_SEPARATOR_PATTERN.sub('_', label.lower()).strip('_')
+
+    @staticmethod
+    def raw_content(html: Union[str, HtmlDocument]) -> str:
+        """Start of the page's body text, for pages without label/value rows"""
+        body = HtmlDocument.of(html).soup.find('body')
+        if not body:
+            return ''
+        text = body.get_text()
+        return text[:RAW_CONTENT_LIMIT] + "..." if len(text) > RAW_CONTENT_LIMIT else text
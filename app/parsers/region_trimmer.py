@@ -0,0 +1,94 @@
+"""
+Region trimmer - cut the one table a parser needs out of a page before parsing
+"""
+import re
+from typing import Iterator, Optional, Tuple
+
+TABLE_OPEN_PATTERN = re.compile(r'<table\b[^>]*>', re.IGNORECASE)
+TABLE_TAG_PATTERN = re.compile(r'<(/?)table\b[^>]*>', re.IGNORECASE)
+CLASS_ATTR_PATTERN = re.compile(r'''\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''', re.IGNORECASE)
+
+
+class TableRegion:
+    """
+    Markers identifying a page's target table by plain string search
+
+    Args:
+        name: Label for measurements and logs
+        class_name: CSS class the <table> tag must carry
+        markers: Strings that must all appear inside the table
+    """
+
+    __slots__ = ('name', 'class_name', 'markers')
+
+    def __init__(self, name: str, class_name: Optional[str] = None, markers: Tuple[str, ...] = ()):
+        self.name = name
+        self.class_name = class_name
+        self.markers = markers
+
+    def matches_tag(self, open_tag: str) -> bool:
+        """True if a <table ...> opening tag carries the required class"""
+        if self.class_name is None:
+            return True
+        match = CLASS_ATTR_PATTERN.search(open_tag)
+        if not match:
+            return False
+        classes = next(group for group in match.groups() if group is not None)
+        return self.class_name in classes.split()
+
+    def matches_fragment(self, fragment: str) -> bool:
+        """True if every marker appears in the table's markup"""
+        return all(marker in fragment for marker in self.markers)
+
+
+def _is_hidden(html_lower: str, pos: int) -> bool:
+    """True if pos falls inside an HTML comment or a <script> block"""
+    comment = html_lower.rfind('<!--', 0, pos)
+    if comment != -1 and html_lower.find('-->', comment, pos) == -1:
+        return True
+    script = html_lower.rfind('<script', 0, pos)
+    return script != -1 and html_lower.find('</script', script, pos) == -1
+
+
+def _table_end(html: str, start: int) -> Optional[int]:
+    """End offset of the table opened at start, accounting for nested tables"""
+    depth = 0
+    for tag in TABLE_TAG_PATTERN.finditer(html, start):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return tag.end()
+    return None
+
+
+def iter_tables(html: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (opening tag, full table markup) for every table in document order
+
+    Nested tables are yielded after the table that contains them, as a
+    DOM walk would find them.
+    """
+    html_lower = html.lower()
+    for opening in TABLE_OPEN_PATTERN.finditer(html):
+        if _is_hidden(html_lower, opening.start()):
+            continue
+        end = _table_end(html, opening.start())
+        if end is None:
+            return
+        yield opening.group(0), html[opening.start():end]
+
+
+def trim_to_region(html: str, region: TableRegion) -> Optional[str]:
+    """
+    Markup of the first table matching a region
+
+    Args:
+        html: Full page content
+        region: Target table markers
+
+    Returns:
+        The table's markup, or None when no table matches (parse the whole page)
+    """
+    for open_tag, fragment in iter_tables(html):
+        if region.matches_tag(open_tag) and region.matches_fragment(fragment):
+            return fragment
+    return None
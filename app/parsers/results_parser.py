@@ -0,0 +1,135 @@
+"""
+Internal results parser - handles HTML parsing for the semester results page
+"""
+from typing import List, Optional, Tuple, Union
+import logging
+from app.models.dto import InternalResult
+from app.parsers.document import HtmlDocument
+
+logger = logging.getLogger(__name__)
+
+# Header keywords that give a column the type role
+TYPE_HEADER_KEYWORDS = ('exam', 'assignment', 'project', 'class project', 'title')
+
+
+class ResultsParser:
+    """
+    Parser for internal results tables (marks per subject and assessment)
+
+    A results table is recognised by its header row naming a subject
+    column. Mapping a handful of header texts to column roles is cheaper
+    than fingerprinting them, so this parser has no layout registry fast
+    path.
+    """
+
+    @staticmethod
+    def parse(html: Union[str, HtmlDocument]) -> List[InternalResult]:
+        """
+        Parse every results table on the page
+
+        Args:
+            html: HTML content (or already parsed document) of the results page
+
+        Returns:
+            One record per subject row, in page order
+        """
+        results = []
+
+        for table in HtmlDocument.of(html).tables():
+            rows = table.find_all('tr')
+            if not rows:
+                continue
+
+            headers = [cell.get_text().strip() for cell in rows[0].find_all(['th', 'td'])]
+            roles = ResultsParser._roles_for(headers)
+
+            # Tables without a subject column hold no results
+            if roles is None:
+                continue
+
+            for row in rows[1:]:
+                record = ResultsParser._parse_row(row, roles)
+                if record is not None:
+                    results.append(record)
+
+        return results
+
+    @staticmethod
+    def _roles_for(headers: List[str]) -> Optional[Tuple[Tuple[int, str], ...]]:
+        """
+        Column roles for a table, from its header texts
+
+        Args:
+            headers: Texts of the table's first row
+
+        Returns:
+            ((column index, role), ...), or None for tables without a subject column
+        """
+        roles = tuple(
+            (index, role) for index, role in
+            ((index, ResultsParser._column_role(header.lower())) for index, header in enumerate(headers))
+            if role is not None
+        )
+        return roles if any(role == 'subject' for _, role in roles) else None
+
+    @staticmethod
+    def _column_role(header: str) -> Optional[str]:
+        """
+        What a column holds, judged from its lowercased header
+
+        Returns:
+            'subject', 'semester', 'type', 'max_marks', 'marks', or None
+        """
+        if 'subject' in header:
+            return 'subject'
+        if 'semester' in header:
+            return 'semester'
+        if any(keyword in header for keyword in TYPE_HEADER_KEYWORDS):
+            return 'type'
+        if 'maximum' in header:
+            return 'max_marks'
+        if 'obtained' in header:
+            return 'marks'
+        return None
+
+    @staticmethod
+    def _parse_row(row, roles: Tuple[Tuple[int, str], ...]) -> Optional[InternalResult]:
+        """
+        Build a record from one data row
+
+        Args:
+            row: BeautifulSoup row element
+            roles: Column roles from the table's header row
+
+        Returns:
+            Record, or None if the row has no subject
+        """
+        cells = row.find_all(['td', 'th'])
+        if len(cells) < 2:
+            return None
+
+        record = InternalResult()
+        for index, role in roles:
+            if index >= len(cells):
+                break
+            text = cells[index].get_text().strip()
+            if not text:
+                continue
+
+            if role == 'subject':
+                record.subject = text
+            elif role == 'semester':
+                record.semester = text
+            elif role == 'type':
+                record.type = text
+            elif role == 'max_marks':
+                if text.isdecimal():
+                    record.max_marks = int(text)
+            elif role == 'marks':
+                # A number, or a status like "Results not published"
+                if text.isdecimal():
+                    record.marks = int(text)
+                elif not text.replace('.', '').isdigit():
+                    record.status = text
+
+        return record if record.subject else None
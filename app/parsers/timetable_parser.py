@@ -1,12 +1,13 @@
 """
 Timetable parser - handles HTML/CSV parsing for timetable data
 """
-from typing import Dict, List
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional
 from collections import OrderedDict
 import csv
 from io import StringIO
 import logging
+from app.parsers.page_sniffer import is_login_html
+from app.parsers.layout_registry import layout_registry, OUTCOME_HIT, OUTCOME_LEARNED, OUTCOME_GENERIC
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +15,20 @@ logger = logging.getLogger(__name__)
 class TimetableParser:
     """
     Parser for timetable data in CSV or HTML format
+    
+    CSV layouts are fingerprinted by their header row: the first CSV with a
+    given header row is scanned for its format and columns, later ones are
+    parsed directly with what that scan found.
     """
     
     DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     
+    # Lowercase day name -> canonical day name
+    DAY_LOOKUP = {day.lower(): day for day in DAYS}
+    
+    # Page kind in the layout registry
+    LAYOUT_KIND = 'timetable'
+    
     @staticmethod
     def parse(data: str) -> Dict:
         """
@@ -57,19 +68,12 @@ class TimetableParser:
                     "schedule": TimetableParser._get_empty_schedule()
                 }
             
-            # Initialize schedule structure
-            schedule = TimetableParser._get_empty_schedule()
+            # Known header rows go straight to their layout's parser
+            fingerprint = TimetableParser._header_fingerprint(rows)
+            schedule = TimetableParser._parse_known_layout(rows, csv_data, fingerprint)
             
-            # Find headers and day columns
-            header_info = TimetableParser._find_csv_headers(rows)
-            
-            if header_info['format'] == 'days_as_columns':
-                schedule = TimetableParser._parse_days_as_columns(
-                    rows, header_info['header_row_idx'],
-                    header_info['time_col_idx'], header_info['day_col_indices']
-                )
-            elif header_info['format'] == 'days_as_rows':
-                schedule = TimetableParser._parse_days_as_rows(rows)
+            if schedule is None:
+                schedule = TimetableParser._parse_generic(rows, fingerprint)
             
             total_periods = sum(len(schedule[day]) for day in schedule)
             
@@ -88,6 +92,80 @@ class TimetableParser:
                 "schedule": TimetableParser._get_empty_schedule()
             }
     
+    @staticmethod
+    def _header_fingerprint(rows: List[List[str]]) -> str:
+        """Fingerprint of the CSV header row, as the header scan sees it"""
+        return layout_registry.fingerprint(*(cell.lower().strip() for cell in rows[0]))
+    
+    @staticmethod
+    def _parse_known_layout(rows: List[List[str]], csv_data: str, fingerprint: str) -> Optional[OrderedDict]:
+        """
+        Parse with the layout learned for this header row
+        
+        Args:
+            rows: CSV rows
+            csv_data: CSV content string
+            fingerprint: Header row fingerprint
+        
+        Returns:
+            Schedule dictionary, or None when the layout is unknown or the
+            data no longer fits it (take the generic path)
+        """
+        plan = layout_registry.known(TimetableParser.LAYOUT_KIND, fingerprint)
+        if plan is None:
+            return None
+        
+        if plan['format'] == 'days_as_columns':
+            # Learned only for a header in the first row, which alone fixes the columns
+            schedule = TimetableParser._parse_days_as_columns(
+                rows, 0, plan['time_col_idx'], plan['day_col_indices']
+            )
+        else:
+            # Days as rows holds only while no cell names a time or period
+            # column (no such cell can span a delimiter, so the raw text answers)
+            lowered = csv_data.lower()
+            if 'time' in lowered or 'period' in lowered:
+                return None
+            schedule = TimetableParser._parse_days_as_rows(rows)
+        
+        layout_registry.record(TimetableParser.LAYOUT_KIND, OUTCOME_HIT, fingerprint)
+        return schedule
+    
+    @staticmethod
+    def _parse_generic(rows: List[List[str]], fingerprint: str) -> OrderedDict:
+        """
+        Parse by scanning for headers and day names, remembering the layout found
+        
+        Args:
+            rows: CSV rows
+            fingerprint: Header row fingerprint
+        
+        Returns:
+            Schedule dictionary
+        """
+        schedule = TimetableParser._get_empty_schedule()
+        
+        # Find headers and day columns
+        header_info = TimetableParser._find_csv_headers(rows)
+        
+        if header_info['format'] == 'days_as_columns':
+            schedule = TimetableParser._parse_days_as_columns(
+                rows, header_info['header_row_idx'],
+                header_info['time_col_idx'], header_info['day_col_indices']
+            )
+        elif header_info['format'] == 'days_as_rows':
+            schedule = TimetableParser._parse_days_as_rows(rows)
+        
+        if header_info['format'] == 'days_as_rows' or (
+                header_info['format'] == 'days_as_columns' and header_info['header_row_idx'] == 0):
+            plan = {key: header_info[key] for key in ('format', 'time_col_idx', 'day_col_indices')}
+            layout_registry.learn(TimetableParser.LAYOUT_KIND, fingerprint, plan)
+            layout_registry.record(TimetableParser.LAYOUT_KIND, OUTCOME_LEARNED, fingerprint)
+        else:
+            layout_registry.record(TimetableParser.LAYOUT_KIND, OUTCOME_GENERIC)
+        
+        return schedule
+    
     @staticmethod
     def _parse_html(html: str) -> Dict:
         """
@@ -99,10 +177,7 @@ class TimetableParser:
         Returns:
             Dictionary with error message
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.find('title')
-        
-        if title and 'login' in title.get_text().lower():
+        if is_login_html(html):
             return {
                 "message": "Session expired",
                 "schedule": TimetableParser._get_empty_schedule()
@@ -161,7 +236,7 @@ class TimetableParser:
         # If no headers found, check for days as rows format
         if csv_format == 'unknown':
             for row in rows:
-                if row and row[0].strip().lower() in [d.lower() for d in TimetableParser.DAYS]:
+                if row and row[0].strip().lower() in TimetableParser.DAY_LOOKUP:
                     csv_format = 'days_as_rows'
                     break
         
@@ -231,8 +306,8 @@ class TimetableParser:
                 continue
             
             # Check if this row starts with a day name
-            if len(row) > 0 and row[0].strip().lower() in [d.lower() for d in TimetableParser.DAYS]:
-                current_day = next(d for d in TimetableParser.DAYS if d.lower() == row[0].strip().lower())
+            current_day = TimetableParser.DAY_LOOKUP.get(row[0].strip().lower())
+            if current_day:
                 
                 # Parse all periods in this row (columns 1 onwards)
                 for j in range(1, len(row)):
@@ -0,0 +1,229 @@
+"""
+Admission service - per-worker load shedding with per-priority bulkheads
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+from app.config.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+    """
+    Limits concurrent requests admitted through one bulkhead in this worker
+
+    At most ``max_concurrent`` requests run at once and at most ``max_queue``
+    more wait (up to ``queue_timeout`` seconds) for a slot. Anything beyond
+    that is rejected immediately so the caller can answer 503 instead of
+    letting the request sit until the gunicorn timeout kills the worker.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float, retry_after: int):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._admitted_total = 0
+        self._rejected_total = 0
+
+    def acquire(self) -> bool:
+        """
+        Try to take a slot, waiting briefly in the bounded queue if needed
+
+        Returns:
+            True if admitted (caller must release), False if shed
+        """
+        with self._condition:
+            # Don't let newcomers jump ahead of requests already queued
+            if self._in_flight < self.max_concurrent and self._waiting == 0:
+                return self._admit()
+
+            if self._waiting >= self.max_queue:
+                self._rejected_total += 1
+                return False
+
+            self._waiting += 1
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while self._in_flight >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected_total += 1
+                        return False
+                    self._condition.wait(remaining)
+                return self._admit()
+            finally:
+                self._waiting -= 1
+
+    def _admit(self) -> bool:
+        """Record an admission (condition lock must be held)"""
+        self._in_flight += 1
+        self._admitted_total += 1
+        return True
+
+    def release(self):
+        """Return a slot taken by acquire()"""
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._condition.notify()
+
+    def stats(self) -> Dict:
+        """Current occupancy and counters"""
+        with self._condition:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'in_flight': self._in_flight,
+                'waiting': self._waiting,
+                'admitted_total': self._admitted_total,
+                'rejected_total': self._rejected_total
+            }
+
+
+# Priority classes - each gets its own bulkhead so heavy scrapes degrade first
+PRIORITY_CRITICAL = 'critical'         # login: reserved capacity
+PRIORITY_INTERACTIVE = 'interactive'   # single-page reads
+PRIORITY_HEAVY = 'heavy'               # multi-page fan-out scrapes
+PRIORITY_DIAGNOSTIC = 'diagnostic'     # troubleshooting endpoints
+PRIORITY_LONG_POLL = 'long_poll'       # requests that hold their thread while waiting (job polls)
+
+
+def priority_class(name: str, cache_probe: Optional[Callable[[], bool]] = None,
+                   resolver: Optional[Callable[[], Optional[str]]] = None):
+    """
+    Tag a view with a priority class so it is admitted through that bulkhead
+
+    The cache probe runs inside the request context; if it returns True the
+    request is answered from cache and bypasses admission entirely. The
+    resolver also runs inside the request context and may pick a different
+    class for requests whose cost depends on their parameters.
+
+    Args:
+        name: One of the PRIORITY_* classes
+        cache_probe: Optional callable returning True on a cache hit
+        resolver: Optional callable returning a PRIORITY_* class (None = use name)
+
+    Returns:
+        Decorator that tags the view function
+    """
+    if name not in bulkheads:
+        raise ValueError(f"Unknown priority class: {name}")
+
+    def decorator(func: Callable) -> Callable:
+        func.priority_class = name
+        func.admission_cache_probe = cache_probe
+        func.priority_resolver = resolver
+        return func
+
+    return decorator
+
+
+def select_bulkhead(view: Optional[Callable]) -> Optional[AdmissionController]:
+    """
+    Pick the bulkhead a request must be admitted through
+
+    Args:
+        view: Flask view function for the current request
+
+    Returns:
+        The bulkhead for the view's priority class, or None for untagged
+        views and cache hits
+    """
+    name = getattr(view, 'priority_class', None)
+    if name is None:
+        return None
+
+    cache_probe = getattr(view, 'admission_cache_probe', None)
+    if cache_probe:
+        try:
+            if cache_probe():
+                return None
+        except Exception as e:
+            logger.error(f"Admission cache probe failed: {e}")
+
+    resolver = getattr(view, 'priority_resolver', None)
+    if resolver:
+        try:
+            name = resolver() or name
+        except Exception as e:
+            logger.error(f"Admission priority resolver failed: {e}")
+
+    return bulkheads.get(name, bulkheads[view.priority_class])
+
+
+def bulkhead_stats() -> Dict[str, Dict]:
+    """Occupancy and counters for every bulkhead"""
+    return {name: bulkhead.stats() for name, bulkhead in bulkheads.items()}
+
+
+def check_thread_capacity(threads: int, reserved: int = 0) -> None:
+    """
+    Make sure every bulkhead slot can hold a thread with one to spare
+
+    A request that is running or queued in a bulkhead holds a gunicorn
+    thread. If the slots add up to the thread count, extra requests wait
+    in gunicorn's accept backlog instead of reaching the shedder, so no
+    503 is ever sent and login's reserved slot can't be reached.
+
+    Args:
+        threads: Request threads per worker (GUNICORN_THREADS)
+        reserved: Threads held outside admission (SSE streams)
+
+    Raises:
+        ValueError: If the slots don't fit or login has no slot
+    """
+    slots = sum(bulkhead.max_concurrent + bulkhead.max_queue for bulkhead in bulkheads.values())
+    if bulkheads[PRIORITY_CRITICAL].max_concurrent < 1:
+        raise ValueError("BULKHEAD_CRITICAL_CONCURRENCY must be at least 1")
+    if slots + reserved >= threads:
+        raise ValueError(
+            f"Bulkheads need {slots} threads and SSE streams {reserved}, but GUNICORN_THREADS={threads}; "
+            f"raise GUNICORN_THREADS to at least {slots + reserved + 1} or lower the BULKHEAD_* sizes"
+        )
+
+
+def check_worker_threads(threads: int) -> None:
+    """
+    Make sure GUNICORN_THREADS matches the threads gunicorn actually runs
+
+    check_thread_capacity and the derived BULKHEAD_* defaults read
+    GUNICORN_THREADS, but gunicorn's --threads flag (or a threads setting in
+    another config file) overrides it without the application noticing.
+    Called from gunicorn's post_fork hook, so a worker fails to boot instead.
+
+    Args:
+        threads: Request threads per worker from gunicorn's settings
+
+    Raises:
+        ValueError: If the two disagree
+    """
+    if config.admission_enabled and threads != config.worker_threads:
+        raise ValueError(
+            f"gunicorn runs {threads} threads per worker but GUNICORN_THREADS={config.worker_threads}; "
+            f"set GUNICORN_THREADS={threads} (bulkhead sizes and the thread capacity check are derived from it)"
+        )
+
+
+def _build_bulkhead(concurrency: int, queue: int) -> AdmissionController:
+    """Create a bulkhead with the shared queue timeout and Retry-After"""
+    return AdmissionController(
+        max_concurrent=concurrency,
+        max_queue=queue,
+        queue_timeout=config.admission_queue_timeout,
+        retry_after=config.admission_retry_after
+    )
+
+
+# Global bulkheads (state is per worker process)
+bulkheads: Dict[str, AdmissionController] = {
+    PRIORITY_CRITICAL: _build_bulkhead(config.bulkhead_critical_concurrency, config.bulkhead_critical_queue),
+    PRIORITY_INTERACTIVE: _build_bulkhead(config.bulkhead_interactive_concurrency, config.bulkhead_interactive_queue),
+    PRIORITY_HEAVY: _build_bulkhead(config.bulkhead_heavy_concurrency, config.bulkhead_heavy_queue),
+    PRIORITY_DIAGNOSTIC: _build_bulkhead(config.bulkhead_diagnostic_concurrency, config.bulkhead_diagnostic_queue),
+    PRIORITY_LONG_POLL: _build_bulkhead(config.bulkhead_long_poll_concurrency, config.bulkhead_long_poll_queue),
+}
@@ -2,11 +2,16 @@
 Attendance service - handles attendance data fetching and processing
 """
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from app.config.config import config
 from app.services.http_service import http_service
+from app.services.fanout_service import fanout_service
 from app.parsers.attendance_parser import AttendanceTableParser, AttendanceSubjectParser
+from app.parsers.document import HtmlDocument
 from app.utils.date_utils import convert_month_to_number
+from app.utils.diff_utils import diff_attendance_dates
+from app.utils.fieldset_utils import wants
+from app.utils.cursor_utils import encode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +47,61 @@ class AttendanceService:
         response = http_service.post(url, data=form_data, token=token)
         return response.text if hasattr(response, 'text') else response.content.decode('utf-8')
     
+    @staticmethod
+    def fetch_attendance_month(token: str, semester: str, year: int, month: int) -> Optional[List[Dict]]:
+        """
+        Fetch and parse one month of the attendance table
+        
+        Args:
+            token: Authentication token
+            semester: Semester number
+            year: Year
+            month: Month number (1-12)
+        
+        Returns:
+            Parsed dates data, or None if the session has expired
+        """
+        document = HtmlDocument(AttendanceService.fetch_attendance_table(token, semester, str(month), str(year)))
+        
+        if document.is_login_page:
+            return None
+        
+        return AttendanceTableParser.parse(document)
+    
+    @staticmethod
+    def fetch_attendance_range(token: str, semester: str, months: List[Tuple[int, int]]) -> List[Dict]:
+        """
+        Fetch several months of the attendance table concurrently
+        
+        Args:
+            token: Authentication token
+            semester: Semester number
+            months: (year, month) tuples in chronological order
+        
+        Returns:
+            One entry per month, in the given order, with year, month,
+            status ('ok', 'expired', 'error' or 'timeout') and dates
+        """
+        tasks = [
+            (lambda year=year, month=month: AttendanceService.fetch_attendance_month(token, semester, year, month))
+            for year, month in months
+        ]
+        outcomes = fanout_service.run_all(tasks)
+        
+        month_results = []
+        for (year, month), outcome in zip(months, outcomes):
+            entry = {'year': year, 'month': month, 'status': outcome.status, 'dates': []}
+            if not outcome.ok:
+                logger.error(f"Error fetching attendance for {year}-{month:02d}: {outcome.error}")
+                entry['error'] = outcome.error
+            elif outcome.value is None:
+                entry['status'] = 'expired'
+            else:
+                entry['dates'] = outcome.value
+            month_results.append(entry)
+        
+        return month_results
+    
     @staticmethod
     def fetch_attendance_subjects(token: str, semester: str) -> str:
         """
@@ -73,7 +133,7 @@ class AttendanceService:
         Returns:
             Complete response dictionary
         """
-        summary = AttendanceTableParser.calculate_summary(dates_data)
+        summary = AttendanceTableParser.calculate_summary(dates_data) if wants('summary') else None
         
         return {
             'semester': semester,
@@ -84,6 +144,124 @@ class AttendanceService:
             'summary': summary
         }
     
+    @staticmethod
+    def build_attendance_table_page(snapshot: Dict, offset: int, limit: int, semester: str,
+                                    month: str, month_requested: str, year: str) -> Dict:
+        """
+        Build one page of the attendance table from a stored snapshot
+        
+        Args:
+            snapshot: Snapshot from the attendance snapshot store
+            offset: Index of the first date entry
+            limit: Maximum number of date entries
+            semester: Semester number
+            month: Numeric month
+            month_requested: Original month parameter
+            year: Year
+        
+        Returns:
+            Response dictionary with the page of dates, the month's summary
+            and the cursor for the next page
+        """
+        dates_data = snapshot['dates']
+        end = offset + limit
+        has_more = end < len(dates_data)
+        
+        return {
+            'semester': semester,
+            'month': month,
+            'month_requested': month_requested,
+            'year': year,
+            'dates': dates_data[offset:end],
+            'summary': AttendanceTableParser.calculate_summary(dates_data) if wants('summary') else None,
+            'version': snapshot['version'],
+            'total_dates': len(dates_data),
+            'has_more': has_more,
+            'next_cursor': encode_cursor({'v': snapshot['version'], 'o': end}) if has_more else None
+        }
+    
+    @staticmethod
+    def build_attendance_range_response(month_results: List[Dict], semester: str) -> Dict:
+        """
+        Merge per-month attendance into one range response
+        
+        Args:
+            month_results: Entries from fetch_attendance_range
+            semester: Semester number
+        
+        Returns:
+            Response dictionary with merged dates, combined summary and
+            per-month breakdown
+        """
+        dates_data = []
+        months = []
+        
+        for entry in month_results:
+            month_dates = [
+                dict(date_entry, month=str(entry['month']), year=str(entry['year']))
+                for date_entry in entry['dates']
+            ]
+            dates_data.extend(month_dates)
+            
+            month_summary = {
+                'month': str(entry['month']),
+                'year': str(entry['year']),
+                'status': entry['status'],
+                'days': len(month_dates),
+                'summary': AttendanceTableParser.calculate_summary(month_dates) if wants('months.summary') else None
+            }
+            if entry.get('error'):
+                month_summary['error'] = entry['error']
+            months.append(month_summary)
+        
+        first, last = month_results[0], month_results[-1]
+        return {
+            'semester': semester,
+            'from': f"{first['year']}-{first['month']:02d}",
+            'to': f"{last['year']}-{last['month']:02d}",
+            'dates': dates_data,
+            'summary': AttendanceTableParser.calculate_summary(dates_data) if wants('summary') else None,
+            'months': months
+        }
+    
+    @staticmethod
+    def build_attendance_changes_response(current: Dict, base: Optional[Dict], semester: str,
+                                          month: str, year: str) -> Dict:
+        """
+        Build a delta response against the snapshot the client already has
+        
+        Args:
+            current: Latest snapshot (version, timestamp, dates)
+            base: Client's snapshot, or None if unknown (full dates are sent)
+            semester: Semester number
+            month: Numeric month
+            year: Year
+        
+        Returns:
+            Response dictionary with changes (or full dates) and the new summary
+        """
+        response_data = {
+            'semester': semester,
+            'month': month,
+            'year': year,
+            'version': current['version'],
+            'timestamp': current['timestamp'],
+            'summary': AttendanceTableParser.calculate_summary(current['dates']) if wants('summary') else None
+        }
+        
+        if base is None:
+            response_data['full'] = True
+            response_data['dates'] = current['dates']
+            return response_data
+        
+        response_data['full'] = False
+        response_data['base_version'] = base['version']
+        response_data['changes'] = (
+            [] if base['version'] == current['version']
+            else diff_attendance_dates(base['dates'], current['dates'])
+        )
+        return response_data
+    
     @staticmethod
     def build_attendance_subjects_response(attendance_data: List[Dict], semester: str) -> Dict:
         """
@@ -101,7 +279,7 @@ class AttendanceService:
             'semester': semester
         }
         
-        if attendance_data:
+        if attendance_data and wants('overall_percentage'):
             # Calculate overall attendance
             total_percentage = sum(item.get('percentage', 0) for item in attendance_data)
             avg_percentage = total_percentage / len(attendance_data)
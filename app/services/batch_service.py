@@ -0,0 +1,164 @@
+"""
+Batch service - fetch several API resources concurrently under one deadline
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from flask import Flask
+from app.config.config import config
+from app.services.fanout_service import fanout_service
+from app.utils.dispatch_utils import dispatch_internal
+
+logger = logging.getLogger(__name__)
+
+# Resource name -> API path. Only single-page (interactive) resources are
+# batchable; heavy scrapes go through their own bulkhead.
+BATCH_RESOURCES = {
+    'profile': '/api/profile',
+    'attendance': '/api/attendance',
+    'attendance-table': '/api/attendance-table',
+    'timetable': '/api/timetable',
+    'results': '/api/results'
+}
+
+
+class BatchService:
+    """
+    Service for validating and executing batch requests
+    """
+    
+    @staticmethod
+    def parse_parts(payload: Optional[Dict]) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """
+        Validate the batch request body
+        
+        Args:
+            payload: JSON body, e.g. {"requests": [{"resource": "profile"}, ...]}
+        
+        Returns:
+            Tuple of (parts, error_message); parts have id, resource and params
+        """
+        if not payload or not isinstance(payload.get('requests'), list) or not payload['requests']:
+            return None, "Body must contain a non-empty 'requests' list"
+        
+        if len(payload['requests']) > config.batch_max_parts:
+            return None, f"At most {config.batch_max_parts} requests per batch"
+        
+        parts = []
+        seen_ids = set()
+        for item in payload['requests']:
+            if not isinstance(item, dict):
+                return None, "Each request must be an object"
+            
+            resource = item.get('resource')
+            if resource not in BATCH_RESOURCES:
+                return None, f"Unknown resource '{resource}'. Available: {', '.join(BATCH_RESOURCES)}"
+            
+            params = item.get('params') or {}
+            if not isinstance(params, dict):
+                return None, f"'params' for '{resource}' must be an object"
+            
+            part_id = str(item.get('id') or resource)
+            if part_id in seen_ids:
+                return None, f"Duplicate request id '{part_id}'"
+            seen_ids.add(part_id)
+            
+            parts.append({
+                'id': part_id,
+                'resource': resource,
+                'params': {key: str(value) for key, value in params.items()}
+            })
+        
+        return parts, None
+    
+    @staticmethod
+    def resolve_deadline(payload: Dict) -> float:
+        """
+        Get the batch deadline, capped at the configured maximum
+        
+        Args:
+            payload: JSON body with optional "deadline" in seconds
+        
+        Returns:
+            Deadline in seconds
+        """
+        try:
+            requested = float(payload.get('deadline', config.batch_deadline))
+        except (TypeError, ValueError):
+            requested = config.batch_deadline
+        return max(1.0, min(requested, config.batch_deadline))
+    
+    @staticmethod
+    def run_part(app: Flask, part: Dict, headers: Dict, slots: threading.Semaphore,
+                 deadline_at: float) -> Tuple[int, Any]:
+        """
+        Run one part once one of the batch's slots is free
+
+        The batch as a whole was admitted through the interactive bulkhead,
+        so parts are not admitted again; the batch's own slots bound how many
+        of its parts fetch from ETLab at once.
+
+        Args:
+            app: Flask application
+            part: Validated part from parse_parts
+            headers: Request headers for the part
+            slots: Semaphore shared by the batch's parts
+            deadline_at: time.monotonic() value of the batch deadline
+
+        Returns:
+            Tuple of (HTTP status code, JSON body)
+
+        Raises:
+            TimeoutError: If no slot freed up before the deadline
+        """
+        if not slots.acquire(timeout=max(0.0, deadline_at - time.monotonic())):
+            raise TimeoutError("Deadline exceeded")
+        try:
+            return dispatch_internal(app, BATCH_RESOURCES[part['resource']], part['params'], headers)
+        finally:
+            slots.release()
+
+    @staticmethod
+    def execute(app: Flask, parts: List[Dict], auth_header: str, deadline: float) -> Dict:
+        """
+        Fetch all parts concurrently and combine them
+        
+        Args:
+            app: Flask application
+            parts: Validated parts from parse_parts
+            auth_header: Authorization header shared by every part
+            deadline: Overall deadline in seconds
+        
+        Returns:
+            Combined payload with a status for each part
+        """
+        headers = {'Authorization': auth_header}
+        slots = threading.Semaphore(config.batch_max_concurrency)
+        started = time.monotonic()
+        tasks = [
+            (lambda part=part: BatchService.run_part(app, part, headers, slots, started + deadline))
+            for part in parts
+        ]
+        
+        outcomes = fanout_service.run_all(tasks, timeout=deadline)
+        
+        results = {}
+        for part, outcome in zip(parts, outcomes):
+            entry = {'resource': part['resource'], 'status': outcome.status}
+            if outcome.ok:
+                http_status, body = outcome.value
+                entry['http_status'] = http_status
+                entry['body'] = body
+                if http_status >= 400:
+                    entry['status'] = 'error'
+            else:
+                entry['error'] = outcome.error
+            results[part['id']] = entry
+        
+        return {
+            'results': results,
+            'total': len(parts),
+            'succeeded': sum(1 for entry in results.values() if entry['status'] == 'ok'),
+            'elapsed_ms': round((time.monotonic() - started) * 1000)
+        }
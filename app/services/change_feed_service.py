@@ -0,0 +1,394 @@
+"""
+Change feed service - one shared ETLab poll per token, fanned out to SSE subscribers
+"""
+import hashlib
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.config.config import config
+from app.services.attendance_service import AttendanceService
+from app.services.results_service import results_service
+from app.parsers.document import HtmlDocument
+from app.utils.diff_utils import diff_attendance_dates
+from app.utils.fork_utils import register_after_fork
+
+logger = logging.getLogger(__name__)
+
+TOPIC_ATTENDANCE = 'attendance'
+TOPIC_RESULTS = 'results'
+TOPICS = (TOPIC_ATTENDANCE, TOPIC_RESULTS)
+
+
+class SubscriberLimitReached(Exception):
+    """Raised when this worker already serves the maximum number of streams"""
+
+
+class TokenWatch:
+    """
+    Polls ETLab for one token and fans change events out to its subscribers
+
+    Every subscriber with the same token and parameters shares this watch,
+    so upstream load is one scrape per interval no matter how many devices
+    are listening. The first poll only records a baseline and sends "ready".
+
+    The watch keeps polling for ``grace`` seconds after its last subscriber
+    leaves, so a client reconnecting after the stream's SSE_MAX_DURATION
+    gets the changes it missed instead of a new baseline. Event ids carry
+    the watch's epoch ("<epoch>-<n>"); a Last-Event-ID this watch cannot
+    replay from (another watch or worker, or older than the kept history)
+    is answered with a "resync" event.
+    """
+
+    # Recent events kept for clients reconnecting with Last-Event-ID
+    HISTORY_SIZE = 100
+
+    def __init__(self, key: Tuple, token: str, semester: str, month: str, year: str,
+                 topics: Tuple[str, ...], interval: float, jitter: float, grace: float, on_idle):
+        self.key = key
+        self.token = token
+        self.semester = semester
+        self.month = month
+        self.year = year
+        self.topics = topics
+        self.interval = interval
+        self.jitter = jitter
+        self.grace = grace
+        self.epoch = uuid.uuid4().hex[:12]
+        self._on_idle = on_idle
+        self._lock = threading.Lock()
+        self._subscribers: List[queue.Queue] = []
+        self._history = deque(maxlen=self.HISTORY_SIZE)
+        self._next_id = 1
+        self._idle_since: Optional[float] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._dates: Optional[List[Dict]] = None
+        self._result_links: Optional[set] = None
+        self._thread = threading.Thread(target=self._run, name='change-feed', daemon=True)
+
+    def start(self):
+        """Begin polling in the background"""
+        self._thread.start()
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Optional[queue.Queue]:
+        """
+        Register a subscriber queue, replaying events after last_event_id
+
+        Args:
+            last_event_id: Id of the last event the client saw (from Last-Event-ID)
+
+        Returns:
+            Queue that receives (event id, event name, data) tuples, or None
+            if the watch has stopped
+        """
+        subscriber = queue.Queue()
+        with self._lock:
+            if self._stop.is_set():
+                return None
+            if last_event_id is not None:
+                missed = self._missed_since(last_event_id)
+                if missed is None:
+                    subscriber.put((self._event_id(self._next_id - 1), 'resync', {'topics': list(self.topics)}))
+                else:
+                    for event in missed:
+                        subscriber.put(event)
+            self._subscribers.append(subscriber)
+            self._idle_since = None
+        return subscriber
+
+    def _missed_since(self, last_event_id: str) -> Optional[List[Tuple]]:
+        """Kept events after last_event_id, or None if they can't all be replayed (caller holds the lock)"""
+        epoch, _, number = last_event_id.partition('-')
+        if epoch != self.epoch or not number.isdigit() or int(number) >= self._next_id:
+            return None
+        missed = self._next_id - 1 - int(number)
+        if missed > len(self._history):
+            return None
+        return list(self._history)[len(self._history) - missed:]
+
+    def _event_id(self, number: int) -> str:
+        """Event id unique to this watch"""
+        return f"{self.epoch}-{number}"
+
+    def unsubscribe(self, subscriber: queue.Queue) -> bool:
+        """
+        Stop delivering events to a subscriber queue
+
+        Returns:
+            True if the queue was subscribed
+        """
+        with self._lock:
+            if subscriber not in self._subscribers:
+                return False
+            self._subscribers.remove(subscriber)
+            if not self._subscribers:
+                self._idle_since = time.monotonic()
+                self._wake.set()
+            return True
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of streams attached to this watch"""
+        with self._lock:
+            return len(self._subscribers)
+
+    def stop(self):
+        """Stop polling after the current cycle"""
+        self._stop.set()
+        self._wake.set()
+
+    @property
+    def stopped(self) -> bool:
+        """True once the watch has stopped (or is about to) and takes no new subscribers"""
+        return self._stop.is_set()
+
+    def _publish(self, name: str, data: Dict):
+        """Send an event to every subscriber and keep it for replay"""
+        with self._lock:
+            event = (self._event_id(self._next_id), name, data)
+            self._next_id += 1
+            self._history.append(event)
+            for subscriber in self._subscribers:
+                subscriber.put(event)
+
+    def _run(self):
+        """Poll loop: scrape, diff, publish, sleep a jittered interval"""
+        first = True
+        next_poll = time.monotonic()
+        while not self._stop.is_set():
+            if time.monotonic() >= next_poll:
+                try:
+                    self._poll()
+                    if first and not self._stop.is_set():
+                        self._publish('ready', {'topics': list(self.topics)})
+                    first = False
+                except Exception as e:
+                    logger.error(f"Change feed poll failed: {e}")
+                    self._publish('error', {'error': str(e)})
+                next_poll = time.monotonic() + self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+            self._wake.clear()
+            delay = self._idle_delay(next_poll)
+            if delay is None:
+                break
+            self._wake.wait(delay)
+
+        self._on_idle(self)
+
+    def _idle_delay(self, next_poll: float) -> Optional[float]:
+        """
+        Seconds to sleep before the next poll or the end of the grace period
+
+        Returns:
+            None once the watch has had no subscribers for ``grace`` seconds
+            (it is then stopped, under the same lock subscribe takes)
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._idle_since is None:
+                return max(0.0, next_poll - now)
+            grace_left = self._idle_since + self.grace - now
+            if grace_left <= 0:
+                self._stop.set()
+                return None
+            return max(0.0, min(next_poll - now, grace_left))
+
+    def _poll(self):
+        """Check every watched topic once"""
+        if TOPIC_ATTENDANCE in self.topics:
+            self._poll_attendance()
+        if TOPIC_RESULTS in self.topics and not self._stop.is_set():
+            self._poll_results()
+
+    def _expired(self):
+        """Tell subscribers the token no longer works and stop polling"""
+        self._publish('expired', {'error': "Token expired. Please login again."})
+        self._stop.set()
+
+    def _poll_attendance(self):
+        """Announce new dates and changed period statuses for the watched month"""
+        dates = AttendanceService.fetch_attendance_month(self.token, self.semester, int(self.year), int(self.month))
+        if dates is None:
+            return self._expired()
+
+        if self._dates is not None:
+            changes = diff_attendance_dates(self._dates, dates)
+            if changes:
+                self._publish('attendance', {
+                    'semester': self.semester,
+                    'month': self.month,
+                    'year': self.year,
+                    'changes': changes
+                })
+        self._dates = dates
+
+    def _poll_results(self):
+        """Announce newly published exams, fetching only the new result pages"""
+        document = HtmlDocument(results_service.fetch_exam_listing(self.token))
+        if document.is_login_page:
+            return self._expired()
+
+        links = results_service.extract_result_links(document)
+        if self._result_links is None:
+            # Baseline - only exams published from now on are announced
+            self._result_links = set(links)
+            return
+
+        new_links = [link for link in links if link not in self._result_links]
+        if not new_links:
+            return
+
+        exams, errors = results_service.fetch_exam_results(self.token, new_links)
+        # Retry pages that failed on the next poll
+        failed = {error['url'] for error in errors}
+        self._result_links.update(link for link in new_links if link not in failed)
+        if exams:
+            self._publish('results', {'exams': exams})
+
+
+class ChangeFeedService:
+    """
+    Registry of token watches for the server-sent events endpoint
+
+    Streams hold a request thread for their whole lifetime, so the number
+    of concurrent streams per worker is capped. Watches outlive their last
+    stream by ``grace`` seconds (see TokenWatch).
+    """
+
+    # Client reconnect delay sent in the SSE "retry" field
+    RECONNECT_DELAY_MS = 5000
+
+    def __init__(self, max_subscribers: int, interval: float, jitter: float, heartbeat: float,
+                 max_duration: float, grace: float):
+        self.max_subscribers = max_subscribers
+        self.interval = interval
+        self.jitter = jitter
+        self.grace = grace
+        self.heartbeat = heartbeat
+        self.max_duration = max_duration
+        self._lock = threading.Lock()
+        self._watches: Dict[Tuple, TokenWatch] = {}
+        self._subscribers = 0
+
+    def reset(self):
+        """Forget watches after a fork (their threads don't exist in the child)"""
+        with self._lock:
+            self._watches = {}
+            self._subscribers = 0
+
+    def subscribe(self, token: str, semester: str, month: str, year: str,
+                  topics: Tuple[str, ...], last_event_id: Optional[str] = None) -> Tuple[TokenWatch, queue.Queue]:
+        """
+        Join (or start) the shared watch for a token and parameters
+
+        Args:
+            token: Authentication token
+            semester: Semester number for attendance
+            month: Month number for attendance
+            year: Year for attendance
+            topics: Subset of TOPICS to watch
+            last_event_id: Last event id the client saw, for replay
+
+        Returns:
+            Tuple of (watch, subscriber queue)
+
+        Raises:
+            SubscriberLimitReached: If this worker already serves max_subscribers streams
+        """
+        key = (hashlib.sha256(token.encode('utf-8')).hexdigest(), semester, month, year, topics)
+        with self._lock:
+            if self._subscribers >= self.max_subscribers:
+                raise SubscriberLimitReached(f"At most {self.max_subscribers} event streams per worker")
+
+            watch = self._watches.get(key)
+            subscriber = watch.subscribe(last_event_id) if watch is not None else None
+            if subscriber is None:
+                watch = TokenWatch(key, token, semester, month, year, topics,
+                                   self.interval, self.jitter, self.grace, self._remove_watch)
+                self._watches[key] = watch
+                subscriber = watch.subscribe(last_event_id)
+                watch.start()
+            self._subscribers += 1
+        return watch, subscriber
+
+    def unsubscribe(self, watch: TokenWatch, subscriber: queue.Queue):
+        """Detach a stream (idempotent); the watch stops ``grace`` seconds after its last stream is gone"""
+        with self._lock:
+            if not watch.unsubscribe(subscriber):
+                return
+            self._subscribers = max(0, self._subscribers - 1)
+
+    def _remove_watch(self, watch: TokenWatch):
+        """Called by a watch's thread when it stops"""
+        with self._lock:
+            if self._watches.get(watch.key) is watch:
+                del self._watches[watch.key]
+
+    def stream(self, watch: TokenWatch, subscriber: queue.Queue) -> Iterator[str]:
+        """
+        Yield SSE-formatted events for one subscriber until the stream ends
+
+        Sends a comment every ``heartbeat`` seconds to keep proxies from
+        closing the connection, and ends after ``max_duration`` seconds (the
+        client reconnects with Last-Event-ID) or when the token expires.
+        """
+        deadline = time.monotonic() + self.max_duration
+        try:
+            yield f"retry: {self.RECONNECT_DELAY_MS}\n\n"
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event_id, name, data = subscriber.get(timeout=min(self.heartbeat, remaining))
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+
+                yield format_sse(event_id, name, data)
+                if name == 'expired':
+                    break
+        finally:
+            self.unsubscribe(watch, subscriber)
+
+    def stats(self) -> Dict:
+        """Active watches and streams in this worker"""
+        with self._lock:
+            return {
+                'watches': len(self._watches),
+                'subscribers': self._subscribers,
+                'max_subscribers': self.max_subscribers
+            }
+
+
+def format_sse(event_id: str, name: str, data: Dict) -> str:
+    """
+    Encode one server-sent event
+
+    Args:
+        event_id: Event id (echoed back by clients as Last-Event-ID)
+        name: Event name
+        data: JSON-serialisable payload
+
+    Returns:
+        SSE frame
+    """
+    return f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+# Global instance (watches are per worker process)
+change_feed_service = ChangeFeedService(
+    max_subscribers=config.sse_max_subscribers,
+    interval=config.sse_poll_interval,
+    jitter=config.sse_poll_jitter,
+    heartbeat=config.sse_heartbeat,
+    max_duration=config.sse_max_duration,
+    grace=config.sse_watch_grace
+)
+register_after_fork(change_feed_service.reset)
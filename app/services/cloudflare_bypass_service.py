@@ -8,6 +8,7 @@ from fake_useragent import UserAgent
 import httpx
 import socket
 import dns.resolver
+from app.services.connection_manager import connection_manager
 
 # Optional imports for advanced bypass methods
 try:
@@ -41,14 +42,13 @@ class CloudflareBypassService:
         self.session = None
         self.driver = None
         self.cloudscraper_session = None
+        # Configure custom DNS resolution using public DNS servers (once per process tree)
+        self._configure_dns()
         self._init_sessions()
     
     def _init_sessions(self):
         """Initialize various session types"""
         try:
-            # Configure custom DNS resolution using public DNS servers
-            self._configure_dns()
-            
             # Initialize cloudscraper session
             self.cloudscraper_session = cloudscraper.create_scraper(
                 browser={
@@ -61,12 +61,32 @@ class CloudflareBypassService:
             )
             
             # Initialize requests session with advanced headers
+            # (shares the warm keep-alive pool; cloudscraper keeps its own TLS adapter)
             self.session = requests.Session()
+            connection_manager.mount(self.session)
             self._setup_session_headers()
             
         except Exception as e:
             logger.error(f"Failed to initialize bypass sessions: {e}")
     
+    def reset_sessions(self):
+        """
+        Rebuild HTTP sessions after a fork
+        
+        Sessions hold pooled sockets that must not be shared between worker
+        processes. The user agent catalogue and DNS configuration are kept.
+        """
+        for session in (self.session, self.cloudscraper_session):
+            if session:
+                try:
+                    session.close()
+                except Exception:
+                    pass
+        
+        self.session = None
+        self.cloudscraper_session = None
+        self._init_sessions()
+    
     def _configure_dns(self):
         """Configure custom DNS resolution using public DNS servers"""
         try:
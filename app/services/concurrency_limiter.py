@@ -0,0 +1,256 @@
+"""
+Adaptive upstream concurrency limiter - AIMD limit per upstream host
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import requests
+from app.config.config import config
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean the upstream (or Cloudflare in front of it) wants us to back off
+OVERLOAD_STATUS_CODES = frozenset({429, 500, 502, 503, 504, 520, 521, 522, 523, 524})
+
+
+class UpstreamLimitExceeded(Exception):
+    """Raised when no upstream slot frees up within the queue timeout"""
+
+
+class UpstreamCallOutcome:
+    """
+    Result of one limited upstream call, filled in by the caller
+
+    The limiter treats the call as healthy unless ``overloaded`` is set;
+    latency is measured by the limiter itself.
+    """
+
+    def __init__(self):
+        self.overloaded = False
+
+    def observe_error(self, error: Exception):
+        """
+        Flag overload signals carried by a requests exception
+
+        Args:
+            error: Exception raised by the HTTP call
+        """
+        if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+            self.overloaded = True
+            return
+
+        response = getattr(error, 'response', None)
+        if response is not None and response.status_code in OVERLOAD_STATUS_CODES:
+            self.overloaded = True
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase / multiplicative-decrease limit on in-flight calls
+
+    Each healthy call grows the limit by ``1 / limit`` (about +1 per full
+    window of calls). A 429, 5xx, timeout, challenge page or latency spike
+    cuts it by ``backoff``, at most once per baseline latency so a single
+    burst of failures counts as one congestion event.
+    """
+
+    # Weight of the newest sample in the latency baseline (EWMA)
+    LATENCY_ALPHA = 0.1
+    # Weight of a latency spike: small, so one burst barely moves the baseline,
+    # but a lasting rise in ETLab's latency becomes the new normal
+    SPIKE_LATENCY_ALPHA = 0.02
+    # Samples needed before latency spikes are trusted as a signal
+    MIN_LATENCY_SAMPLES = 10
+
+    def __init__(self, host: str, initial_limit: int, min_limit: int, max_limit: int,
+                 backoff: float, latency_spike_factor: float, queue_timeout: float):
+        self.host = host
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_spike_factor = latency_spike_factor
+        self.queue_timeout = queue_timeout
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._latency_baseline: Optional[float] = None
+        self._latency_samples = 0
+        self._last_decrease = 0.0
+        self._calls_total = 0
+        self._overload_total = 0
+        self._rejected_total = 0
+
+    @property
+    def limit(self) -> int:
+        """Current whole-number concurrency limit"""
+        return int(self._limit)
+
+    def acquire(self) -> bool:
+        """
+        Wait for an in-flight slot under the current limit
+
+        Returns:
+            True if a slot was taken (caller must release), False on timeout
+        """
+        with self._condition:
+            deadline = time.monotonic() + self.queue_timeout
+            self._waiting += 1
+            try:
+                while self._in_flight >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected_total += 1
+                        return False
+                    self._condition.wait(remaining)
+                self._in_flight += 1
+                return True
+            finally:
+                self._waiting -= 1
+
+    def release(self, latency: float, overloaded: bool):
+        """
+        Return a slot and adjust the limit from the call's outcome
+
+        Args:
+            latency: Wall time of the call in seconds
+            overloaded: True if the call hit an explicit overload signal
+        """
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._calls_total += 1
+
+            if not overloaded and self._is_latency_spike(latency):
+                overloaded = True
+                self._record_latency(latency, self.SPIKE_LATENCY_ALPHA)
+
+            if overloaded:
+                self._overload_total += 1
+                self._decrease()
+            else:
+                self._record_latency(latency)
+                # Only grow when the limit is actually being used, so idle
+                # periods don't inflate it past what was ever tested
+                if self._in_flight + 1 >= self._limit / 2:
+                    self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+            self._condition.notify_all()
+
+    def _is_latency_spike(self, latency: float) -> bool:
+        """Check a healthy-looking call against the latency baseline"""
+        if self._latency_baseline is None or self._latency_samples < self.MIN_LATENCY_SAMPLES:
+            return False
+        return latency > self._latency_baseline * self.latency_spike_factor
+
+    def _record_latency(self, latency: float, alpha: float = LATENCY_ALPHA):
+        """Fold a call's latency into the baseline (spikes use a smaller alpha)"""
+        if self._latency_baseline is None:
+            self._latency_baseline = latency
+        else:
+            self._latency_baseline += alpha * (latency - self._latency_baseline)
+        self._latency_samples += 1
+
+    def _decrease(self):
+        """Multiplicative decrease, once per congestion window"""
+        now = time.monotonic()
+        window = self._latency_baseline or 1.0
+        if now - self._last_decrease < window:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        logger.warning(f"Upstream {self.host} overloaded, concurrency limit now {self.limit}")
+
+    def stats(self) -> Dict:
+        """Current limit, queue depth and counters"""
+        with self._condition:
+            return {
+                'limit': self.limit,
+                'in_flight': self._in_flight,
+                'waiting': self._waiting,
+                'latency_baseline_ms': round(self._latency_baseline * 1000, 1) if self._latency_baseline else None,
+                'calls_total': self._calls_total,
+                'overload_total': self._overload_total,
+                'rejected_total': self._rejected_total
+            }
+
+
+class UpstreamLimiterRegistry:
+    """
+    One adaptive limiter per upstream host
+    """
+
+    def __init__(self):
+        self._limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> AdaptiveConcurrencyLimiter:
+        """
+        Get (or create) the limiter for a URL's host
+
+        Args:
+            url: Upstream URL
+
+        Returns:
+            Limiter shared by every call to that host
+        """
+        host = urlparse(url).netloc or url
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = AdaptiveConcurrencyLimiter(
+                    host=host,
+                    initial_limit=config.upstream_limit_initial,
+                    min_limit=config.upstream_limit_min,
+                    max_limit=config.upstream_limit_max,
+                    backoff=config.upstream_limit_backoff,
+                    latency_spike_factor=config.upstream_latency_spike_factor,
+                    queue_timeout=config.upstream_limit_queue_timeout
+                )
+                self._limiters[host] = limiter
+            return limiter
+
+    @contextmanager
+    def limit(self, url: str):
+        """
+        Run one upstream call under its host's limiter
+
+        Yields an UpstreamCallOutcome for the caller to flag overload signals.
+        Exceptions propagate unchanged; timeouts and connection errors are
+        always counted as overload.
+
+        Args:
+            url: Upstream URL
+
+        Raises:
+            UpstreamLimitExceeded: If no slot frees up within the queue timeout
+        """
+        if not config.upstream_limit_enabled:
+            yield UpstreamCallOutcome()
+            return
+
+        limiter = self.for_url(url)
+        if not limiter.acquire():
+            raise UpstreamLimitExceeded(f"Upstream concurrency limit reached for {limiter.host}")
+
+        outcome = UpstreamCallOutcome()
+        started = time.monotonic()
+        try:
+            yield outcome
+        except Exception as e:
+            outcome.observe_error(e)
+            raise
+        finally:
+            limiter.release(time.monotonic() - started, outcome.overloaded)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Stats for every known host"""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.host: limiter.stats() for limiter in limiters}
+
+
+# Global instance (state is per worker process)
+upstream_limiters = UpstreamLimiterRegistry()
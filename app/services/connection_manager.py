@@ -0,0 +1,296 @@
+"""
+Upstream connection manager - shared keep-alive pool, warm-up and TLS session reuse
+"""
+import logging
+import os
+import ssl
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from app.config.config import config
+from app.utils.fork_utils import register_after_fork
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCapturingSSLSocket(ssl.SSLSocket):
+    """SSL socket that hands its TLS session back to its context before closing"""
+
+    def _real_close(self):
+        remember = getattr(self.context, 'remember_session', None)
+        if remember is not None:
+            remember(self)
+        super()._real_close()
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """
+    SSL context that resumes the last TLS session per server hostname
+
+    urllib3 wraps every new socket through ``wrap_socket`` without a
+    session, so each reconnect pays a full handshake. This context hands
+    the most recent resumable session for the host back to OpenSSL.
+    TLS 1.3 tickets arrive after the handshake, so sessions are collected
+    from sockets when they close or when the next socket is opened.
+    """
+
+    sslsocket_class = SessionCapturingSSLSocket
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._session_lock = threading.Lock()
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+        self._last_sockets: Dict[str, weakref.ref] = {}
+        self.handshakes_total = 0
+        self.sessions_reused_total = 0
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None and server_hostname:
+            session = self._session_for(server_hostname)
+
+        try:
+            ssl_sock = super().wrap_socket(sock, *args, server_hostname=server_hostname,
+                                           session=session, **kwargs)
+        except ssl.SSLError:
+            # Handshake failures (e.g. certificate errors) are also ValueErrors
+            raise
+        except ValueError:
+            # Session no longer usable with this context - fall back to a full handshake
+            if session is None:
+                raise
+            with self._session_lock:
+                self._sessions.pop(server_hostname, None)
+            ssl_sock = super().wrap_socket(sock, *args, server_hostname=server_hostname, **kwargs)
+
+        with self._session_lock:
+            self.handshakes_total += 1
+            if ssl_sock.session_reused:
+                self.sessions_reused_total += 1
+            if server_hostname:
+                self._last_sockets[server_hostname] = weakref.ref(ssl_sock)
+
+        return ssl_sock
+
+    def remember_session(self, ssl_sock: ssl.SSLSocket):
+        """
+        Keep a socket's session if it can be resumed
+
+        Args:
+            ssl_sock: Connected socket created by this context
+        """
+        hostname = ssl_sock.server_hostname
+        if not hostname:
+            return
+        try:
+            session = ssl_sock.session
+        except Exception:
+            return
+        if session is not None and (session.has_ticket or session.id):
+            with self._session_lock:
+                self._sessions[hostname] = session
+
+    def _session_for(self, hostname: str) -> Optional[ssl.SSLSession]:
+        """Latest resumable session for a host, refreshed from its last live socket"""
+        with self._session_lock:
+            ref = self._last_sockets.get(hostname)
+        last_socket = ref() if ref else None
+        if last_socket is not None:
+            self.remember_session(last_socket)
+        with self._session_lock:
+            return self._sessions.get(hostname)
+
+
+class UpstreamAdapter(HTTPAdapter):
+    """
+    Transport adapter sharing one pool manager and SSL context
+
+    The CA bundle is loaded into the shared context once, so requests'
+    per-connection ``ca_certs`` is dropped to avoid reloading it on every
+    new socket.
+
+    urllib3 applies a request's TLS settings (verify mode, CA path, client
+    certificate) to the context it connects with, and to connections it
+    later hands out from the same pool. Only default requests
+    (``verify=True``, no client certificate) use the shared context; any
+    other setting gets a stock adapter (and pool) of its own, so the shared
+    context is never changed and settings never share a connection.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+        self.ssl_context = ssl_context
+        self._adapter_kwargs = kwargs
+        self._tls_lock = threading.Lock()
+        self._custom_tls_adapters: Dict[tuple, HTTPAdapter] = {}
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if verify is not True or cert:
+            adapter = self._custom_tls_adapter(verify, cert)
+            return adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+    def _custom_tls_adapter(self, verify, cert) -> HTTPAdapter:
+        """Stock adapter for one non-default verify/cert setting"""
+        key = (verify, tuple(cert) if isinstance(cert, (list, tuple)) else cert)
+        with self._tls_lock:
+            adapter = self._custom_tls_adapters.get(key)
+            if adapter is None:
+                adapter = self._custom_tls_adapters[key] = HTTPAdapter(**self._adapter_kwargs)
+            return adapter
+
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+        conn.ca_certs = None
+        conn.ca_cert_dir = None
+
+    def close(self):
+        """
+        Keep the pool open when a mounting session closes
+
+        Every session mounts this adapter, so one session closing (e.g.
+        HttpService.reinitialize) must not drop the others' connections.
+        The connection manager replaces the adapter when it rebuilds.
+        """
+
+
+class UpstreamConnectionManager:
+    """
+    Owns the keep-alive connection pool used for ETLab requests
+
+    Sessions mount the shared adapter so every strategy that uses a plain
+    requests session draws from the same warm connections. A background
+    thread keeps ``warm_connections`` sockets to ``config.base_url`` open
+    between requests.
+    """
+
+    def __init__(self, base_url: str, warm_connections: int, keepalive_interval: float, pool_maxsize: int):
+        self.base_url = base_url
+        self.warm_connections = warm_connections
+        self.keepalive_interval = keepalive_interval
+        self.pool_maxsize = pool_maxsize
+        self.ssl_context = None
+        self.adapter = None
+        self._warm_session = None
+        self._thread = None
+        self._thread_pid = None
+        self._stop = threading.Event()
+        self._sessions = weakref.WeakSet()
+        self._build()
+
+    def _build(self):
+        """Create the SSL context, adapter and warm-up session"""
+        self.ssl_context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        self.ssl_context.load_verify_locations(certifi.where())
+        self.adapter = UpstreamAdapter(
+            self.ssl_context,
+            pool_connections=4,
+            pool_maxsize=self.pool_maxsize
+        )
+        self._warm_session = requests.Session()
+        self._warm_session.headers.update({'User-Agent': config.user_agent})
+        self.mount(self._warm_session)
+
+    def mount(self, session: requests.Session):
+        """
+        Route a session's http(s) traffic through the shared adapter
+
+        Args:
+            session: requests session to attach
+        """
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        self._sessions.add(session)
+
+    def reset(self):
+        """
+        Drop pooled sockets and rebuild after a fork
+
+        Sessions that were mounted before the fork are re-mounted on the
+        new adapter so none keep using the master's sockets.
+        """
+        sessions = list(self._sessions)
+        self._stop.set()
+        self._thread = None
+        self._thread_pid = None
+        self._stop = threading.Event()
+        self._build()
+        for session in sessions:
+            self.mount(session)
+
+    def start(self):
+        """Warm the pool now and keep it warm in the background (once per process)"""
+        if self.warm_connections <= 0 or self._thread_pid == os.getpid():
+            return
+
+        self._thread_pid = os.getpid()
+        self._thread = threading.Thread(target=self._keep_warm, name='upstream-keepalive', daemon=True)
+        self._thread.start()
+
+    def warm_up(self):
+        """Open (or refresh) ``warm_connections`` keep-alive connections concurrently"""
+        with ThreadPoolExecutor(max_workers=self.warm_connections) as executor:
+            list(executor.map(lambda _: self._ping(), range(self.warm_connections)))
+
+    def _ping(self):
+        """Light request that leaves a live connection in the pool"""
+        try:
+            response = self._warm_session.head(self.base_url, timeout=config.request_timeout,
+                                               allow_redirects=False)
+            response.close()
+        except Exception as e:
+            logger.warning(f"Upstream warm-up request failed: {e}")
+
+    def _keep_warm(self):
+        """Background loop: warm immediately, then refresh before idle sockets expire"""
+        stop = self._stop
+        while not stop.is_set():
+            started = time.monotonic()
+            self.warm_up()
+            stop.wait(max(1.0, self.keepalive_interval - (time.monotonic() - started)))
+
+    def stats(self) -> Dict:
+        """Pool occupancy per host and TLS session reuse counters"""
+        pools = {}
+        poolmanager = getattr(self.adapter, 'poolmanager', None)
+        if poolmanager is not None:
+            for key in list(poolmanager.pools.keys()):
+                pool = poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+                pools[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    'idle': idle,
+                    'maxsize': self.pool_maxsize,
+                    'connections_opened': pool.num_connections,
+                    'requests': pool.num_requests
+                }
+
+        return {
+            'target': urlparse(self.base_url).netloc,
+            'warm_connections': self.warm_connections,
+            'keepalive_interval': self.keepalive_interval,
+            'keepalive_running': bool(self._thread and self._thread.is_alive()),
+            'pools': pools,
+            'tls_handshakes': self.ssl_context.handshakes_total,
+            'tls_sessions_reused': self.ssl_context.sessions_reused_total
+        }
+
+
+# Global instance (pool rebuilt per worker after fork)
+connection_manager = UpstreamConnectionManager(
+    base_url=config.base_url,
+    warm_connections=config.upstream_warm_connections,
+    keepalive_interval=config.upstream_keepalive_interval,
+    pool_maxsize=config.upstream_pool_maxsize
+)
+register_after_fork(connection_manager.reset)
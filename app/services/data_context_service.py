@@ -1,8 +1,10 @@
 import logging
 from typing import Optional
-from bs4 import BeautifulSoup
+from app.parsers.html_engine import make_soup, TABLE_STRAINER
+from app.parsers.page_sniffer import is_login_html
 from app.config.config import config
 from app.services.http_service import http_service
+from app.services.profile_service import profile_service
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +44,7 @@ class DataContextService:
         """Get academic results context"""
         try:
             html = http_service.get(f"{config.base_url}/ktuacademics/student/results", token)
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = make_soup(html, TABLE_STRAINER)
             
             context = ["ACADEMIC RESULTS DATA:\\n\\n"]
             
@@ -72,7 +74,7 @@ class DataContextService:
         """Get attendance context"""
         try:
             html = http_service.get(f"{config.base_url}/ktuacademics/student/attendance", token)
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = make_soup(html, TABLE_STRAINER)
             
             context = ["ATTENDANCE DATA:\\n\\n"]
             
@@ -108,9 +110,7 @@ class DataContextService:
             # Check if it's CSV data or HTML
             if html.strip().startswith('<'):
                 # It's HTML, parse accordingly
-                soup = BeautifulSoup(html, 'html.parser')
-                title = soup.find('title')
-                if title and 'login' in title.get_text().lower():
+                if is_login_html(html):
                     return "Timetable access denied - please login."
                 context.append("Timetable format may have changed or be unavailable.\\n")
             else:
@@ -130,32 +130,13 @@ class DataContextService:
     def _get_profile_context(self, token: str) -> str:
         """Get profile context"""
         try:
-            html = http_service.get(f"{config.base_url}/student/profile", token)
-            soup = BeautifulSoup(html, 'html.parser')
+            profile = profile_service.get_profile(token)
+            if profile is None:
+                return "Profile data unavailable."
             
             context = ["PROFILE DATA:\\n\\n"]
-            
-            # Parse profile information
-            # Look for common profile elements
-            profile_elements = soup.find_all(['div', 'span', 'p'], class_=lambda x: x and 'profile' in x.lower())
-            
-            if not profile_elements:
-                # Try to find any structured data
-                tables = soup.find_all('table')
-                for table in tables:
-                    rows = table.find_all('tr')
-                    for row in rows:
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) == 2:  # Key-value pairs
-                            key = cells[0].get_text().strip()
-                            value = cells[1].get_text().strip()
-                            if key and value:
-                                context.append(f"- {key}: {value}\\n")
-            else:
-                for element in profile_elements:
-                    text = element.get_text().strip()
-                    if text:
-                        context.append(f"- {text}\\n")
+            for key, value in profile.items():
+                context.append(f"- {key}: {value}\\n")
             
             return "".join(context)
             
@@ -0,0 +1,167 @@
+"""
+Fan-out service - bounded concurrent execution of independent upstream tasks
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+from app.config.config import config
+from app.utils.fork_utils import register_after_fork
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = 'ok'
+STATUS_ERROR = 'error'
+STATUS_TIMEOUT = 'timeout'
+
+
+@dataclass
+class FanoutResult:
+    """Outcome of one fanned-out task"""
+    status: str
+    value: Any = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the task completed without raising"""
+        return self.status == STATUS_OK
+
+
+class FanoutService:
+    """
+    Runs independent tasks concurrently on a bounded per-worker pool
+
+    Results come back in task order. Upstream concurrency is still governed
+    by the adaptive limiter in HttpService; this pool only bounds threads.
+    Fan-outs started from inside a pool thread run inline, so nested
+    fan-outs cannot deadlock waiting on the same pool.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the pool lazily so it is never inherited across fork"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='fanout',
+                    initializer=self._mark_worker_thread
+                )
+            return self._executor
+
+    def _mark_worker_thread(self):
+        """Pool thread initializer - lets nested fan-outs detect they are inside the pool"""
+        self._local.in_pool = True
+
+    def reset(self):
+        """Forget the pool after a fork (its threads don't exist in the child)"""
+        with self._lock:
+            self._executor = None
+
+    def run_all(self, tasks: List[Callable[[], Any]], timeout: Optional[float] = None) -> List[FanoutResult]:
+        """
+        Run tasks concurrently and collect their results in order
+
+        Args:
+            tasks: Zero-argument callables
+            timeout: Overall deadline in seconds for all tasks (None = no deadline)
+
+        Returns:
+            One FanoutResult per task; tasks still running at the deadline
+            are reported as timed out
+        """
+        if not tasks:
+            return []
+
+        if len(tasks) == 1 or getattr(self._local, 'in_pool', False):
+            return self._run_inline(tasks, timeout)
+
+        executor = self._get_executor()
+        futures = [executor.submit(task) for task in tasks]
+        done, not_done = wait(futures, timeout=timeout)
+
+        results = []
+        for future in futures:
+            if future in not_done:
+                future.cancel()
+                results.append(FanoutResult(STATUS_TIMEOUT, error="Deadline exceeded"))
+                continue
+            try:
+                results.append(FanoutResult(STATUS_OK, value=future.result()))
+            except Exception as e:
+                logger.error(f"Fan-out task failed: {e}")
+                results.append(FanoutResult(STATUS_ERROR, error=str(e)))
+        return results
+
+    def iter_completed(self, tasks: List[Callable[[], Any]],
+                       timeout: Optional[float] = None) -> Iterator[Tuple[int, FanoutResult]]:
+        """
+        Run tasks concurrently and yield each result as soon as it is ready
+
+        Args:
+            tasks: Zero-argument callables
+            timeout: Overall deadline in seconds for all tasks (None = no deadline)
+
+        Yields:
+            (task index, FanoutResult) in completion order; tasks still running
+            at the deadline are yielded last as timed out
+        """
+        if not tasks:
+            return
+
+        if len(tasks) == 1 or getattr(self._local, 'in_pool', False):
+            yield from enumerate(self._iter_inline(tasks, timeout))
+            return
+
+        executor = self._get_executor()
+        futures = {executor.submit(task): index for index, task in enumerate(tasks)}
+        pending = set(futures)
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                pending.discard(future)
+                try:
+                    result = FanoutResult(STATUS_OK, value=future.result())
+                except Exception as e:
+                    logger.error(f"Fan-out task failed: {e}")
+                    result = FanoutResult(STATUS_ERROR, error=str(e))
+                yield futures[future], result
+        except FuturesTimeoutError:
+            pass
+        finally:
+            # Also reached when the consumer stops early (e.g. client disconnect)
+            for future in pending:
+                future.cancel()
+
+        for future in sorted(pending, key=futures.get):
+            yield futures[future], FanoutResult(STATUS_TIMEOUT, error="Deadline exceeded")
+
+    def _run_inline(self, tasks: List[Callable[[], Any]], timeout: Optional[float]) -> List[FanoutResult]:
+        """Run tasks one after another in the calling thread, honouring the deadline"""
+        return list(self._iter_inline(tasks, timeout))
+
+    def _iter_inline(self, tasks: List[Callable[[], Any]], timeout: Optional[float]) -> Iterator[FanoutResult]:
+        """Lazily run tasks in the calling thread, yielding each result as it finishes"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for task in tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                yield FanoutResult(STATUS_TIMEOUT, error="Deadline exceeded")
+                continue
+            try:
+                yield FanoutResult(STATUS_OK, value=task())
+            except Exception as e:
+                logger.error(f"Fan-out task failed: {e}")
+                yield FanoutResult(STATUS_ERROR, error=str(e))
+
+
+# Global instance (pool is per worker process)
+fanout_service = FanoutService(config.fanout_max_workers)
+register_after_fork(fanout_service.reset)
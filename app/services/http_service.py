@@ -2,19 +2,57 @@ import requests
 from typing import Optional
 import logging
 from app.config.config import config
+from app.services.concurrency_limiter import upstream_limiters, UpstreamCallOutcome
+from app.services.connection_manager import connection_manager
+from app.utils.fork_utils import register_after_fork
 
 logger = logging.getLogger(__name__)
 
+# Cloudflare challenge markers (lowercased once, matched against lowercased content)
+CHALLENGE_INDICATORS = tuple(indicator.lower() for indicator in (
+    'Checking your browser',
+    'DDoS protection by Cloudflare',
+    'cf-browser-verification',
+    'cf-challenge-form',
+    '__cf_chl_jschl_tk__',
+    'cf-challenge-running',
+    'challenge-platform',
+    'Enable JavaScript and cookies to continue'
+))
+
 class HttpService:
     """HTTP service for making requests with Cloudflare bypass capabilities"""
     
     def __init__(self):
+        self.session = None
+        self._init_session()
+        self.cloudflare_bypass = None
+        self._init_cloudflare_bypass()
+    
+    def _init_session(self):
+        """Create the fallback requests session on the shared keep-alive pool"""
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': config.user_agent
         })
-        self.cloudflare_bypass = None
-        self._init_cloudflare_bypass()
+        connection_manager.mount(self.session)
+    
+    def reinitialize(self):
+        """
+        Rebuild sessions after a worker fork
+        
+        The bypass service (and its user agent catalogue) is kept; only
+        objects holding sockets are recreated.
+        """
+        if self.session:
+            try:
+                self.session.close()
+            except Exception:
+                pass
+        self._init_session()
+        
+        if self.cloudflare_bypass:
+            self.cloudflare_bypass.reset_sessions()
     
     def _decode_response_content(self, response: requests.Response) -> str:
         """
@@ -95,6 +133,8 @@ class HttpService:
         """
         Make a GET request to the specified URL with optional token and Cloudflare bypass
         
+        The call runs under the host's adaptive concurrency limit.
+        
         Args:
             url: The URL to make the request to
             token: Optional session token for authentication
@@ -105,6 +145,11 @@ class HttpService:
         Raises:
             Exception: If the request fails
         """
+        with upstream_limiters.limit(url) as outcome:
+            return self._get(url, token, outcome)
+    
+    def _get(self, url: str, token: Optional[str], outcome: UpstreamCallOutcome) -> str:
+        """GET implementation; flags overload signals on ``outcome``"""
         try:
             headers = {}
             cookies = {}
@@ -139,11 +184,13 @@ class HttpService:
             
             # Check if response indicates Cloudflare block
             if self._is_cloudflare_blocked(content):
+                outcome.overloaded = True
                 raise Exception("Request blocked by Cloudflare protection")
             
             return content
             
         except requests.RequestException as e:
+            outcome.observe_error(e)
             logger.error(f"HTTP GET request failed for URL {url}: {e}")
             raise Exception(f"HTTP request failed: {str(e)}")
         except Exception as e:
@@ -154,6 +201,8 @@ class HttpService:
         """
         Make a POST request to the specified URL with Cloudflare bypass
         
+        The call runs under the host's adaptive concurrency limit.
+        
         Args:
             url: The URL to make the request to
             data: Form data to send
@@ -166,6 +215,12 @@ class HttpService:
         Raises:
             Exception: If the request fails
         """
+        with upstream_limiters.limit(url) as outcome:
+            return self._post(url, data, headers, token, outcome)
+    
+    def _post(self, url: str, data: Optional[dict], headers: Optional[dict], token: Optional[str],
+              outcome: UpstreamCallOutcome) -> requests.Response:
+        """POST implementation; flags overload signals on ``outcome``"""
         try:
             request_headers = headers or {}
             cookies = {}
@@ -198,11 +253,13 @@ class HttpService:
             
             # Check if response indicates Cloudflare block
             if self._is_cloudflare_blocked(response.text):
+                outcome.overloaded = True
                 raise Exception("Request blocked by Cloudflare protection")
             
             return response
             
         except requests.RequestException as e:
+            outcome.observe_error(e)
             logger.error(f"HTTP POST request failed for URL {url}: {e}")
             raise Exception(f"HTTP request failed: {str(e)}")
         except Exception as e:
@@ -214,23 +271,11 @@ class HttpService:
         if not content:
             return False
         
-        # More specific challenge indicators (not just CDN references)
-        challenge_indicators = [
-            'Checking your browser',
-            'DDoS protection by Cloudflare',
-            'cf-browser-verification',
-            'cf-challenge-form',
-            '__cf_chl_jschl_tk__',
-            'cf-challenge-running',
-            'challenge-platform',
-            'Enable JavaScript and cookies to continue'
-        ]
-        
         content_lower = content.lower()
         
-        # Check for actual challenge indicators
-        for indicator in challenge_indicators:
-            if indicator.lower() in content_lower:
+        # Check for actual challenge indicators (not just CDN references)
+        for indicator in CHALLENGE_INDICATORS:
+            if indicator in content_lower:
                 return True
         
         # Check if title contains Cloudflare challenge keywords
@@ -258,5 +303,6 @@ class HttpService:
         if self.cloudflare_bypass:
             self.cloudflare_bypass.close()
 
-# Global instance
-http_service = HttpService()
\ No newline at end of file
+# Global instance (built in the master when preloaded; sessions rebuilt per worker)
+http_service = HttpService()
+register_after_fork(http_service.reinitialize)
\ No newline at end of file
@@ -0,0 +1,290 @@
+"""
+Job service - run long scrapes in the background and keep their results for a TTL
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from flask import Flask
+from app.config.config import config
+from app.services.admission_service import bulkheads, PRIORITY_HEAVY
+from app.utils.dispatch_utils import dispatch_internal
+from app.utils.file_utils import ensure_private_dir, open_private
+from app.utils.fork_utils import register_after_fork
+
+logger = logging.getLogger(__name__)
+
+# Resource name -> API path. Only the multi-page scrapes are worth a job.
+JOB_RESOURCES = {
+    'end-semester-results': '/api/end-semester-results',
+    'attendance-table-range': '/api/attendance-table/range'
+}
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED)
+
+
+class JobQueueFull(Exception):
+    """Raised when this worker already has the maximum number of pending jobs"""
+
+
+class JobService:
+    """
+    Bounded background executor for heavy scrapes
+
+    Each worker process runs at most ``max_workers`` jobs at once and keeps
+    at most ``max_pending`` queued or running. Job records are written as
+    JSON files under ``store_dir`` so a client polling through any gunicorn
+    worker on the host sees the same job; finished records expire after
+    ``ttl`` seconds. Records hold scraped student data, so the directory
+    must be private to the app user and records are written mode 0600.
+    """
+
+    # How often a long-poll re-reads a job owned by another worker
+    POLL_INTERVAL = 0.25
+
+    def __init__(self, store_dir: str, max_workers: int, max_pending: int, ttl: float):
+        self.store_dir = store_dir
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, threading.Event] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the pool lazily so it is never inherited across fork"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+        return self._executor
+
+    def reset(self):
+        """Forget the pool and pending jobs after a fork (they belong to the parent)"""
+        with self._lock:
+            self._executor = None
+            self._pending = {}
+
+    @staticmethod
+    def parse_submission(payload: Optional[Dict]) -> Tuple[Optional[str], Optional[Dict], Optional[str]]:
+        """
+        Validate a job submission body
+
+        Args:
+            payload: JSON body, e.g. {"resource": "end-semester-results", "params": {}}
+
+        Returns:
+            Tuple of (resource, params, error_message)
+        """
+        if not payload or not isinstance(payload, dict):
+            return None, None, "Body must be a JSON object with a 'resource'"
+
+        resource = payload.get('resource')
+        if resource not in JOB_RESOURCES:
+            return None, None, f"Unknown resource '{resource}'. Available: {', '.join(JOB_RESOURCES)}"
+
+        params = payload.get('params') or {}
+        if not isinstance(params, dict):
+            return None, None, "'params' must be an object"
+
+        return resource, {key: str(value) for key, value in params.items()}, None
+
+    @staticmethod
+    def owner_of(auth_header: str) -> str:
+        """Fingerprint of the submitting token, so jobs are only visible to their owner"""
+        return hashlib.sha256(auth_header.encode('utf-8')).hexdigest()
+
+    def submit(self, app: Flask, resource: str, params: Dict, auth_header: str) -> Dict:
+        """
+        Queue a scrape and return its record immediately
+
+        Args:
+            app: Flask application
+            resource: One of JOB_RESOURCES
+            params: Query parameters for the resource
+            auth_header: Authorization header to run the scrape with
+
+        Returns:
+            Job record (status 'queued')
+
+        Raises:
+            JobQueueFull: If this worker has too many pending jobs
+        """
+        self.purge_expired()
+
+        job = {
+            'id': uuid.uuid4().hex,
+            'resource': resource,
+            'params': params,
+            'status': STATUS_QUEUED,
+            'owner': self.owner_of(auth_header),
+            'pid': os.getpid(),
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'http_status': None,
+            'result': None,
+            'error': None
+        }
+
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                raise JobQueueFull(f"At most {self.max_pending} pending jobs per worker")
+            self._pending[job['id']] = threading.Event()
+            self._write(job)
+            submitted = dict(job)
+            self._get_executor().submit(self._run, app, job, auth_header)
+
+        return submitted
+
+    def _run(self, app: Flask, job: Dict, auth_header: str):
+        """Execute one job on a pool thread and persist its outcome"""
+        # Jobs scrape as much as heavy requests, so they share the heavy
+        # bulkhead; a job waits (still queued) until a heavy slot is free
+        bulkhead = bulkheads[PRIORITY_HEAVY] if config.admission_enabled else None
+        while bulkhead is not None and not bulkhead.acquire():
+            time.sleep(self.POLL_INTERVAL)
+
+        try:
+            self._execute(app, job, auth_header)
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+
+        with self._lock:
+            event = self._pending.pop(job['id'], None)
+        if event:
+            event.set()
+
+    def _execute(self, app: Flask, job: Dict, auth_header: str):
+        """Dispatch a job's scrape and persist its outcome"""
+        job['status'] = STATUS_RUNNING
+        job['started_at'] = time.time()
+        self._write(job)
+
+        try:
+            http_status, body = dispatch_internal(
+                app, JOB_RESOURCES[job['resource']], job['params'], {'Authorization': auth_header}
+            )
+            job['http_status'] = http_status
+            job['result'] = body
+            job['status'] = STATUS_DONE if http_status < 400 else STATUS_FAILED
+            if http_status >= 400 and isinstance(body, dict):
+                job['error'] = body.get('error') or body.get('message')
+        except Exception as e:
+            logger.error(f"Job {job['id']} failed: {e}", exc_info=True)
+            job['status'] = STATUS_FAILED
+            job['error'] = str(e)
+
+        job['finished_at'] = time.time()
+        self._write(job)
+
+    def get(self, job_id: str, auth_header: str, wait: float = 0) -> Optional[Dict]:
+        """
+        Look up a job, optionally waiting for it to finish
+
+        Args:
+            job_id: Id returned by submit
+            auth_header: Authorization header of the caller (must match the submitter)
+            wait: Seconds to long-poll for completion (0 = return immediately)
+
+        Returns:
+            Job record, or None if unknown, expired or owned by another token
+        """
+        job = self._read(job_id)
+        if job is None or job['owner'] != self.owner_of(auth_header):
+            return None
+
+        deadline = time.monotonic() + wait
+        while job['status'] not in FINISHED_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            with self._lock:
+                event = self._pending.get(job_id)
+            if event is not None:
+                event.wait(remaining)
+            else:
+                # Running in another worker (or that worker died) - re-read the store
+                if not self._is_alive(job['pid']):
+                    job['status'] = STATUS_FAILED
+                    job['error'] = "Worker running the job exited"
+                    break
+                time.sleep(min(self.POLL_INTERVAL, remaining))
+            job = self._read(job_id) or job
+
+        return job
+
+    def purge_expired(self):
+        """Delete job records older than the TTL"""
+        cutoff = time.time() - self.ttl
+        try:
+            names = os.listdir(self.store_dir)
+        except FileNotFoundError:
+            return
+        for name in names:
+            path = os.path.join(self.store_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    @staticmethod
+    def public_view(job: Dict) -> Dict:
+        """Job record as returned to clients (without owner and pid)"""
+        return {key: value for key, value in job.items() if key not in ('owner', 'pid')}
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.store_dir, f"{job_id}.json")
+
+    def _write(self, job: Dict):
+        """Atomically replace a job's record (readable by this user only)"""
+        ensure_private_dir(self.store_dir)
+        path = self._path(job['id'])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open_private(tmp_path) as f:
+            json.dump(job, f)
+        os.replace(tmp_path, path)
+
+    def _read(self, job_id: str) -> Optional[Dict]:
+        """Load a job's record if it exists and has not expired"""
+        if not job_id.isalnum():
+            return None
+        path = self._path(job_id)
+        try:
+            if os.path.getmtime(path) < time.time() - self.ttl:
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        """Check whether the worker process that owns a job still exists"""
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+
+# Global instance (executor is per worker process, records are shared on disk)
+job_service = JobService(
+    store_dir=config.job_store_dir,
+    max_workers=config.job_max_workers,
+    max_pending=config.job_max_pending,
+    ttl=config.job_result_ttl
+)
+register_after_fork(job_service.reset)
@@ -2,13 +2,16 @@
 Login service - handles authentication logic
 """
 from typing import Optional, Tuple
-from bs4 import BeautifulSoup
+from app.parsers.page_sniffer import is_login_html, is_login_response
 import re
 import logging
 from app.config.config import config
 
 logger = logging.getLogger(__name__)
 
+# Session cookie pattern for Set-Cookie header fallback
+SESSION_COOKIE_PATTERN = re.compile(f"{re.escape(config.cookie_key)}=([^;]+)")
+
 
 class LoginService:
     """
@@ -67,14 +70,24 @@ class LoginService:
         Returns:
             True if login successful, False otherwise
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.find('title')
-        
         # If still on login page, login failed
-        if title and 'login' in title.get_text().lower():
-            return False
+        return not is_login_html(html)
+    
+    @staticmethod
+    def check_login_response(response) -> bool:
+        """
+        Check if login was successful from the login POST response
+        
+        A redirect away from the login form settles it without reading the
+        body; otherwise the page title is sniffed.
         
-        return True
+        Args:
+            response: HTTP response object
+        
+        Returns:
+            True if login successful, False otherwise
+        """
+        return not is_login_response(response)
     
     @staticmethod
     def extract_session_cookie(response) -> Optional[str]:
@@ -100,8 +113,7 @@ class LoginService:
         # Method 2: If not found, try from Set-Cookie header
         if not session_cookie and 'Set-Cookie' in response.headers:
             set_cookie_header = response.headers.get('Set-Cookie', '')
-            pattern = f"{config.cookie_key}=([^;]+)"
-            match = re.search(pattern, set_cookie_header)
+            match = SESSION_COOKIE_PATTERN.search(set_cookie_header)
             if match:
                 session_cookie = match.group(1)
                 logger.info(f"Found session cookie in Set-Cookie header")
@@ -0,0 +1,70 @@
+"""
+Profile service - student profile fetching with a long-lived per-token cache
+"""
+import logging
+from typing import Dict, Optional
+from app.config.config import config
+from app.services.http_service import http_service
+from app.services.snapshot_service import profile_cache
+from app.parsers.document import HtmlDocument
+from app.parsers.profile_parser import ProfileParser
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileService:
+    """
+    Service for the student profile, shared by /api/profile and AI context building
+    """
+
+    @staticmethod
+    def profile_url() -> str:
+        """URL of the student profile page"""
+        return f"{config.base_url}/student/profile"
+
+    @staticmethod
+    def get_profile(token: str, refresh: bool = False) -> Optional[Dict[str, str]]:
+        """
+        Profile fields for a token, from cache when possible
+
+        Args:
+            token: Authentication token
+            refresh: Skip the cache and fetch the page again
+
+        Returns:
+            Profile fields (or raw_content when the page has no label/value
+            rows), or None if the session has expired
+        """
+        key = profile_cache.make_key(token)
+        if not refresh:
+            profile = profile_cache.find(key)
+            if profile is not None:
+                return profile
+
+        document = HtmlDocument(http_service.get(ProfileService.profile_url(), token))
+        if document.is_login_page:
+            profile_cache.revoke(key)
+            return None
+
+        profile = ProfileParser.parse(document)
+        if not profile:
+            # Unrecognised page - answer with its text but don't keep it
+            logger.warning("Profile page has no label/value rows")
+            profile_cache.invalidate(key)
+            return {'raw_content': ProfileParser.raw_content(document)}
+
+        return profile_cache.record(key, profile)
+
+    @staticmethod
+    def is_cached(token: str) -> bool:
+        """True if the token's profile can be answered without fetching"""
+        return profile_cache.find(profile_cache.make_key(token)) is not None
+
+    @staticmethod
+    def invalidate(token: str) -> None:
+        """Drop the token's cached profile in every worker (logout)"""
+        profile_cache.revoke(profile_cache.make_key(token))
+
+
+# Global instance
+profile_service = ProfileService()
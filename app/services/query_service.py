@@ -0,0 +1,343 @@
+"""
+Query service - plan the minimal set of upstream pages for a field selection
+"""
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config.config import config
+from app.services.http_service import http_service
+from app.services.attendance_service import AttendanceService
+from app.services.results_service import results_service
+from app.services.fanout_service import fanout_service, FanoutResult, STATUS_ERROR, STATUS_OK
+from app.parsers.attendance_parser import AttendanceTableParser, AttendanceSubjectParser
+from app.parsers.timetable_parser import TimetableParser
+from app.parsers.results_parser import ResultsParser
+from app.parsers.page_sniffer import is_login_html
+from app.parsers.document import HtmlDocument
+from app.utils.date_utils import MONTH_MAP, convert_month_to_number
+
+logger = logging.getLogger(__name__)
+
+# ETLab timetables follow Indian Standard Time (no DST)
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+# Returned by a page loader when ETLab answers with the login page
+EXPIRED = object()
+
+
+class SessionExpired(Exception):
+    """Raised when any planned page came back as the login page"""
+
+
+@dataclass
+class FollowUp:
+    """
+    Second-stage fetches a page loader hands back instead of running them
+
+    tasks are zero-argument fetch-and-parse callables; combine builds the
+    page's value from their FanoutResults (in task order).
+    """
+    tasks: List[Callable[[], Any]]
+    combine: Callable[[List[FanoutResult]], Any]
+
+
+class QueryService:
+    """
+    Resolves a declarative field selection into upstream fetches
+
+    Each field names the page it comes from and a small extractor. The
+    planner collects the distinct pages the requested fields need, fetches
+    and parses each of them once, concurrently, and then runs only the
+    requested extractors over the parsed pages.
+
+    Pages built from several upstream pages (end semester results) load
+    their listing in the first round and hand back a FollowUp; the planner
+    runs every follow-up's fetches in one second fan-out from the request
+    thread, so they overlap instead of running one by one in a pool thread.
+    """
+
+    # Page loaders (fetch + parse) - each runs at most once per query and
+    # returns EXPIRED instead of data when the session has expired
+
+    @staticmethod
+    def _load_attendance_subjects(token: str, params: Dict) -> Any:
+        semester = params.get('semester', '5')
+        document = HtmlDocument(AttendanceService.fetch_attendance_subjects(token, semester))
+        if document.is_login_page:
+            return EXPIRED
+        return AttendanceSubjectParser.parse(document, semester)
+
+    @staticmethod
+    def _load_attendance_table(token: str, params: Dict) -> Any:
+        dates_data = AttendanceService.fetch_attendance_month(
+            token, params.get('semester', '3'), int(params.get('year', '2025')), int(params.get('month', '10'))
+        )
+        if dates_data is None:
+            return EXPIRED
+        return dates_data
+
+    @staticmethod
+    def _load_timetable(token: str, params: Dict) -> Any:
+        data = http_service.get(f"{config.base_url}/student/timetable?format=csv&yt0=", token)
+        if data.strip().startswith('<') and is_login_html(data):
+            return EXPIRED
+        return TimetableParser.parse(data)
+
+    @staticmethod
+    def _load_internal_results(token: str, params: Dict) -> Any:
+        document = HtmlDocument(http_service.get(f"{config.base_url}/ktuacademics/student/results", token))
+        if document.is_login_page:
+            return EXPIRED
+        return [record.to_dict() for record in ResultsParser.parse(document)]
+
+    @staticmethod
+    def _load_exam_results(token: str, params: Dict) -> Any:
+        document = HtmlDocument(results_service.fetch_exam_listing(token))
+        if document.is_login_page:
+            return EXPIRED
+        return QueryService._exam_pages(token, results_service.extract_result_links(document), True)
+
+    @staticmethod
+    def _load_latest_exam(token: str, params: Dict) -> Any:
+        document = HtmlDocument(results_service.fetch_exam_listing(token))
+        if document.is_login_page:
+            return EXPIRED
+        newest = results_service.newest_result_link(document)
+        if newest is None:
+            # The listing doesn't date every exam: rank the parsed pages instead
+            return QueryService._exam_pages(token, results_service.extract_result_links(document), True)
+        # SGPA and CGPA come from the results table alone
+        return QueryService._exam_pages(token, [newest], False)
+
+    @staticmethod
+    def _exam_pages(token: str, links: List[str], include_metadata: bool) -> FollowUp:
+        """Follow-up fetching the given result pages into a list of exams"""
+        def combine(outcomes: List[FanoutResult]) -> List[Dict]:
+            exams, errors = results_service.collect_exam_results(links, outcomes)
+            if errors and not exams:
+                raise RuntimeError(errors[0]['error'])
+            return exams
+
+        return FollowUp(results_service.exam_page_tasks(token, links, include_metadata), combine)
+
+    @staticmethod
+    def _run_follow_ups(outcomes: List[FanoutResult], started: float) -> List[FanoutResult]:
+        """
+        Run every page's follow-up fetches in one fan-out and replace their outcomes
+
+        Args:
+            outcomes: First-round outcomes, one per planned page
+            started: time.monotonic() when the query started (for the deadline)
+
+        Returns:
+            Outcomes with each FollowUp replaced by its combined value
+        """
+        staged = [
+            (index, outcome.value) for index, outcome in enumerate(outcomes)
+            if outcome.ok and isinstance(outcome.value, FollowUp)
+        ]
+        if not staged:
+            return outcomes
+
+        tasks = [task for _, follow_up in staged for task in follow_up.tasks]
+        remaining = max(0.0, config.query_deadline - (time.monotonic() - started))
+        results = fanout_service.run_all(tasks, timeout=remaining)
+
+        outcomes = list(outcomes)
+        offset = 0
+        for index, follow_up in staged:
+            page_results = results[offset:offset + len(follow_up.tasks)]
+            offset += len(follow_up.tasks)
+            try:
+                outcomes[index] = FanoutResult(STATUS_OK, value=follow_up.combine(page_results))
+            except Exception as e:
+                logger.error(f"Error combining query page: {e}")
+                outcomes[index] = FanoutResult(STATUS_ERROR, error=str(e))
+        return outcomes
+
+    # Field extractors - run over an already parsed page
+
+    @staticmethod
+    def _overall_percentage(subjects: List[Dict], params: Dict) -> Optional[float]:
+        if not subjects:
+            return None
+        return round(sum(item.get('percentage', 0) for item in subjects) / len(subjects), 2)
+
+    @staticmethod
+    def _today(timetable: Dict, params: Dict) -> Dict:
+        day = params.get('day') or datetime.now(IST).strftime('%A')
+        day = TimetableParser.DAY_LOOKUP.get(day.lower(), day)
+        return {'day': day, 'periods': timetable.get('schedule', {}).get(day, [])}
+
+    @staticmethod
+    def _latest_exam(exams: List[Dict]) -> Optional[Dict]:
+        """Most recent exam by year and month"""
+        def sort_key(exam):
+            year = int(exam['year']) if str(exam.get('year', '')).isdigit() else 0
+            month = int(MONTH_MAP.get(str(exam.get('month', '')).lower(), 0))
+            return year, month
+        return max(exams, key=sort_key) if exams else None
+
+    @staticmethod
+    def _latest_sgpa(exams: List[Dict], params: Dict) -> Optional[float]:
+        latest = QueryService._latest_exam(exams)
+        return latest['sgpa'] if latest else None
+
+    @staticmethod
+    def _latest_cgpa(exams: List[Dict], params: Dict) -> Optional[float]:
+        latest = QueryService._latest_exam(exams)
+        return latest['cgpa'] if latest else None
+
+    @staticmethod
+    def plan(fields: List[str]) -> List[str]:
+        """
+        Distinct pages needed for the requested fields, in first-use order
+
+        A page is dropped when a page that covers it (QUERY_PAGE_COVERED_BY)
+        is needed anyway.
+
+        Args:
+            fields: Validated field names
+
+        Returns:
+            Page names from QUERY_PAGES
+        """
+        pages = []
+        for field in fields:
+            page = QUERY_FIELDS[field][0]
+            if page not in pages:
+                pages.append(page)
+        return [page for page in pages if QUERY_PAGE_COVERED_BY.get(page) not in pages]
+
+    @staticmethod
+    def _page_for(field: str, pages: List[str]) -> str:
+        """Planned page a field is extracted from"""
+        page = QUERY_FIELDS[field][0]
+        return page if page in pages else QUERY_PAGE_COVERED_BY[page]
+
+    @staticmethod
+    def is_heavy(fields: List[str]) -> bool:
+        """True if any requested field needs a multi-page scrape"""
+        return any(QUERY_PAGES[page][1] for page in QueryService.plan(fields))
+
+    @staticmethod
+    def parse_query(payload: Optional[Dict]) -> Tuple[Optional[List[str]], Optional[Dict], Optional[str]]:
+        """
+        Validate the query body
+
+        Args:
+            payload: JSON body, e.g. {"fields": ["attendance.subjects"], "params": {"semester": "5"}}
+
+        Returns:
+            Tuple of (fields, params, error_message)
+        """
+        if not payload or not isinstance(payload.get('fields'), list) or not payload['fields']:
+            return None, None, "Body must contain a non-empty 'fields' list"
+
+        fields = []
+        for field in payload['fields']:
+            if field not in QUERY_FIELDS:
+                return None, None, f"Unknown field '{field}'. Available: {', '.join(QUERY_FIELDS)}"
+            if field not in fields:
+                fields.append(field)
+
+        params = payload.get('params') or {}
+        if not isinstance(params, dict):
+            return None, None, "'params' must be an object"
+        params = {key: str(value) for key, value in params.items()}
+
+        for key in ('semester', 'year'):
+            if key in params and not params[key].isdigit():
+                return None, None, f"'{key}' must be a number"
+        if 'month' in params:
+            params['month'] = convert_month_to_number(params['month'], default='')
+            if not params['month']:
+                return None, None, "'month' must be a month name or number"
+
+        return fields, params, None
+
+    @staticmethod
+    def execute(token: str, fields: List[str], params: Dict) -> Dict:
+        """
+        Fetch the planned pages concurrently and extract the requested fields
+
+        Args:
+            token: Authentication token
+            fields: Validated field names
+            params: Validated parameters
+
+        Returns:
+            Dictionary with field values, per-field errors and the executed plan
+
+        Raises:
+            SessionExpired: If any page came back as the login page
+        """
+        pages = QueryService.plan(fields)
+        tasks = [
+            (lambda page=page: QUERY_PAGES[page][0](token, params))
+            for page in pages
+        ]
+
+        started = time.monotonic()
+        outcomes = fanout_service.run_all(tasks, timeout=config.query_deadline)
+
+        if any(outcome.ok and outcome.value is EXPIRED for outcome in outcomes):
+            raise SessionExpired()
+
+        loaded = dict(zip(pages, QueryService._run_follow_ups(outcomes, started)))
+
+        data = {}
+        errors = {}
+        for field in fields:
+            extract = QUERY_FIELDS[field][1]
+            outcome = loaded[QueryService._page_for(field, pages)]
+            if not outcome.ok:
+                errors[field] = outcome.error
+                continue
+            try:
+                data[field] = extract(outcome.value, params)
+            except Exception as e:
+                logger.error(f"Error extracting query field {field}: {e}")
+                errors[field] = str(e)
+
+        return {
+            'fields': data,
+            'errors': errors,
+            'plan': {
+                'pages': pages,
+                'elapsed_ms': round((time.monotonic() - started) * 1000)
+            }
+        }
+
+
+# Page name -> (loader, heavy). Heavy pages fan out to several upstream requests.
+QUERY_PAGES: Dict[str, Tuple[Callable[[str, Dict], Any], bool]] = {
+    'attendance_subjects': (QueryService._load_attendance_subjects, False),
+    'attendance_table': (QueryService._load_attendance_table, False),
+    'timetable': (QueryService._load_timetable, False),
+    'internal_results': (QueryService._load_internal_results, False),
+    'exam_results': (QueryService._load_exam_results, True),
+    'latest_exam': (QueryService._load_latest_exam, True)
+}
+
+# Page name -> page whose parsed value also serves its fields (a list of exams)
+QUERY_PAGE_COVERED_BY: Dict[str, str] = {
+    'latest_exam': 'exam_results'
+}
+
+# Field name -> (page, extractor(parsed page, params))
+QUERY_FIELDS: Dict[str, Tuple[str, Callable[[Any, Dict], Any]]] = {
+    'attendance.subjects': ('attendance_subjects', lambda subjects, params: subjects),
+    'attendance.overall_percentage': ('attendance_subjects', QueryService._overall_percentage),
+    'attendance.month.dates': ('attendance_table', lambda dates, params: dates),
+    'attendance.month.summary': ('attendance_table', lambda dates, params: AttendanceTableParser.calculate_summary(dates)),
+    'timetable.schedule': ('timetable', lambda timetable, params: timetable.get('schedule')),
+    'timetable.today': ('timetable', QueryService._today),
+    'results.internal': ('internal_results', lambda results, params: results),
+    'results.exams': ('exam_results', lambda exams, params: exams),
+    'results.latest_sgpa': ('latest_exam', QueryService._latest_sgpa),
+    'results.latest_cgpa': ('latest_exam', QueryService._latest_cgpa)
+}
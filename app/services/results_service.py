@@ -0,0 +1,214 @@
+"""
+Results service - end semester result crawling
+"""
+import logging
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from app.parsers.document import HtmlDocument
+from app.parsers.end_semester_parser import EndSemesterResultParser, EXAM_METADATA_FIELDS, EXAM_DATE_PATTERN
+from app.config.config import config
+from app.services.http_service import http_service
+from app.services.fanout_service import fanout_service, FanoutResult
+from app.services.snapshot_service import result_listings
+from app.utils.date_utils import MONTH_MAP
+
+logger = logging.getLogger(__name__)
+
+
+class ResultsService:
+    """
+    Service for fetching and extracting end semester examination results
+    """
+    
+    @staticmethod
+    def listing_url() -> str:
+        """URL of the end semester results listing page"""
+        return f"{config.base_url}/universityexam/student/examresult"
+    
+    @staticmethod
+    def fetch_exam_listing(token: str) -> str:
+        """
+        Fetch the end semester results listing page
+        
+        Args:
+            token: Authentication token
+        
+        Returns:
+            HTML content
+        """
+        return http_service.get(ResultsService.listing_url(), token)
+    
+    @staticmethod
+    def normalize_result_url(href: str) -> str:
+        """
+        Turn a result link into a canonical absolute URL
+        
+        Args:
+            href: Link as found in the page
+        
+        Returns:
+            Absolute URL without fragment or surrounding whitespace
+        """
+        href = href.strip().split('#', 1)[0]
+        
+        if not href.startswith('http'):
+            href = f"{config.base_url}{href}" if href.startswith('/') else f"{config.base_url}/{href}"
+        
+        # Scheme and host are case-insensitive; path and query are not
+        scheme, sep, rest = href.partition('://')
+        host, slash, path = rest.partition('/')
+        return f"{scheme.lower()}{sep}{host.lower()}{slash}{path}"
+    
+    @staticmethod
+    def extract_result_links(document: HtmlDocument) -> List[str]:
+        """
+        Collect unique result page URLs from the listing page, in page order
+        
+        Args:
+            document: Listing page (only its links are parsed)
+        
+        Returns:
+            Deduplicated absolute URLs (the listing page itself is excluded)
+        """
+        listing_url = ResultsService.normalize_result_url(ResultsService.listing_url())
+        seen = {listing_url}
+        links = []
+        
+        for link in document.links():
+            href = link.get('href', '')
+            # Look for view result links
+            if 'viewresult' in href.lower() or 'examresult' in href.lower():
+                result_url = ResultsService.normalize_result_url(href)
+                if result_url not in seen:
+                    seen.add(result_url)
+                    links.append(result_url)
+        
+        return links
+    
+    @staticmethod
+    def newest_result_link(document: HtmlDocument) -> Optional[str]:
+        """
+        Result link whose listing row names the most recent exam
+        
+        Each link is dated by the exam month and year in its own table row
+        (e.g. "... Regular Examination December 2023"), so the newest exam is
+        known without fetching any result page. Ties keep page order.
+        
+        Args:
+            document: Listing page
+        
+        Returns:
+            Absolute URL, or None if the page has no result links or any
+            link's row names no exam date
+        """
+        links = ResultsService.extract_result_links(document)
+        dates = {}
+        
+        for table in document.tables():
+            for link in table.find_all('a', href=True):
+                url = ResultsService.normalize_result_url(link['href'])
+                row = link.find_parent('tr')
+                if url in dates or row is None:
+                    continue
+                date_match = EXAM_DATE_PATTERN.search(row.get_text(' '))
+                if date_match:
+                    dates[url] = (int(date_match.group(2)), int(MONTH_MAP[date_match.group(1).lower()]))
+        
+        if not links or any(url not in dates for url in links):
+            return None
+        return max(links, key=dates.get)
+    
+    @staticmethod
+    def load_listing(token: str, version: Optional[str] = None) -> Optional[Dict]:
+        """
+        Get the token's result links, reusing the stored listing when possible
+        
+        Args:
+            token: Authentication token
+            version: Listing version from a pagination cursor (None = fetch fresh)
+        
+        Returns:
+            Listing dictionary (version, timestamp, links), or None if the
+            session has expired
+        """
+        key = result_listings.make_key(token)
+        if version is not None:
+            listing = result_listings.find(key, version)
+            if listing is not None:
+                return listing
+        
+        document = HtmlDocument(ResultsService.fetch_exam_listing(token))
+        if document.is_login_page:
+            return None
+        
+        return result_listings.record(key, ResultsService.extract_result_links(document))
+    
+    @staticmethod
+    def exam_page_tasks(token: str, links: List[str],
+                        include_metadata: bool = True) -> List[Callable[[], Optional[Dict]]]:
+        """One fetch-and-parse task per result page (for fanout_service)"""
+        return [
+            (lambda url=url: EndSemesterResultParser.parse(http_service.get(url, token), include_metadata))
+            for url in links
+        ]
+    
+    @staticmethod
+    def fetch_exam_results(token: str, links: List[str],
+                           include_metadata: bool = True) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Fetch and parse result pages concurrently, keeping link order
+        
+        Args:
+            token: Authentication token
+            links: Result page URLs from extract_result_links
+            include_metadata: Extract exam name, degree, semester and dates
+        
+        Returns:
+            Tuple of (exams with subjects, per-page errors)
+        """
+        outcomes = fanout_service.run_all(ResultsService.exam_page_tasks(token, links, include_metadata))
+        return ResultsService.collect_exam_results(links, outcomes)
+    
+    @staticmethod
+    def collect_exam_results(links: List[str], outcomes: List[FanoutResult]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split the outcomes of exam_page_tasks into exams and per-page errors
+        
+        Args:
+            links: Result page URLs the tasks were built from
+            outcomes: One FanoutResult per link, in link order
+        
+        Returns:
+            Tuple of (exams with subjects, per-page errors)
+        """
+        exams = []
+        errors = []
+        for url, outcome in zip(links, outcomes):
+            if not outcome.ok:
+                logger.error(f"Error fetching individual result: {outcome.error}")
+                errors.append({'url': url, 'status': outcome.status, 'error': outcome.error})
+            elif outcome.value:
+                exams.append(outcome.value)
+        
+        return exams, errors
+    
+    @staticmethod
+    def iter_exam_results(token: str, links: List[str]) -> Iterator[Tuple[int, str, FanoutResult]]:
+        """
+        Fetch and parse result pages concurrently, yielding each as it finishes
+        
+        Args:
+            token: Authentication token
+            links: Result page URLs from extract_result_links
+        
+        Yields:
+            (link index, URL, outcome) in completion order; a successful
+            outcome's value is the exam dictionary or None (no subjects)
+        """
+        for index, outcome in fanout_service.iter_completed(ResultsService.exam_page_tasks(token, links)):
+            if not outcome.ok:
+                logger.error(f"Error fetching individual result: {outcome.error}")
+            yield index, links[index], outcome
+
+
+# Global instance
+results_service = ResultsService()
@@ -0,0 +1,295 @@
+"""
+Snapshot service - recent per-token page state for delta responses, pagination and profiles
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.config.config import config
+from app.utils.file_utils import ensure_private_dir, open_private
+
+logger = logging.getLogger(__name__)
+
+
+class AttendanceSnapshotStore:
+    """
+    Keeps the last few versions of each token's attendance month
+
+    A version id is a hash of the month's content, so the same data gets
+    the same id in every worker and a client's version can be diffed by
+    whichever worker still holds it. Keys are evicted least-recently-used
+    beyond ``max_keys`` and versions expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, versions_per_key: int, max_keys: int, ttl: float):
+        self.versions_per_key = versions_per_key
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(token: str, semester: str, month: str, year: str) -> Tuple:
+        """Store key for one token's month (the token itself is not kept)"""
+        return (hashlib.sha256(token.encode('utf-8')).hexdigest(), semester, month, year)
+
+    @staticmethod
+    def version_of(dates_data: List[Dict]) -> str:
+        """Content hash identifying a version of the dates data"""
+        encoded = json.dumps(dates_data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return hashlib.sha1(encoded).hexdigest()[:16]
+
+    def record(self, key: Tuple, dates_data: List[Dict]) -> Dict:
+        """
+        Store the current dates data as the latest version
+
+        Args:
+            key: Key from make_key
+            dates_data: Freshly parsed dates data
+
+        Returns:
+            Snapshot dictionary with version, timestamp and dates
+        """
+        now = time.time()
+        version = self.version_of(dates_data)
+
+        with self._lock:
+            versions = [snapshot for snapshot in self._snapshots.pop(key, [])
+                        if now - snapshot['timestamp'] < self.ttl]
+
+            # Unchanged since the last scrape - keep when it was first seen
+            if versions and versions[-1]['version'] == version:
+                self._snapshots[key] = versions
+                return versions[-1]
+
+            versions = [snapshot for snapshot in versions if snapshot['version'] != version]
+            snapshot = {'version': version, 'timestamp': now, 'dates': dates_data}
+            versions.append(snapshot)
+            self._snapshots[key] = versions[-self.versions_per_key:]
+
+            while len(self._snapshots) > self.max_keys:
+                self._snapshots.popitem(last=False)
+
+        return snapshot
+
+    def find(self, key: Tuple, version: Optional[str] = None, since: Optional[float] = None) -> Optional[Dict]:
+        """
+        Look up the snapshot a client already has
+
+        Args:
+            key: Key from make_key
+            version: Version id the client holds
+            since: Unix timestamp; picks the newest snapshot taken at or before it
+
+        Returns:
+            Matching snapshot, or None if it is unknown or expired
+        """
+        now = time.time()
+        with self._lock:
+            versions = [snapshot for snapshot in self._snapshots.get(key, [])
+                        if now - snapshot['timestamp'] < self.ttl]
+
+        if version is not None:
+            return next((snapshot for snapshot in versions if snapshot['version'] == version), None)
+
+        if since is not None:
+            earlier = [snapshot for snapshot in versions if snapshot['timestamp'] <= since]
+            return earlier[-1] if earlier else None
+
+        return None
+
+
+class ResultListingStore:
+    """
+    Remembers each token's end semester result links between page requests
+
+    Lets the next page of /api/end-semester-results go straight to the exam
+    pages it needs instead of fetching the listing again. Entries expire
+    after ``ttl`` seconds and are evicted least-recently-used beyond
+    ``max_keys``.
+    """
+
+    def __init__(self, max_keys: int, ttl: float):
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._listings: "OrderedDict[str, Dict]" = OrderedDict()
+
+    @staticmethod
+    def make_key(token: str) -> str:
+        """Store key for a token (the token itself is not kept)"""
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def version_of(links: List[str]) -> str:
+        """Content hash identifying a listing"""
+        return hashlib.sha1('\n'.join(links).encode('utf-8')).hexdigest()[:16]
+
+    def record(self, key: str, links: List[str]) -> Dict:
+        """
+        Store a freshly fetched listing
+
+        Args:
+            key: Key from make_key
+            links: Result page URLs in listing order
+
+        Returns:
+            Listing dictionary with version, timestamp and links
+        """
+        listing = {'version': self.version_of(links), 'timestamp': time.time(), 'links': links}
+        with self._lock:
+            self._listings.pop(key, None)
+            self._listings[key] = listing
+            while len(self._listings) > self.max_keys:
+                self._listings.popitem(last=False)
+        return listing
+
+    def find(self, key: str, version: str) -> Optional[Dict]:
+        """
+        Look up a listing by version
+
+        Args:
+            key: Key from make_key
+            version: Listing version from a cursor
+
+        Returns:
+            Listing, or None if it is unknown, replaced or expired
+        """
+        with self._lock:
+            listing = self._listings.get(key)
+            if listing is None or time.time() - listing['timestamp'] >= self.ttl:
+                return None
+            self._listings.move_to_end(key)
+        return listing if listing['version'] == version else None
+
+
+class ProfileStore:
+    """
+    Caches each token's parsed profile
+
+    Profile details rarely change, so entries live for ``ttl`` seconds
+    (hours by default). Entries are evicted least-recently-used beyond
+    ``max_keys``.
+
+    Every worker keeps its own entries, so revoking a token (logout,
+    expired session) leaves a marker file named after its key in
+    ``revocation_dir``; every worker checks for the marker on each hit and
+    drops its entry. A marker is kept for ``ttl`` seconds, longer than any
+    entry it could refer to.
+    """
+
+    def __init__(self, max_keys: int, ttl: float, revocation_dir: str):
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.revocation_dir = revocation_dir
+        self._lock = threading.Lock()
+        self._profiles: "OrderedDict[str, Dict]" = OrderedDict()
+
+    @staticmethod
+    def make_key(token: str) -> str:
+        """Store key for a token (the token itself is not kept)"""
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def record(self, key: str, profile: Dict[str, str]) -> Dict[str, str]:
+        """
+        Store a freshly parsed profile
+
+        Args:
+            key: Key from make_key
+            profile: Profile fields
+
+        Returns:
+            The stored profile
+        """
+        with self._lock:
+            self._profiles.pop(key, None)
+            self._profiles[key] = {'timestamp': time.time(), 'profile': profile}
+            while len(self._profiles) > self.max_keys:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def find(self, key: str) -> Optional[Dict[str, str]]:
+        """
+        Look up a token's profile
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Profile fields, or None if unknown or expired
+        """
+        with self._lock:
+            entry = self._profiles.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry['timestamp'] >= self.ttl:
+                del self._profiles[key]
+                return None
+            self._profiles.move_to_end(key)
+
+        if self.is_revoked(key):
+            self.invalidate(key)
+            return None
+        return entry['profile']
+
+    def invalidate(self, key: str) -> None:
+        """Forget a token's profile in this worker"""
+        with self._lock:
+            self._profiles.pop(key, None)
+
+    def revoke(self, key: str) -> None:
+        """Forget a token's profile in every worker on this host"""
+        self.invalidate(key)
+        try:
+            ensure_private_dir(self.revocation_dir)
+            self._purge_revocations()
+            tmp_path = os.path.join(self.revocation_dir, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open_private(tmp_path):
+                pass
+            os.replace(tmp_path, self._revocation_path(key))
+        except OSError as e:
+            logger.error(f"Could not record profile revocation: {e}")
+
+    def is_revoked(self, key: str) -> bool:
+        """True if any worker revoked the key within the last ttl seconds"""
+        try:
+            return time.time() - os.path.getmtime(self._revocation_path(key)) < self.ttl
+        except OSError:
+            return False
+
+    def _revocation_path(self, key: str) -> str:
+        return os.path.join(self.revocation_dir, key)
+
+    def _purge_revocations(self) -> None:
+        """Delete markers older than the TTL (no entry can predate them)"""
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.revocation_dir):
+            path = os.path.join(self.revocation_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
+
+
+# Global instances (per worker process)
+result_listings = ResultListingStore(
+    max_keys=config.snapshot_max_keys,
+    ttl=config.pagination_cursor_ttl
+)
+
+attendance_snapshots = AttendanceSnapshotStore(
+    versions_per_key=config.snapshot_versions_per_key,
+    max_keys=config.snapshot_max_keys,
+    ttl=config.snapshot_ttl
+)
+
+profile_cache = ProfileStore(
+    max_keys=config.profile_cache_max_keys,
+    ttl=config.profile_cache_ttl,
+    revocation_dir=config.profile_revocation_dir
+)
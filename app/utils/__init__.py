@@ -2,14 +2,40 @@
 Utility modules for common functionality
 """
 from .auth_utils import extract_token, validate_token
-from .date_utils import convert_month_to_number, get_month_name
+from .date_utils import (
+    convert_month_to_number,
+    get_month_name,
+    parse_year_month,
+    month_range,
+    month_span,
+    semester_months
+)
 from .response_utils import create_success_response, create_error_response
+from .fork_utils import register_after_fork, run_after_fork_hooks
+from .fieldset_utils import parse_fields, apply_fieldset, select_fields, wants
+from .cursor_utils import encode_cursor, decode_cursor, parse_page_params
+from .file_utils import ensure_private_dir, open_private
 
 __all__ = [
     'extract_token',
     'validate_token',
     'convert_month_to_number',
     'get_month_name',
+    'parse_year_month',
+    'month_range',
+    'month_span',
+    'semester_months',
     'create_success_response',
-    'create_error_response'
+    'create_error_response',
+    'register_after_fork',
+    'run_after_fork_hooks',
+    'parse_fields',
+    'apply_fieldset',
+    'select_fields',
+    'wants',
+    'encode_cursor',
+    'decode_cursor',
+    'parse_page_params',
+    'ensure_private_dir',
+    'open_private'
 ]
@@ -0,0 +1,70 @@
+"""
+Cursor pagination utilities - opaque cursors and limit/cursor parsing
+"""
+import base64
+import json
+from typing import Dict, Optional, Tuple
+
+
+def encode_cursor(state: Dict) -> str:
+    """
+    Encode pagination state as an opaque URL-safe cursor
+    
+    Args:
+        state: JSON-serialisable state (e.g. {"v": version, "o": offset})
+    
+    Returns:
+        Cursor string
+    """
+    raw = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Dict]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Cursor string from a previous response
+    
+    Returns:
+        State dictionary, or None if the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        return None
+    if not isinstance(state, dict) or not isinstance(state.get('v'), str):
+        return None
+    if not isinstance(state.get('o'), int) or state['o'] < 0:
+        return None
+    return state
+
+
+def parse_page_params(args, max_limit: int) -> Tuple[Optional[int], Optional[Dict], Optional[str]]:
+    """
+    Read limit and cursor query parameters
+    
+    Args:
+        args: Request query parameters
+        max_limit: Largest allowed page size
+    
+    Returns:
+        Tuple of (limit, cursor state, error_message); limit is None when
+        the request is not paginated
+    """
+    if 'limit' not in args and 'cursor' not in args:
+        return None, None, None
+    
+    limit = args.get('limit', str(max_limit))
+    if not limit.isdigit() or not 1 <= int(limit) <= max_limit:
+        return None, None, f"limit must be between 1 and {max_limit}"
+    
+    state = None
+    if args.get('cursor'):
+        state = decode_cursor(args['cursor'])
+        if state is None:
+            return None, None, "Invalid cursor"
+    
+    return int(limit), state, None
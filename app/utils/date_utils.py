@@ -1,7 +1,7 @@
 """
 Date and time utilities
 """
-from typing import Union
+from typing import List, Optional, Tuple, Union
 
 
 # Month name to number mapping
@@ -82,3 +82,97 @@ def get_month_name(month_number: Union[str, int]) -> str:
     """
     month_str = str(month_number)
     return NUMBER_TO_MONTH.get(month_str, 'Unknown')
+
+
+def parse_year_month(value: str, default_year: Union[str, int]) -> Optional[Tuple[int, int]]:
+    """
+    Parse a month reference into a (year, month) pair
+    
+    Args:
+        value: "YYYY-MM" (e.g., "2025-07") or a month name/number (e.g., "Jul", "7")
+        default_year: Year used when value has no year
+    
+    Returns:
+        (year, month) tuple, or None if value is not a recognisable month
+        or its year has more than 4 digits
+    
+    Examples:
+        >>> parse_year_month("2025-07", 2024)
+        (2025, 7)
+        >>> parse_year_month("Oct", "2025")
+        (2025, 10)
+    """
+    value = str(value).strip()
+    
+    if '-' in value:
+        year_part, _, month_part = value.partition('-')
+    else:
+        year_part, month_part = str(default_year), value
+    
+    year_part = year_part.strip()
+    month = convert_month_to_number(month_part, default='')
+    if not month or not year_part.isdigit() or len(year_part) > 4:
+        return None
+    
+    return int(year_part), int(month)
+
+
+def month_span(start: Tuple[int, int], end: Tuple[int, int]) -> int:
+    """
+    Number of months from start to end inclusive, without listing them
+    
+    Args:
+        start: First (year, month)
+        end: Last (year, month)
+    
+    Returns:
+        Month count (zero or negative if end is before start)
+    
+    Examples:
+        >>> month_span((2025, 11), (2026, 1))
+        3
+    """
+    return (end[0] - start[0]) * 12 + end[1] - start[1] + 1
+
+
+def month_range(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """
+    List every (year, month) from start to end inclusive
+    
+    Args:
+        start: First (year, month)
+        end: Last (year, month)
+    
+    Returns:
+        Months in chronological order (empty if end is before start)
+    
+    Examples:
+        >>> month_range((2025, 11), (2026, 1))
+        [(2025, 11), (2025, 12), (2026, 1)]
+    """
+    months = []
+    year, month = start
+    while (year, month) <= end:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def semester_months(semester: Union[str, int], year: Union[str, int]) -> List[Tuple[int, int]]:
+    """
+    Months covered by a semester in the KTU academic calendar
+    
+    Odd semesters run July-December and even semesters January-June of
+    the given year.
+    
+    Args:
+        semester: Semester number
+        year: Calendar year the semester falls in
+    
+    Returns:
+        (year, month) tuples in chronological order
+    """
+    year = int(year)
+    if int(semester) % 2:
+        return month_range((year, 7), (year, 12))
+    return month_range((year, 1), (year, 6))
@@ -0,0 +1,44 @@
+"""
+Change detection utilities - compare successive scrapes of the same page
+"""
+from typing import Dict, List, Optional
+
+
+def diff_attendance_dates(old_dates: Optional[List[Dict]], new_dates: List[Dict]) -> List[Dict]:
+    """
+    Compare two parsed attendance tables for the same month
+
+    Args:
+        old_dates: Previous dates data (None = nothing seen yet)
+        new_dates: Current dates data
+
+    Returns:
+        Change entries in table order: {"type": "date_added", "date", "periods"}
+        for new rows and {"type": "period_changed", "date", "period", "subject",
+        "old_status", "new_status"} for periods whose status changed
+    """
+    old_by_date = {entry['date']: entry for entry in old_dates or []}
+    changes = []
+
+    for entry in new_dates:
+        previous = old_by_date.get(entry['date'])
+        if previous is None:
+            changes.append({'type': 'date_added', 'date': entry['date'], 'periods': entry['periods']})
+            continue
+
+        old_periods = {period['period']: period for period in previous['periods']}
+        for period in entry['periods']:
+            old_period = old_periods.get(period['period'])
+            old_status = old_period['status'] if old_period else None
+            if old_status != period['status']:
+                changes.append({
+                    'type': 'period_changed',
+                    'date': entry['date'],
+                    'period': period['period'],
+                    'subject': period.get('subject', ''),
+                    'old_status': old_status,
+                    'new_status': period['status']
+                })
+
+    return changes
+
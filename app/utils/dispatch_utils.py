@@ -0,0 +1,29 @@
+"""
+Internal dispatch utilities - run an API view without a client round trip
+"""
+from typing import Any, Dict, Optional, Tuple
+from flask import Flask, request
+
+
+def dispatch_internal(app: Flask, path: str, params: Optional[Dict] = None,
+                      headers: Optional[Dict] = None) -> Tuple[int, Any]:
+    """
+    Run the view for a GET path in a fresh request context
+
+    The view is called directly, so request hooks such as admission control
+    do not run again; the caller is responsible for having been admitted.
+    Safe to call from worker threads.
+
+    Args:
+        app: Flask application (not the context-local proxy)
+        path: API path, e.g. "/api/profile"
+        params: Query string parameters
+        headers: Request headers (e.g. Authorization)
+
+    Returns:
+        Tuple of (HTTP status code, decoded JSON body or None)
+    """
+    with app.test_request_context(path, method='GET', query_string=params or {}, headers=headers or {}):
+        view = app.view_functions[request.url_rule.endpoint]
+        response = app.make_response(app.ensure_sync(view)(**(request.view_args or {})))
+        return response.status_code, response.get_json(silent=True)
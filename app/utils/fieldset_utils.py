@@ -0,0 +1,125 @@
+"""
+Sparse fieldset utilities - ?fields= selection with dotted paths
+"""
+from typing import Any, Dict, Optional, Union
+from flask import has_request_context, request
+
+# Parsed selection: nested dict of path parts; True marks a fully included subtree
+FieldTree = Dict[str, Union['FieldTree', bool]]
+
+FIELDSET_ENVIRON_KEY = 'etlab.fieldset'
+
+
+def parse_fields(value: Optional[str]) -> Optional[FieldTree]:
+    """
+    Parse a comma-separated list of dotted paths into a field tree
+
+    Args:
+        value: e.g. "summary,dates.date,dates.periods.status"
+
+    Returns:
+        Field tree, or None when no selection was given (everything included)
+
+    Examples:
+        >>> parse_fields("summary,dates.date")
+        {'summary': True, 'dates': {'date': True}}
+    """
+    if not value or not value.strip():
+        return None
+
+    tree: FieldTree = {}
+    for path in value.split(','):
+        parts = [part.strip() for part in path.split('.') if part.strip()]
+        if not parts:
+            continue
+
+        node = tree
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is True:
+                break
+            if child is None:
+                child = node[part] = {}
+            node = child
+        else:
+            # A shorter path already selects the whole subtree
+            node[parts[-1]] = True
+
+    return tree or None
+
+
+def apply_fieldset(data: Any, tree: Optional[FieldTree]) -> Any:
+    """
+    Keep only the selected paths of a JSON-like value
+
+    Lists are filtered element by element, so "dates.date" keeps the date of
+    every entry in dates.
+
+    Args:
+        data: Response data
+        tree: Field tree from parse_fields (None keeps everything)
+
+    Returns:
+        Filtered copy of data
+    """
+    if tree is None or tree is True:
+        return data
+
+    if isinstance(data, list):
+        return [apply_fieldset(item, tree) for item in data]
+
+    if isinstance(data, dict):
+        return {key: apply_fieldset(value, tree[key]) for key, value in data.items() if key in tree}
+
+    return data
+
+
+def requested_fields() -> Optional[FieldTree]:
+    """
+    Field tree for the current request's ?fields= parameter (parsed once per request)
+
+    Returns:
+        Field tree, or None outside a request or when no selection was given
+    """
+    if not has_request_context():
+        return None
+    # Cached on the request itself: internal dispatches share the caller's g
+    if FIELDSET_ENVIRON_KEY not in request.environ:
+        request.environ[FIELDSET_ENVIRON_KEY] = parse_fields(request.args.get('fields'))
+    return request.environ[FIELDSET_ENVIRON_KEY]
+
+
+def wants(path: str) -> bool:
+    """
+    Check whether the current request selects anything at or below a path
+
+    Lets controllers and services skip work for subtrees the client did
+    not ask for.
+
+    Args:
+        path: Dotted path relative to the response data (e.g. "summary")
+
+    Returns:
+        True if the path (or part of it) will be returned
+    """
+    node = requested_fields()
+    for part in path.split('.'):
+        if node is None or node is True:
+            return True
+        if part not in node:
+            return False
+        node = node[part]
+    return True
+
+
+def select_fields(data: Any) -> Any:
+    """
+    Apply the current request's ?fields= selection to response data
+
+    Args:
+        data: Response data
+
+    Returns:
+        Filtered data (unchanged when no selection was given)
+    """
+    return apply_fieldset(data, requested_fields())
@@ -0,0 +1,39 @@
+"""
+File utilities - private on-disk state shared by the workers on a host
+"""
+import os
+import stat
+
+
+def ensure_private_dir(path: str) -> None:
+    """
+    Create a directory private to this user, or check an existing one
+
+    Args:
+        path: Directory path
+
+    Raises:
+        PermissionError: If the directory is a symlink, belongs to another
+            user or is accessible to group or others
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(
+            f"{path} must be a directory owned by uid {os.getuid()} "
+            f"with mode 0700 (found uid {info.st_uid}, mode {stat.S_IMODE(info.st_mode):o})"
+        )
+
+
+def open_private(path: str, mode: str = 'w'):
+    """
+    Create a new file readable and writable by this user only
+
+    Args:
+        path: File path (must not exist yet)
+        mode: File mode for os.fdopen
+
+    Returns:
+        Open file object
+    """
+    return os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), mode)
@@ -0,0 +1,43 @@
+"""
+Process fork utilities - post-fork reinitialisation hooks
+
+With gunicorn's ``preload_app`` the application is imported once in the
+master process and workers are forked from it. Anything that is safe to
+share copy-on-write (compiled regexes, lookup tables, the user agent
+catalogue) is built at import time. Anything bound to the master's
+sockets or threads (HTTP sessions, connection pools, thread pools) must
+be rebuilt in each worker, so the owning module registers a callback here.
+"""
+import logging
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+_after_fork_hooks: List[Callable[[], None]] = []
+
+
+def register_after_fork(callback: Callable[[], None]) -> Callable[[], None]:
+    """
+    Register a callback to run in every worker right after fork
+
+    Args:
+        callback: Zero-argument callable that rebuilds process-bound resources
+
+    Returns:
+        The callback, so this can be used as a decorator
+    """
+    _after_fork_hooks.append(callback)
+    return callback
+
+
+def run_after_fork_hooks() -> None:
+    """
+    Run all registered post-fork callbacks in registration order
+
+    A failing callback is logged and does not prevent the others from running.
+    """
+    for callback in _after_fork_hooks:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Post-fork hook {getattr(callback, '__qualname__', callback)} failed: {e}")
@@ -3,6 +3,7 @@ Response formatting utilities
 """
 from typing import Any, Dict, Optional
 from flask import jsonify
+from app.utils.fieldset_utils import select_fields
 
 
 def create_success_response(data: Any, message: Optional[str] = None, status_code: int = 200):
@@ -10,7 +11,7 @@ def create_success_response(data: Any, message: Optional[str] = None, status_cod
     Create a standardized success response
     
     Args:
-        data: Response data
+        data: Response data (narrowed by the request's ?fields= selection)
         message: Optional success message
         status_code: HTTP status code (default: 200)
     
@@ -19,7 +20,7 @@ def create_success_response(data: Any, message: Optional[str] = None, status_cod
     """
     response = {
         "success": True,
-        "data": data
+        "data": select_fields(data)
     }
     
     if message:
@@ -0,0 +1,233 @@
+"""
+Benchmark EndSemesterResultParser and check it against the original implementation
+
+Usage (from the repository root):
+    python -m benchmarks.end_semester_parser
+    python -m benchmarks.end_semester_parser captures/result1.html captures/result2.html
+
+reference_parse below is ResultsService.parse_exam_page as it was before
+the parser was extracted (metadata and results found by separate walks of
+the tree, every row's cells read once per lookup). Every page, captured or
+generated, must give identical output, with and without metadata.
+"""
+import logging
+import sys
+import timeit
+from typing import Dict, List, Optional, Tuple
+
+from app.parsers.html_engine import make_soup
+from app.parsers.end_semester_parser import (
+    EndSemesterResultParser,
+    SEMESTER_NAME_PATTERN,
+    EXAM_DATE_PATTERN,
+    ADMISSION_YEAR_PATTERN,
+    ACADEMIC_YEAR_PATTERN
+)
+from benchmarks.sample_pages import exam_result_page, _chrome
+
+
+def _last_number(cell_texts: List[str], exam_data: Dict, key: str) -> None:
+    for text in reversed(cell_texts):
+        if text.replace('.', '').replace(',', '').isdigit():
+            try:
+                exam_data[key] = float(text.replace(',', '.'))
+                break
+            except ValueError:
+                pass
+
+
+def reference_parse(html: str, include_metadata: bool = True) -> Optional[Dict]:
+    """The original exam page parser, kept as the equivalence oracle"""
+    soup = make_soup(html)
+    exam_data = {'exam_name': '', 'degree': '', 'semester': '', 'academic_year': '', 'month': '', 'year': '',
+                 'subjects': [], 'earned_credit': 0, 'sgpa': 0.0, 'cgpa': 0.0}
+
+    if include_metadata:
+        for row in soup.find_all('tr'):
+            cells = row.find_all('td')
+            if len(cells) >= 2:
+                label_lower = cells[0].get_text().strip().lower()
+                value = cells[1].get_text().strip()
+                if 'name of exam' in label_lower:
+                    exam_data['exam_name'] = value
+                elif 'degree' in label_lower and not exam_data['degree']:
+                    exam_data['degree'] = value
+                elif 'semester' in label_lower and not exam_data['semester']:
+                    exam_data['semester'] = value
+                elif 'academic year' in label_lower:
+                    exam_data['academic_year'] = value
+                elif 'month' in label_lower and 'academic' not in label_lower:
+                    exam_data['month'] = value
+                elif label_lower == 'year:' or label_lower == 'year':
+                    exam_data['year'] = value
+
+        if not exam_data['exam_name']:
+            for tag in soup.find_all(['h1', 'h2', 'h3', 'title']):
+                text = tag.get_text().strip()
+                if 'semester' in text.lower() and 'exam' in text.lower():
+                    exam_data['exam_name'] = text
+                    break
+            if not exam_data['exam_name']:
+                for bc in soup.find_all(['a', 'span'], href=True):
+                    text = bc.get_text().strip()
+                    if 'semester' in text.lower() and len(text) > 20:
+                        exam_data['exam_name'] = text
+                        break
+
+        name = exam_data['exam_name']
+        if name:
+            if not exam_data['semester']:
+                semester_match = SEMESTER_NAME_PATTERN.search(name)
+                if semester_match:
+                    exam_data['semester'] = semester_match.group(0)
+            if not exam_data['degree']:
+                if 'B.Tech' in name or 'B Tech' in name or 'BTech' in name:
+                    exam_data['degree'] = 'BTech KTU'
+                elif 'M.Tech' in name or 'M Tech' in name or 'MTech' in name:
+                    exam_data['degree'] = 'MTech KTU'
+            if not exam_data['year'] or not exam_data['month']:
+                date_match = EXAM_DATE_PATTERN.search(name)
+                if date_match:
+                    if not exam_data['month']:
+                        exam_data['month'] = date_match.group(1)
+                    if not exam_data['year']:
+                        exam_data['year'] = date_match.group(2)
+            if not exam_data['academic_year']:
+                admission_match = ADMISSION_YEAR_PATTERN.search(name)
+                if admission_match:
+                    year = admission_match.group(1)
+                    exam_data['academic_year'] = f"{year}-{int(year)+1}"
+                else:
+                    year_match = ACADEMIC_YEAR_PATTERN.search(name)
+                    if year_match:
+                        exam_data['academic_year'] = f"{year_match.group(1)}-{year_match.group(2)}"
+
+    for table in soup.find_all('table'):
+        rows = table.find_all('tr')
+        header_row = None
+        for row in rows:
+            cell_texts = [cell.get_text().strip().lower() for cell in row.find_all(['th', 'td'])]
+            if any(keyword in ' '.join(cell_texts) for keyword in ['course code', 'course name', 'grade', 'slot']):
+                header_row = row
+                break
+        if not header_row:
+            continue
+        headers = [cell.get_text().strip() for cell in header_row.find_all(['th', 'td'])]
+
+        for row in rows:
+            if row == header_row:
+                continue
+            cells = row.find_all('td')
+            if len(cells) < 2:
+                continue
+            cell_texts = [cell.get_text().strip() for cell in cells]
+            row_text = ' '.join(cell_texts)
+
+            if 'SGPA' in row_text:
+                _last_number(cell_texts, exam_data, 'sgpa')
+                continue
+            if 'CGPA' in row_text:
+                _last_number(cell_texts, exam_data, 'cgpa')
+                continue
+            if 'Earned Credit' in row_text:
+                for text in reversed(cell_texts):
+                    if text.isdigit():
+                        try:
+                            exam_data['earned_credit'] = int(text)
+                            break
+                        except ValueError:
+                            pass
+                continue
+            if any(x in row_text.lower() for x in ['course code', 'course name', 'no', 'slot']) and len(cell_texts) > 4:
+                continue
+
+            subject_data = {}
+            for j, cell_text in enumerate(cell_texts):
+                if j >= len(headers):
+                    break
+                header = headers[j].lower()
+                if 'slot' in header or header == 'no':
+                    subject_data['slot'] = cell_text
+                elif 'course code' in header or 'code' in header:
+                    subject_data['code'] = cell_text
+                elif 'course name' in header or 'name' in header:
+                    subject_data['name'] = cell_text
+                elif 'grade' in header:
+                    subject_data['grade'] = cell_text
+                elif 'credit' in header:
+                    try:
+                        subject_data['credit'] = int(cell_text) if cell_text.isdigit() else 0
+                    except ValueError:
+                        pass
+                elif 'pass' in header or 'status' in header:
+                    subject_data['status'] = cell_text
+            if subject_data.get('code') or subject_data.get('name'):
+                exam_data['subjects'].append(subject_data)
+
+    return exam_data if exam_data['subjects'] else None
+
+
+def edge_case_pages() -> List[Tuple[str, str]]:
+    """Generated pages covering the metadata fallbacks and row formats the parser must keep"""
+    header = '<tr><th>Slot</th><th>Course Code</th><th>Course Name</th><th>Grade</th><th>Credit</th><th>Status</th></tr>'
+    rows = (
+        '<tr><td>A</td><td>CST301</td><td>Formal Languages</td><td>A+</td><td>4</td><td>Pass</td></tr>'
+        '<tr><td>B</td><td>CST303</td><td>Networks</td><td>F</td><td>x</td><td>Fail</td></tr>'
+        '<tr><td>C</td><td></td><td>Elective</td><td>B</td><td>3²</td><td>Pass</td></tr>'
+        '<tr><td>Slot</td><td>Course Code</td><td>Course Name</td><td>Grade</td><td>Credit</td><td>Status</td></tr>'
+        '<tr><td>SGPA</td><td>8,45</td></tr><tr><td>CGPA</td><td>8.1.2</td><td>7.9</td></tr>'
+        '<tr><td>Earned Credit</td><td>2³</td><td>21</td></tr>'
+    )
+    results = f'<table class="items">{header}{rows}</table>'
+    return [
+        ('edge: title fallback', _chrome('Fifth Semester B.Tech Exam (2021 Admission) May 2024', results)),
+        ('edge: breadcrumb fallback', _chrome('ETLab', '<a href="/r">M.Tech Second Semester Regular Examination 2023-2024</a>' + results)),
+        ('edge: label rows', _chrome('ETLab', '<table><tr><td>Year:</td><td>2024</td></tr><tr><td>Month</td><td>May</td></tr>'
+                                              '<tr><td>Name of Exam</td><td>IIIrd Semester Exam</td></tr></table>' + results)),
+        ('edge: two result tables', _chrome('ETLab', results + results.replace('CST3', 'CSL3'))),
+        ('edge: no results header', _chrome('ETLab', '<table><tr><td>CST301</td><td>A</td></tr></table>')),
+    ]
+
+
+def load_pages(paths: List[str]) -> List[Tuple[str, str]]:
+    """(label, html) for captured pages, else generated samples and edge cases"""
+    if paths:
+        pages = []
+        for path in paths:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                pages.append((path, f.read()))
+        return pages
+    return [(f'sample seed={seed}', exam_result_page(seed=seed)) for seed in range(1, 4)] + edge_case_pages()
+
+
+def best_time(func) -> float:
+    """Best-of-three mean seconds per call"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main(paths: List[str]) -> int:
+    logging.disable(logging.INFO)
+    mismatches = 0
+    print(f"{'page':<30}{'metadata':>9}{'reference':>12}{'current':>12}{'speedup':>9}  equal")
+
+    for label, html in load_pages(paths):
+        for include_metadata in (True, False):
+            expected = reference_parse(html, include_metadata)
+            actual = EndSemesterResultParser.parse(html, include_metadata)
+            equal = expected == actual
+            mismatches += not equal
+
+            reference = best_time(lambda: reference_parse(html, include_metadata))
+            current = best_time(lambda: EndSemesterResultParser.parse(html, include_metadata))
+            print(f"{label:<30}{'yes' if include_metadata else 'no':>9}{reference * 1000:>9.3f} ms"
+                  f"{current * 1000:>9.3f} ms{reference / current:>8.1f}x  {'yes' if equal else 'NO'}")
+            if not equal:
+                print(f"  expected: {expected}\n  actual:   {actual}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
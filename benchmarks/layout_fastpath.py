@@ -0,0 +1,91 @@
+"""
+Measure the layout fast paths against the generic heuristic paths
+
+Usage (from the repository root):
+    python -m benchmarks.layout_fastpath
+    python -m benchmarks.layout_fastpath timetable=captures/timetable.csv
+
+Each page is parsed once with an empty layout registry (generic path) and
+again once its fingerprint has been learned (fast path); outputs must be
+identical. The registry's counters for the run are printed at the end.
+"""
+import logging
+import sys
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from app.parsers.layout_registry import layout_registry
+from app.parsers.timetable_parser import TimetableParser
+from benchmarks.sample_pages import timetable_csv
+
+# Page kind -> parser under test
+PARSERS: Dict[str, Callable[[str], object]] = {
+    'timetable': TimetableParser.parse,
+}
+
+
+def load_pages(args: List[str]) -> List[Tuple[str, str, str]]:
+    """(kind, label, content) for captured pages given as kind=path, else the samples"""
+    if not args:
+        return [
+            ('timetable', 'days as rows', timetable_csv(days_as_rows=True)),
+            ('timetable', 'days as columns', timetable_csv(days_as_rows=False)),
+        ]
+
+    pages = []
+    for arg in args:
+        kind, _, path = arg.partition('=')
+        if kind not in PARSERS or not path:
+            raise SystemExit(f"Expected kind=path with kind in {', '.join(PARSERS)}: {arg}")
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.append((kind, path, f.read()))
+    return pages
+
+
+def best_time(func: Callable[[], object]) -> float:
+    """Best-of-three mean seconds per call"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def generic(parse: Callable[[str], object], content: str) -> object:
+    """Parse with nothing learned"""
+    layout_registry.reset()
+    return parse(content)
+
+
+def main(args: List[str]) -> int:
+    # Parsers log debug details at INFO; keep them out of the timings
+    logging.disable(logging.INFO)
+    mismatches = 0
+    print(f"{'page':<36}{'generic':>12}{'fast path':>12}{'speedup':>9}  equal")
+
+    for kind, label, content in load_pages(args):
+        parse = PARSERS[kind]
+        expected = generic(parse, content)
+        actual = parse(content)
+        equal = expected == actual
+        mismatches += not equal
+
+        slow = best_time(lambda: generic(parse, content))
+        parse(content)
+        fast = best_time(lambda: parse(content))
+        print(f"{kind + ' (' + label + ')':<36}{slow * 1000:>9.3f} ms{fast * 1000:>9.3f} ms"
+              f"{slow / fast:>8.1f}x  {'yes' if equal else 'NO'}")
+        if not equal:
+            print(f"  generic:   {expected}\n  fast path: {actual}")
+
+    layout_registry.reset()
+    for kind, label, content in load_pages(args):
+        PARSERS[kind](content)
+        PARSERS[kind](content)
+    for kind, stats in layout_registry.stats().items():
+        print(f"{kind}: hit {stats['hit']}, learned {stats['learned']}, generic {stats['generic']}, "
+              f"hit rate {stats['hit_rate']}, layouts {len(stats['layouts'])}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
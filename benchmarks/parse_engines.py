@@ -0,0 +1,109 @@
+"""
+Compare HTML parser engines page by page
+
+Usage (from the repository root):
+    python -m benchmarks.parse_engines
+    python -m benchmarks.parse_engines attendance_table=captures/table.html exam_result=captures/result.html
+
+Each page kind is parsed with every engine and the best-of-three mean time per parse is
+reported together with the speedup over html.parser. Outputs are compared
+across engines so a faster engine that changes results is flagged.
+"""
+import logging
+import sys
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from app.config.config import config
+from app.parsers.html_engine import ENGINES, ENGINE_HTML_PARSER, LXML_AVAILABLE, make_soup
+from app.parsers.page_sniffer import sniff_title
+from app.parsers.attendance_parser import AttendanceTableParser, AttendanceSubjectParser
+from app.parsers.results_parser import ResultsParser
+from app.parsers.end_semester_parser import EndSemesterResultParser
+from app.parsers.profile_parser import ProfileParser
+from benchmarks.sample_pages import SAMPLE_PAGES
+
+
+def soup_title(html: str) -> str:
+    """Page title read from a full tree (what the session-expiry check did before sniffing)"""
+    title = make_soup(html).find('title')
+    return title.get_text() if title else ''
+
+# Page kind -> function under test
+PARSERS: Dict[str, Callable[[str], object]] = {
+    'attendance_table': AttendanceTableParser.parse,
+    'attendance_subjects': lambda html: AttendanceSubjectParser.parse(html, '5'),
+    'exam_result': EndSemesterResultParser.parse,
+    'internal_results': lambda html: [record.to_dict() for record in ResultsParser.parse(html)],
+    'profile': ProfileParser.parse,
+    'login': soup_title,
+}
+
+
+def load_pages(args: List[str]) -> List[Tuple[str, str, str]]:
+    """(kind, label, html) for captured pages given as kind=path, else the samples"""
+    if not args:
+        return [(kind, 'sample', build()) for kind, build in SAMPLE_PAGES.items()]
+
+    pages = []
+    for arg in args:
+        kind, _, path = arg.partition('=')
+        if kind not in PARSERS or not path:
+            raise SystemExit(f"Expected kind=path with kind in {', '.join(PARSERS)}: {arg}")
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.append((kind, path, f.read()))
+    return pages
+
+
+def time_parse(parse: Callable[[str], object], html: str, engine: str) -> Tuple[float, object]:
+    """Mean seconds per parse with the given engine, and the parse result"""
+    config.html_parser_engine = engine
+    result = parse(html)
+    timer = timeit.Timer(lambda: parse(html))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=3, number=number)) / number
+    return best, result
+
+
+def main(args: List[str]) -> int:
+    # Parsers log debug details at INFO; keep them out of the timings
+    logging.disable(logging.INFO)
+    if not LXML_AVAILABLE:
+        print("lxml is not installed - only html.parser can be measured")
+
+    configured = config.html_parser_engine
+    mismatches = 0
+    print(f"{'page':<22}{'bytes':>8}  " + ''.join(f"{engine:>22}" for engine in ENGINES))
+
+    for kind, label, html in load_pages(args):
+        timings = {}
+        results = {}
+        for engine in ENGINES:
+            timings[engine], results[engine] = time_parse(PARSERS[kind], html, engine)
+
+        baseline = timings[ENGINE_HTML_PARSER]
+        cells = ''.join(
+            f"{timings[engine] * 1000:>12.3f} ms {baseline / timings[engine]:>5.1f}x"
+            for engine in ENGINES
+        )
+        print(f"{kind:<22}{len(html):>8}  {cells}  ({label})")
+
+        for engine in ENGINES:
+            if results[engine] != results[ENGINE_HTML_PARSER]:
+                mismatches += 1
+                print(f"  ! {engine} output differs from {ENGINE_HTML_PARSER} for {kind}")
+
+        if kind == 'login':
+            # Zero-DOM title sniff used for the session-expiry check
+            sniffed, sniffed_title = time_parse(sniff_title, html, configured)
+            print(f"{'  title sniffer':<22}{'':>8}  {sniffed * 1000:>12.3f} ms {baseline / sniffed:>5.0f}x")
+            if sniffed_title != results[ENGINE_HTML_PARSER]:
+                mismatches += 1
+                print(f"  ! sniffed title differs from {ENGINE_HTML_PARSER} for {kind}")
+
+    config.html_parser_engine = configured
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
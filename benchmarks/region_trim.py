@@ -0,0 +1,90 @@
+"""
+Measure region pre-trimming against parsing the whole page
+
+Usage (from the repository root):
+    python -m benchmarks.region_trim
+    python -m benchmarks.region_trim attendance_table=captures/table.html attendance_subjects=captures/subjects.html
+
+For each page the script reports how much of the page the trimmer keeps,
+the time the string search itself takes, and the parser's time with and
+without trimming (configured engine). Outputs must be identical.
+"""
+import logging
+import sys
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from app.config.config import config
+from app.parsers.attendance_parser import (
+    AttendanceTableParser,
+    AttendanceSubjectParser,
+    PERIOD_TABLE_REGION,
+    SUBJECT_TABLE_REGION
+)
+from app.parsers.document import HtmlDocument
+from app.parsers.region_trimmer import TableRegion, trim_to_region
+from benchmarks.sample_pages import SAMPLE_PAGES
+
+# Page kind -> (region, parser taking an HtmlDocument)
+TARGETS: Dict[str, Tuple[TableRegion, Callable[[HtmlDocument], object]]] = {
+    'attendance_table': (PERIOD_TABLE_REGION, AttendanceTableParser.parse),
+    'attendance_subjects': (SUBJECT_TABLE_REGION, lambda document: AttendanceSubjectParser.parse(document, '5')),
+}
+
+
+def load_pages(args: List[str]) -> List[Tuple[str, str, str]]:
+    """(kind, label, html) for captured pages given as kind=path, else the samples"""
+    if not args:
+        return [(kind, 'sample', SAMPLE_PAGES[kind]()) for kind in TARGETS]
+
+    pages = []
+    for arg in args:
+        kind, _, path = arg.partition('=')
+        if kind not in TARGETS or not path:
+            raise SystemExit(f"Expected kind=path with kind in {', '.join(TARGETS)}: {arg}")
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.append((kind, path, f.read()))
+    return pages
+
+
+def untrimmed(html: str) -> HtmlDocument:
+    """Document that skips trimming (its table list is already built)"""
+    document = HtmlDocument(html)
+    document.tables()
+    return document
+
+
+def best_time(func: Callable[[], object]) -> float:
+    """Best-of-three mean seconds per call"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main(args: List[str]) -> int:
+    # Parsers log debug details at INFO; keep them out of the timings
+    logging.disable(logging.INFO)
+    mismatches = 0
+    print(f"engine: {config.html_parser_engine}")
+    print(f"{'page':<22}{'bytes':>8}{'kept':>8}{'search':>12}{'full':>12}{'trimmed':>12}{'speedup':>9}")
+
+    for kind, label, html in load_pages(args):
+        region, parse = TARGETS[kind]
+        fragment = trim_to_region(html, region)
+        kept = f"{len(fragment) * 100 / len(html):.0f}%" if fragment else 'miss'
+
+        search = best_time(lambda: trim_to_region(html, region))
+        full = best_time(lambda: parse(untrimmed(html)))
+        trimmed = best_time(lambda: parse(HtmlDocument(html)))
+        print(f"{kind:<22}{len(html):>8}{kept:>8}{search * 1000:>9.3f} ms{full * 1000:>9.3f} ms"
+              f"{trimmed * 1000:>9.3f} ms{full / trimmed:>8.1f}x  ({label})")
+
+        if parse(untrimmed(html)) != parse(HtmlDocument(html)):
+            mismatches += 1
+            print(f"  ! trimmed output differs from a full parse for {kind}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,166 @@
+"""
+Synthetic ETLab-shaped pages for the parser benchmarks
+
+Real captures are better (pass them on the command line); these mimic the
+layout that matters for parse cost: a long head with scripts and styles,
+navigation and sidebar markup around the one table a parser needs.
+"""
+import random
+
+SUBJECTS = ['CST301', 'CST303', 'CST305', 'CST307', 'CST309', 'MCN301', 'CSL331', 'CSL333']
+
+STATUS_STYLES = [
+    'background-color: #90EE90',
+    'background-color: #FF6B6B',
+    '',
+]
+
+
+def _chrome(title: str, body: str) -> str:
+    """Wrap a page body in ETLab-like head, navigation and sidebar"""
+    scripts = ''.join(
+        f'<script type="text/javascript">/*<![CDATA[*/ jQuery(function($){{ $("#nav-{i}").menu({{delay: {i}}}); }}); /*]]>*/</script>\n'
+        for i in range(40)
+    )
+    styles = ''.join(f'<link rel="stylesheet" href="/assets/{i:04x}/style.css" />\n' for i in range(15))
+    nav = ''.join(
+        f'<li class="dropdown"><a href="/menu/{i}" class="dropdown-toggle">Menu {i}</a>'
+        f'<ul class="dropdown-menu">{"".join(f"<li><a href=/menu/{i}/{j}>Item {j}</a></li>" for j in range(8))}</ul></li>'
+        for i in range(12)
+    )
+    sidebar = ''.join(
+        f'<div class="portlet"><div class="portlet-decoration"><div class="portlet-title">Block {i}</div></div>'
+        f'<div class="portlet-content"><ul class="operations"><li><a href="/op/{i}">Operation {i}</a></li></ul></div></div>'
+        for i in range(10)
+    )
+    return (
+        '<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8" />'
+        f'<title>{title}</title>\n{styles}{scripts}</head><body>'
+        f'<div id="header"><ul class="nav">{nav}</ul></div>'
+        f'<div class="container"><div class="span-5 sidebar">{sidebar}</div>'
+        f'<div class="span-19"><div id="content">{body}</div></div></div>'
+        '<div id="footer">Copyright &copy; ETLab</div></body></html>'
+    )
+
+
+def attendance_table_page(days: int = 26, periods: int = 7, seed: int = 1) -> str:
+    """Day-by-day attendance page with one Period/Date table"""
+    rng = random.Random(seed)
+    header = '<tr><th>Date</th>' + ''.join(f'<th>Period {p}</th>' for p in range(1, periods + 1)) + '</tr>'
+    rows = []
+    for day in range(1, days + 1):
+        cells = []
+        for _ in range(periods):
+            style = rng.choice(STATUS_STYLES)
+            if style:
+                cells.append(f'<td style="{style}" class="att-cell">{rng.choice(SUBJECTS)}</td>')
+            else:
+                cells.append('<td class="att-cell">-</td>')
+        rows.append(f'<tr><td>{day} Oct</td>{"".join(cells)}</tr>')
+    table = f'<table class="attendance-table">{header}{"".join(rows)}</table>'
+    legend = '<table class="legend"><tr><td>Present</td><td>Absent</td></tr></table>'
+    return _chrome('ETLab | Attendance', legend + table)
+
+
+def attendance_subjects_page(seed: int = 1) -> str:
+    """Subject-wise attendance page with the table.items grid"""
+    rng = random.Random(seed)
+    header = '<tr><th>Uni Reg No</th><th>Roll No</th><th>Name</th>' + ''.join(
+        f'<th>{code}</th>' for code in SUBJECTS
+    ) + '<th>Total</th><th>Percentage</th></tr>'
+    cells = []
+    for _ in SUBJECTS:
+        total = rng.randint(30, 60)
+        present = rng.randint(total // 2, total)
+        cells.append(f'<td>{present}/{total} ({present * 100 // total}%)</td>')
+    row = f'<tr class="odd"><td>SHR21CS001</td><td>1</td><td>STUDENT NAME</td>{"".join(cells)}<td>400/450</td><td>88%</td></tr>'
+    table = f'<div class="grid-view"><table class="items">{header}{row}</table></div>'
+    return _chrome('ETLab | Attendance', table)
+
+
+def exam_result_page(seed: int = 1) -> str:
+    """One end semester result page with metadata and a course table"""
+    rng = random.Random(seed)
+    metadata = (
+        '<table class="detail-view">'
+        '<tr><td>Name of Exam</td><td>B.Tech Fifth Semester (2021 Admission) Regular Examination December 2023</td></tr>'
+        '<tr><td>Degree</td><td>B.Tech</td></tr>'
+        '<tr><td>Semester</td><td>5</td></tr>'
+        '<tr><td>Academic Year</td><td>2023-2024</td></tr>'
+        '</table>'
+    )
+    rows = ''.join(
+        f'<tr><td>{code}</td><td>Course {code}</td><td>{rng.choice("ABCD")}</td>'
+        f'<td>{rng.choice(["S", "A+", "A", "B+", "B"])}</td><td>{rng.randint(1, 4)}</td></tr>'
+        for code in SUBJECTS
+    )
+    results = (
+        '<table class="items"><tr><th>Course Code</th><th>Course Name</th><th>Slot</th><th>Grade</th><th>Credits</th></tr>'
+        f'{rows}<tr><td>SGPA</td><td>8.45</td></tr><tr><td>CGPA</td><td>8.12</td></tr>'
+        '<tr><td>Earned Credit</td><td>23</td></tr></table>'
+    )
+    return _chrome('ETLab | Exam Result', metadata + results)
+
+
+def internal_results_page(seed: int = 1) -> str:
+    """Internal results page: marks per subject and assessment"""
+    rng = random.Random(seed)
+    header = '<tr><th>Subject</th><th>Semester</th><th>Exam</th><th>Maximum Marks</th><th>Marks Obtained</th></tr>'
+    rows = ''.join(
+        f'<tr><td>{code}</td><td>S5</td><td>{exam}</td><td>50</td>'
+        f'<td>{rng.randint(20, 50) if rng.random() > 0.1 else "Results not published"}</td></tr>'
+        for code in SUBJECTS for exam in ('Series Test 1', 'Series Test 2', 'Assignment')
+    )
+    return _chrome('ETLab | Results', f'<table class="items">{header}{rows}</table>')
+
+
+def timetable_csv(days_as_rows: bool = True, seed: int = 1) -> str:
+    """Timetable CSV export, one row per day or one column per day"""
+    rng = random.Random(seed)
+    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+    slots = ['09:00-10:00', '10:00-11:00', '11:15-12:15', '13:15-14:15', '14:15-15:15', '15:15-16:15']
+
+    def cell() -> str:
+        if rng.random() < 0.1:
+            return 'Break'
+        code = rng.choice(SUBJECTS)
+        return f'"{code} - Course {code} [ Theory ] - Teacher {code[-1]}"'
+
+    if days_as_rows:
+        lines = ['Day,' + ','.join(str(slot) for slot in range(1, len(slots) + 1))]
+        lines += [f"{day},{','.join(cell() for _ in slots)}" for day in days]
+    else:
+        lines = ['Time,' + ','.join(days)]
+        lines += [f"{slot},{','.join(cell() for _ in days)}" for slot in slots]
+    return '\n'.join(lines) + '\n'
+
+
+def profile_page() -> str:
+    """Student profile page: label/value rows in a detail view"""
+    fields = [
+        ('Name', 'STUDENT NAME'), ('Roll No.', '1'), ('Uni Reg No', 'SHR21CS001'),
+        ('Admission No', '21CS001'), ('Date of Birth:', '01-01-2003'), ('Branch', 'Computer Science'),
+        ('Semester', 'S5'), ('E-mail', 'student@example.com'), ('Phone', '9999999999'), ('Photo', ''),
+    ]
+    rows = ''.join(f'<tr><th>{label}</th><td>{value}</td></tr>' for label, value in fields)
+    return _chrome('ETLab | Profile', f'<table class="detail-view">{rows}</table>')
+
+
+def login_page() -> str:
+    """The page ETLab serves when the session has expired"""
+    form = (
+        '<form id="login-form" action="/user/login" method="post">'
+        '<input name="LoginForm[username]" type="text" /><input name="LoginForm[password]" type="password" />'
+        '<input type="submit" name="yt0" value="Login" /></form>'
+    )
+    return _chrome('ETLab | Login', form)
+
+
+SAMPLE_PAGES = {
+    'attendance_table': attendance_table_page,
+    'attendance_subjects': attendance_subjects_page,
+    'exam_result': exam_result_page,
+    'internal_results': internal_results_page,
+    'profile': profile_page,
+    'login': login_page,
+}
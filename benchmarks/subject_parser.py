@@ -0,0 +1,147 @@
+"""
+Benchmark AttendanceSubjectParser and check it against the original implementation
+
+Usage (from the repository root):
+    python -m benchmarks.subject_parser
+    python -m benchmarks.subject_parser captures/attendance1.html captures/attendance2.html
+
+reference_parse below is the parser as it was before the single-pass
+rewrite (full html.parser soup, whole-table keyword scan, two regexes per
+cell). Every page, captured or generated, must give identical output,
+except the divergence pages: there the header lookup deliberately picks
+a different table than the whole-table scan, and the current parser must
+give the output pinned with each page.
+"""
+import logging
+import re
+import sys
+import timeit
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from app.parsers.attendance_parser import AttendanceSubjectParser
+from benchmarks.sample_pages import attendance_subjects_page, _chrome
+
+COUNT_PATTERN = re.compile(r'(\d+)/(\d+)')
+PERCENT_PATTERN = re.compile(r'(\d+)%')
+
+
+def reference_parse(html: str) -> List[Dict]:
+    """The original subject-wise attendance parser, kept as the equivalence oracle"""
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', class_='items')
+    if not table:
+        for t in soup.find_all('table'):
+            table_text = t.get_text().lower()
+            if any(keyword in table_text for keyword in ['attendance', 'present', 'absent', 'subject']):
+                table = t
+                break
+    if not table:
+        return []
+
+    rows = table.find_all('tr')
+    if len(rows) < 2:
+        return []
+    headers = [cell.get_text().strip() for cell in rows[0].find_all(['th', 'td'])]
+
+    attendance_data = []
+    for row in rows[1:]:
+        cell_texts = [cell.get_text().strip() for cell in row.find_all(['td', 'th'])]
+        for col_idx, cell_text in enumerate(cell_texts):
+            if '/' in cell_text and col_idx >= 3:
+                match = COUNT_PATTERN.search(cell_text)
+                if not match:
+                    continue
+                present, total = int(match.group(1)), int(match.group(2))
+                percentage_match = PERCENT_PATTERN.search(cell_text)
+                if percentage_match:
+                    percentage = float(percentage_match.group(1))
+                else:
+                    percentage = round((present / total * 100), 2) if total > 0 else 0
+                subject = headers[col_idx] if col_idx < len(headers) else f"Subject_{col_idx}"
+                attendance_data.append({'subject': subject, 'present': present, 'total': total, 'percentage': percentage})
+    return attendance_data
+
+
+def edge_case_pages() -> List[Tuple[str, str]]:
+    """Generated pages covering the cell formats and table lookups the parser must keep"""
+    cells = ['46/49 (94%)', '0/0', '12/15', '46/49 (94.5%)', '90% 46/49 (94%)', '46/49% 50%', 'n/a', '7 / 9', '3/4 (75 %)']
+    header = '<tr><th>Reg</th><th>Roll</th><th>Name</th>' + ''.join(f'<th>S{i}</th>' for i in range(len(cells) - 1)) + '</tr>'
+    row = '<tr><td>1</td><td>2/3</td><td>X</td>' + ''.join(f'<td>{cell}</td>' for cell in cells) + '</tr>'
+    return [
+        ('edge: cell formats', _chrome('ETLab', f'<table class="items">{header}{row}</table>')),
+        ('edge: no items table', _chrome('ETLab', f'<table class="grid"><tr><td>menu</td></tr></table><table>{header}{row}</table>')),
+        ('edge: keyword in body only', _chrome('ETLab', f'<table><tr><td>a</td></tr><tr><td>present</td></tr></table><table>{header}{row}</table>')),
+        ('edge: nested items table', _chrome('ETLab', f'<table class="layout"><tr><td><table class="items">{header}{row}</table></td></tr></table>')),
+        ('edge: header only', _chrome('ETLab', f'<table class="items">{header}</table>')),
+        ('edge: no tables', _chrome('ETLab', '<p>No attendance</p>')),
+    ]
+
+
+def divergence_pages() -> List[Tuple[str, str, List[Dict]]]:
+    """(label, html, expected) for pages where the current parser intentionally differs"""
+    header = '<tr><th>Reg</th><th>Roll</th><th>Subject</th><th>Maths</th><th>Physics</th></tr>'
+    row = '<tr><td>1</td><td>2</td><td>X</td><td>46/49 (94%)</td><td>12/15</td></tr>'
+    return [
+        # The whole-table scan stops at the notice table ("present" in its
+        # body) and finds nothing; the header lookup finds the subject table
+        ('divergence: header after body',
+         _chrome('ETLab', f'<table><tr><td>Notice</td></tr><tr><td>Be present on time</td></tr></table>'
+                          f'<table>{header}{row}</table>'),
+         [{'subject': 'Maths', 'present': 46, 'total': 49, 'percentage': 94.0},
+          {'subject': 'Physics', 'present': 12, 'total': 15, 'percentage': 80.0}]),
+    ]
+
+
+def load_pages(paths: List[str]) -> List[Tuple[str, str]]:
+    """(label, html) for captured pages, else generated samples and edge cases"""
+    if paths:
+        pages = []
+        for path in paths:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                pages.append((path, f.read()))
+        return pages
+    return [(f'sample seed={seed}', attendance_subjects_page(seed=seed)) for seed in range(1, 4)] + edge_case_pages()
+
+
+def best_time(func) -> float:
+    """Best-of-three mean seconds per call"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main(paths: List[str]) -> int:
+    logging.disable(logging.INFO)
+    mismatches = 0
+    print(f"{'page':<30}{'reference':>12}{'current':>12}{'speedup':>9}  equal")
+
+    for label, html in load_pages(paths):
+        expected = reference_parse(html)
+        actual = AttendanceSubjectParser.parse(html, '5')
+        equal = expected == actual
+        mismatches += not equal
+
+        reference = best_time(lambda: reference_parse(html))
+        current = best_time(lambda: AttendanceSubjectParser.parse(html, '5'))
+        print(f"{label:<30}{reference * 1000:>9.3f} ms{current * 1000:>9.3f} ms{reference / current:>8.1f}x  {'yes' if equal else 'NO'}")
+        if not equal:
+            print(f"  expected: {expected}\n  actual:   {actual}")
+
+    if not paths:
+        for label, html, expected in divergence_pages():
+            actual = AttendanceSubjectParser.parse(html, '5')
+            equal = expected == actual
+            mismatches += not equal
+            diverges = reference_parse(html) != expected
+            print(f"{label:<30}{'pinned output':>24}{'':>9}  {'yes' if equal else 'NO'}"
+                  f"{'' if diverges else '  (reference agrees - no longer a divergence)'}")
+            if not equal:
+                print(f"  expected: {expected}\n  actual:   {actual}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
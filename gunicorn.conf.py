@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration
+
+The application is preloaded in the master so that import-time state
+(compiled regexes, parser tables, the user agent catalogue) is built once
+and shared copy-on-write by every worker. Process-bound resources such as
+HTTP sessions and thread pools are rebuilt in ``post_fork``.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '12'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+
+def when_ready(server):
+    """Freeze import-time objects so GC in workers doesn't dirty shared pages"""
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    """Check the thread count, then rebuild sockets, sessions and pools that must not cross the fork"""
+    from app.services.admission_service import check_worker_threads
+    from app.utils.fork_utils import run_after_fork_hooks
+    # --threads on the command line overrides the setting above
+    check_worker_threads(server.cfg.threads)
+    run_after_fork_hooks()
+
+
+def post_worker_init(worker):
+    """Open warm keep-alive connections to ETLab before the worker takes traffic"""
+    from app.services.connection_manager import connection_manager
+    connection_manager.start()
@@ -0,0 +1,16 @@
+"""
+EndSemesterResultParser against the parser it replaced (benchmarks.end_semester_parser)
+"""
+import pytest
+
+from app.parsers.end_semester_parser import EndSemesterResultParser
+from benchmarks.end_semester_parser import load_pages, reference_parse
+
+PAGES = load_pages([])
+
+
+@pytest.mark.parametrize('include_metadata', [True, False], ids=['metadata', 'no-metadata'])
+@pytest.mark.parametrize('label, html', PAGES, ids=[label for label, _ in PAGES])
+def test_matches_reference(label, html, include_metadata):
+    expected = reference_parse(html, include_metadata)
+    assert EndSemesterResultParser.parse(html, include_metadata) == expected
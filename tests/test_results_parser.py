@@ -0,0 +1,95 @@
+"""
+ResultsParser against the inline parser it replaced in the results controller
+"""
+from typing import Dict, List
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.parsers.results_parser import ResultsParser
+from benchmarks.sample_pages import _chrome, internal_results_page
+
+HEADER = '<tr><th>Subject</th><th>Semester</th><th>Exam</th><th>Maximum Marks</th><th>Marks Obtained</th></tr>'
+
+
+def reference_parse(html: str) -> List[Dict]:
+    """The results controller's table loop before the parser was extracted"""
+    results_data = []
+    for table in BeautifulSoup(html, 'html.parser').find_all('table'):
+        table_text = table.get_text().lower()
+        if not any(keyword in table_text for keyword in ['result', 'grade', 'marks', 'subject', 'score']):
+            continue
+
+        rows = table.find_all('tr')
+        headers = [cell.get_text().strip() for cell in rows[0].find_all(['th', 'td'])] if rows else []
+
+        for row in rows[1:] if len(rows) > 1 else rows:
+            cell_texts = [cell.get_text().strip() for cell in row.find_all(['td', 'th'])]
+            if len(cell_texts) < 2:
+                continue
+
+            subject_data = {}
+            for j, cell_text in enumerate(cell_texts):
+                if not cell_text or j >= len(headers):
+                    continue
+                header = headers[j].lower()
+                if 'subject' in header:
+                    subject_data['subject'] = cell_text
+                elif 'semester' in header:
+                    subject_data['semester'] = cell_text
+                elif any(x in header for x in ['exam', 'assignment', 'project', 'class project', 'title']):
+                    subject_data['type'] = cell_text
+                elif 'maximum' in header and cell_text.replace('.', '').isdigit():
+                    try:
+                        subject_data['max_marks'] = int(cell_text)
+                    except ValueError:
+                        pass
+                elif 'obtained' in header:
+                    if cell_text.replace('.', '').isdigit():
+                        try:
+                            subject_data['marks'] = int(cell_text)
+                        except ValueError:
+                            pass
+                    else:
+                        subject_data['status'] = cell_text
+
+            if subject_data.get('subject'):
+                results_data.append(subject_data)
+    return results_data
+
+
+def _page(*tables: str) -> str:
+    return _chrome('ETLab | Results', ''.join(f'<table class="items">{table}</table>' for table in tables))
+
+
+PAGES = [(f'sample seed={seed}', internal_results_page(seed=seed)) for seed in range(1, 4)] + [
+    ('decimal marks', _page(
+        HEADER + '<tr><td>CST301</td><td>S5</td><td>Series Test 1</td><td>12.5</td><td>7.5</td></tr>'
+    )),
+    ('short and blank cells', _page(
+        HEADER + '<tr><td>CST303</td></tr><tr><td></td><td>S5</td><td>Assignment</td><td>10</td><td>9</td></tr>'
+        '<tr><td>CST305</td><td></td><td>Project</td><td>x</td><td>Absent</td><td>extra</td></tr>'
+    )),
+    ('no subject column', _page(
+        '<tr><th>Course</th><th>Marks Obtained</th></tr><tr><td>CST301</td><td>40</td></tr>'
+    )),
+    ('unrelated table first', _page(
+        '<tr><td>Name</td><td>Student</td></tr><tr><td>Batch</td><td>2022</td></tr>',
+        '<tr><th>Subject</th><th>Title</th><th>Maximum</th><th>Obtained</th></tr>'
+        '<tr><td>CST307</td><td>Class Project</td><td>20</td><td>18</td></tr>'
+    )),
+]
+
+
+@pytest.mark.parametrize('label, html', PAGES, ids=[label for label, _ in PAGES])
+def test_matches_reference(label, html):
+    assert [result.to_dict() for result in ResultsParser.parse(html)] == reference_parse(html)
+
+
+def test_pinned_divergence_header_only_table():
+    # The old loop read a lone header row as data when a table had no body
+    html = _page(HEADER)
+    assert reference_parse(html) == [
+        {'subject': 'Subject', 'semester': 'Semester', 'type': 'Exam', 'status': 'Marks Obtained'}
+    ]
+    assert ResultsParser.parse(html) == []
@@ -0,0 +1,23 @@
+"""
+AttendanceSubjectParser against the parser it replaced (benchmarks.subject_parser)
+"""
+import pytest
+
+from app.parsers.attendance_parser import AttendanceSubjectParser
+from benchmarks.subject_parser import divergence_pages, load_pages, reference_parse
+
+PAGES = load_pages([])
+DIVERGENCES = divergence_pages()
+
+
+@pytest.mark.parametrize('label, html', PAGES, ids=[label for label, _ in PAGES])
+def test_matches_reference(label, html):
+    assert AttendanceSubjectParser.parse(html, '5') == reference_parse(html)
+
+
+@pytest.mark.parametrize(
+    'label, html, expected', DIVERGENCES, ids=[label for label, _, _ in DIVERGENCES]
+)
+def test_pinned_divergence(label, html, expected):
+    assert AttendanceSubjectParser.parse(html, '5') == expected
+    assert reference_parse(html) != expected
@@ -10,4 +10,5 @@ app_main = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(app_main)
 
 # Expose the Flask WSGI application as `app` for Gunicorn
+# (with preload_app this module is imported once in the master; see gunicorn.conf.py)
 app = getattr(app_main, 'app')